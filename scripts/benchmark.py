@@ -0,0 +1,256 @@
+"""
+Script: benchmark.py
+---------------------
+Benchmark "anytime": corre configuraciones de solvers sobre instancias y
+semillas con el mismo presupuesto de tiempo, registra la traza del
+incumbente (costo vs tiempo de reloj) y compara a igual tiempo:
+
+- ttt.csv / ttt_ecdf.png: time-to-target por corrida y objetivo (% sobre la
+  referencia), y su distribución empírica por config.
+- profile.csv / perf_profile.png: perfil de desempeño (Dolan-Moré) sobre el
+  TTT del objetivo --profile_target.
+- auc.csv / quality_vs_time.png: área bajo la curva gap-vs-tiempo
+  (normalizada por el presupuesto; menor es mejor) y curvas medianas.
+- summary.csv: una fila por config con tasas de éxito, TTT mediano y AUC medio.
+
+Las corridas van por scripts.run_batch (pool persistente, fallos aislados).
+Los tiempos incluyen la preparación de la instancia (lectura y matriz de
+distancias). Como los workers guardan instancias y matrices en caché, sólo
+la primera corrida de cada una la paga: el costo se mide una vez por
+instancia (el mayor registrado, el de la corrida en frío) y se suma a todas
+sus corridas por igual.
+Por defecto se usa 1 worker para que las corridas no compitan por CPU.
+
+Uso desde CLI:
+--------------
+python -m scripts.benchmark --instances data/tsplib/eil101.tsp --seeds 1 2 3 4 5 `
+    --configs configs.json --time_limit 10 --targets 1 5 10 --out results/bench
+
+configs.json (si se omite: GA con OX y con PMX):
+[{"name": "ga_ox", "solver": "ga", "params": {"crossover": "OX", "max_iter": 100000}},
+ {"name": "mtz", "solver": "mtz"}]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.common.anytime import (gap_at, performance_profile, quality_auc,
+                                time_to_target, trace_from_result)
+from src.viz.compare import save_summary_csv
+
+DEFAULT_CONFIGS = [
+    {"name": "ga_ox", "solver": "ga", "params": {"crossover": "OX", "max_iter": 1_000_000}},
+    {"name": "ga_pmx", "solver": "ga", "params": {"crossover": "PMX", "max_iter": 1_000_000}},
+]
+DEFAULT_TARGETS = (1.0, 5.0, 10.0)
+# Solvers que aceptan time_limit (el resto corre hasta terminar)
+_TIMED = ("ga", "mtz")
+
+
+def instance_name(path: str) -> str:
+    name = Path(path).name
+    for ext in (".tsp.gz", ".tsp", ".csv", ".npy"):
+        if name.endswith(ext):
+            return name[: -len(ext)]
+    return name
+
+
+def build_jobs(instances: List[str], seeds: List[int], configs: List[Dict[str, Any]],
+               time_limit: float) -> List[Dict[str, Any]]:
+    """Un trabajo por (config, instancia, semilla); MTZ es determinista: uno por instancia."""
+    jobs = []
+    for cfg in configs:
+        solver = cfg["solver"]
+        for inst in instances:
+            for seed in ([None] if solver == "mtz" else seeds):
+                params = dict(cfg.get("params", {}))
+                if seed is not None:
+                    params["seed"] = seed
+                if solver in _TIMED:
+                    params.setdefault("time_limit", time_limit)
+                jobs.append({
+                    "id": f"{cfg['name']}|{instance_name(inst)}|{seed}",
+                    "instance": inst, "solver": solver, "params": params,
+                    "config": cfg["name"], "seed": seed,
+                })
+    return jobs
+
+
+def load_runs(runs_path: str) -> List[Dict[str, Any]]:
+    """
+    Corridas ok de un runs.jsonl. Cada traza se desplaza por el costo de
+    preparación de su instancia (lectura + matriz, el mayor entre sus
+    corridas), igual para todas aunque un worker en caliente no lo haya pagado.
+    """
+    rows = []
+    setup: Dict[str, float] = {}
+    with open(runs_path, "r", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if row.get("status") != "ok":
+                print(f"[WARN] {row.get('id')}: {row.get('error')}")
+                continue
+            inst = row["id"].split("|")[1]
+            tm = row.get("timings", {})
+            setup[inst] = max(setup.get(inst, 0.0), tm.get("load_s", 0.0) + tm.get("dist_s", 0.0))
+            rows.append(row)
+    runs = []
+    for row in rows:
+        config, inst, seed = row["id"].split("|")
+        t, c = trace_from_result(row["result"], offset=setup[inst])
+        runs.append({"config": config, "instance": inst, "seed": seed, "t": t, "cost": c})
+    return runs
+
+
+def references(runs: List[Dict[str, Any]], explicit: Dict[str, float],
+               db: Optional[str] = None) -> Dict[str, float]:
+    """
+    Costo de referencia por instancia: --ref explícito, si no el óptimo
+    probado por MTZ en el almacén (--db), si no el mejor costo visto en el
+    benchmark.
+    """
+    refs = dict(explicit)
+    store = None
+    if db:
+        from src.common.results_store import ResultsStore
+
+        store = ResultsStore(db)
+    try:
+        for inst in sorted({r["instance"] for r in runs}):
+            if inst in refs:
+                continue
+            ref = store.reference_cost(inst) if store is not None else None
+            seen = [float(r["cost"].min()) for r in runs if r["instance"] == inst and len(r["cost"])]
+            if seen:
+                ref = min([ref] + seen) if ref is not None else min(seen)
+            if ref is not None:
+                refs[inst] = ref
+    finally:
+        if store is not None:
+            store.close()
+    return refs
+
+
+def analyze(runs: List[Dict[str, Any]], refs: Dict[str, float], horizon: float,
+            targets, profile_target: float, out_dir: Path, plots: bool = True) -> List[Dict[str, Any]]:
+    """Escribe ttt.csv, auc.csv, profile.csv y summary.csv (y PNG); devuelve el resumen."""
+    runs = [r for r in runs if r["instance"] in refs]
+    ttt_rows, auc_rows = [], []
+    ttt: Dict[float, Dict[str, List[float]]] = {tg: {} for tg in targets}
+    grid = np.linspace(0.0, horizon, 300)
+    curves: Dict[str, List[np.ndarray]] = {}
+    problems: Dict[Any, Dict[str, float]] = {}
+    for r in runs:
+        ref = refs[r["instance"]]
+        t, c = r["t"], r["cost"]
+        for tg in targets:
+            v = time_to_target(t, c, ref * (1 + tg / 100.0))
+            ttt[tg].setdefault(r["config"], []).append(v)
+            ttt_rows.append({"config": r["config"], "instance": r["instance"], "seed": r["seed"],
+                             "target_pct": tg, "ttt_s": v if np.isfinite(v) else ""})
+            if tg == profile_target:
+                problems.setdefault((r["instance"], r["seed"]), {})[r["config"]] = v
+        final = float(c[-1]) if len(c) else None
+        auc_rows.append({"config": r["config"], "instance": r["instance"], "seed": r["seed"],
+                         "ref_cost": ref, "final_cost": final,
+                         "final_gap_pct": 100.0 * (final - ref) / ref if final is not None else "",
+                         "auc": quality_auc(t, c, ref, horizon)})
+        curves.setdefault(r["config"], []).append(gap_at(t, c, ref, grid))
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if not runs:
+        raise ValueError("No hay corridas válidas con costo de referencia")
+    save_summary_csv(ttt_rows, str(out_dir / "ttt.csv"))
+    save_summary_csv(auc_rows, str(out_dir / "auc.csv"))
+
+    # En el perfil, MTZ (una corrida por instancia) compite en cada semilla
+    for (inst, seed), row in problems.items():
+        for r in runs:
+            if r["instance"] == inst and r["seed"] == "None" and r["config"] not in row:
+                row[r["config"]] = time_to_target(r["t"], r["cost"], refs[inst] * (1 + profile_target / 100.0))
+    problems = {p: row for p, row in problems.items() if p[1] != "None"} or problems
+    taus, rho = performance_profile(problems)
+    save_summary_csv([{"config": cfg, "tau": float(tau), "rho": float(v)}
+                      for cfg, r in rho.items() for tau, v in zip(taus, r)],
+                     str(out_dir / "profile.csv"))
+
+    summary = []
+    for cfg in sorted(curves):
+        row = {"config": cfg, "runs": len(curves[cfg]),
+               "mean_auc": float(np.mean([a["auc"] for a in auc_rows if a["config"] == cfg]))}
+        for tg in targets:
+            vals = np.asarray(ttt[tg][cfg])
+            row[f"success_{tg:g}pct"] = float(np.isfinite(vals).mean())
+            row[f"median_ttt_{tg:g}pct_s"] = float(np.median(vals)) if np.isfinite(np.median(vals)) else ""
+        summary.append(row)
+    save_summary_csv(summary, str(out_dir / "summary.csv"))
+
+    if plots:
+        from src.viz.anytime import save_profile_png, save_quality_png, save_ttt_png
+
+        save_ttt_png(ttt, str(out_dir / "ttt_ecdf.png"))
+        save_profile_png(taus, rho, str(out_dir / "perf_profile.png"),
+                         title=f"Perfil de desempeño (TTT al {profile_target:g}%)")
+        save_quality_png(grid, {k: np.vstack(v) for k, v in curves.items()},
+                         str(out_dir / "quality_vs_time.png"))
+    return summary
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark anytime: TTT, perfiles de desempeño y AUC")
+    ap.add_argument("--instances", nargs="+", default=[], help="Instancias (.tsp, .tsp.gz, .csv, .npy)")
+    ap.add_argument("--seeds", nargs="+", type=int, default=[1, 2, 3, 4, 5])
+    ap.add_argument("--configs", default=None, help="JSON con la lista de configuraciones")
+    ap.add_argument("--time_limit", type=float, default=10.0, help="Presupuesto por corrida (s)")
+    ap.add_argument("--targets", nargs="+", type=float, default=list(DEFAULT_TARGETS),
+                    help="Objetivos en %% sobre la referencia")
+    ap.add_argument("--profile_target", type=float, default=None,
+                    help="Objetivo usado en el perfil de desempeño (por defecto, el primero)")
+    ap.add_argument("--ref", nargs="*", default=[], help="Referencias explícitas: instancia=costo")
+    ap.add_argument("--db", default=None, help="Almacén SQLite: usa su óptimo probado por MTZ como referencia")
+    ap.add_argument("--out", required=True, help="Carpeta de salida")
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--from_runs", default=None, help="Reanaliza un runs.jsonl existente sin correr nada")
+    ap.add_argument("--no-plots", action="store_true")
+    args = ap.parse_args()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    runs_path = args.from_runs or str(out_dir / "runs.jsonl")
+    if not args.from_runs:
+        if not args.instances:
+            ap.error("--instances es obligatorio salvo con --from_runs")
+        from scripts.run_batch import run_batch
+
+        configs = DEFAULT_CONFIGS
+        if args.configs:
+            with open(args.configs, "r", encoding="utf-8") as f:
+                configs = json.load(f)
+        jobs = build_jobs(args.instances, args.seeds, configs, args.time_limit)
+        jobs_path = out_dir / "jobs.jsonl"
+        with open(jobs_path, "w", encoding="utf-8") as f:
+            for job in jobs:
+                f.write(json.dumps(job) + "\n")
+        t0 = time.time()
+        counts = run_batch(str(jobs_path), runs_path, max_workers=args.workers)
+        print(f"[INFO] {counts['ok']} corridas ok, {counts['error']} con error en {time.time() - t0:.1f}s")
+
+    runs = load_runs(runs_path)
+    explicit = {k: float(v) for k, v in (item.split("=", 1) for item in args.ref)}
+    refs = references(runs, explicit, args.db)
+    profile_target = args.profile_target if args.profile_target is not None else args.targets[0]
+    targets = sorted(set(args.targets) | {profile_target})
+    summary = analyze(runs, refs, args.time_limit, targets, profile_target, out_dir,
+                      plots=not args.no_plots)
+    for row in summary:
+        print(f"[INFO] {row['config']}: AUC medio={row['mean_auc']:.4f} corridas={row['runs']}")
+    print(f"[INFO] CSV y figuras en {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Script: make_summary.py
+------------------------
+Resumen genérico de corridas desde el almacén de resultados (SQLite).
+Reemplaza a los scripts por instancia (make_summary_eil101.py): agrega por
+instancia, parámetros o semilla y calcula % de error contra el óptimo
+probado por MTZ (los cortes por tiempo no cuentan), sin cargar tours ni
+historias.
+
+Uso desde CLI:
+--------------
+# Una fila por corrida GA de eil101 (equivalente al antiguo ga_runs.csv)
+python -m scripts.make_summary --instance eil101 --by run
+
+# Agregado por parámetros (media/desv./mejor sobre semillas) de todas las instancias
+python -m scripts.make_summary --by params --out results/summary_params.csv
+
+# Importar JSON sueltos (p. ej. salidas de src.ga.tsp_ga --out) al almacén
+python -m scripts.make_summary --import-json results/eil101 --instance eil101
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from src.common.results_store import ResultsStore, DEFAULT_DB
+from src.viz.compare import save_summary_csv
+
+
+def import_json_dir(store: ResultsStore, folder: str, instance: str) -> int:
+    """Ingresa ga_*.json y mtz*.json de una carpeta; devuelve cuántos agregó."""
+    added = 0
+    for p in sorted(Path(folder).glob("*.json")):
+        with open(p, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "best" in data:
+            params = dict(data.get("params", {}))
+            solver = "ga"
+        elif "tour" in data and "status" in data:
+            # El JSON de MTZ no guarda time_limit: sólo lo que sí escribe run_mtz
+            params = {k: data[k] for k in ("metric", "cutoff") if data.get(k) is not None}
+            solver = "mtz"
+        else:
+            continue
+        store.add_run(instance, solver, data, params, skip_existing=True)
+        added += 1
+    return added
+
+
+def run_rows(store: ResultsStore, instance: str = None, solver: str = "ga"):
+    """Una fila por corrida, con % de error contra el óptimo MTZ de su instancia."""
+    refs = {}
+    rows = []
+    for r in store.query(instance=instance, solver=solver):
+        inst = r["instance"]
+        if inst not in refs:
+            refs[inst] = store.reference_cost(inst)
+        ref = refs[inst]
+        prms = r["params"]
+        rows.append({
+            "instance": inst,
+            "seed": r["seed"],
+            "N": prms.get("N"),
+            "maxIter": prms.get("maxIter", prms.get("max_iter")),
+            "crossover": prms.get("crossover"),
+            "pmut": prms.get("pmut"),
+            "elitism": prms.get("elitism"),
+            "best_cost": r["best_cost"],
+            "opt_mtz": ref,
+            "pct_error": 100.0 * (r["best_cost"] - ref) / ref if ref else None,
+            "time_s": r["time_s"],
+            "run_id": r["id"],
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de corridas desde el almacén de resultados")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB, help="Archivo SQLite de resultados")
+    parser.add_argument("--instance", type=str, default=None, help="Filtra una instancia (p. ej. eil101)")
+    parser.add_argument("--solver", type=str, default="ga")
+    parser.add_argument("--by", choices=["run", "seed", "params", "instance"], default="run",
+                        help="Nivel de agregación")
+    parser.add_argument("--out", type=str, default=None, help="CSV de salida")
+    parser.add_argument("--import-json", dest="import_json", type=str, default=None,
+                        help="Carpeta con JSON a importar antes de resumir (requiere --instance)")
+    args = parser.parse_args()
+
+    with ResultsStore(args.db) as store:
+        if args.import_json:
+            if not args.instance:
+                raise ValueError("--import-json requiere --instance")
+            n = import_json_dir(store, args.import_json, args.instance)
+            print(f"[INFO] Importados {n} JSON desde {args.import_json}")
+
+        if args.by == "run":
+            rows = run_rows(store, args.instance, args.solver)
+        else:
+            rows = store.summary(by=args.by, solver=args.solver, instance=args.instance)
+
+    if not rows:
+        raise SystemExit(f"No hay corridas '{args.solver}' en {args.db}"
+                         + (f" para {args.instance}" if args.instance else ""))
+
+    out = args.out
+    if out is None:
+        folder = Path("results") / (args.instance or "")
+        out = folder / ("ga_runs.csv" if args.by == "run" else f"summary_by_{args.by}.csv")
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    save_summary_csv(rows, out)
+    print(f"[INFO] Escrito {out} con {len(rows)} filas")
+
+
+if __name__ == "__main__":
+    main()
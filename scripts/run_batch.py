@@ -0,0 +1,326 @@
+"""
+Script: run_batch.py
+---------------------
+Ejecuta una cola de trabajos (JSONL) con un pool de procesos persistente.
+
+Cada línea de la cola es un trabajo:
+
+    {"id": "eil101-ga-42", "instance": "data/tsplib/eil101.tsp", "solver": "ga",
+     "params": {"seed": 42, "N": 120, "max_iter": 400}, "out": "results/batch/eil101_ga42.json"}
+
+- solver: "ga", "mtz" o "decomp"; params se combinan con los valores por
+  defecto (GA_PARAMS de src/ga/tsp_ga.py para el GA, time_limit=60 para MTZ,
+  max_workers=1 para la descomposición: el paralelismo lo pone el lote).
+- out (opcional): JSON con el resultado completo; sin "out" el resultado
+  completo va en la línea de salida.
+
+Los workers se crean una vez y conservan, con desalojo LRU, las instancias
+parseadas y sus matrices de distancias: trabajos seguidos sobre la misma
+instancia no vuelven a leer ni a calcular nada. Cada resultado se escribe
+en el JSONL de salida en cuanto termina, con tiempos por etapa; un trabajo
+que falla (o un worker que muere) sólo marca ese trabajo como "error".
+
+Uso desde CLI:
+--------------
+python -m scripts.run_batch --jobs jobs.jsonl --out results/batch.jsonl --workers 4
+"""
+
+import argparse
+import json
+import os
+import time
+import traceback
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.common.distance import DEFAULT_DIST_DIR
+
+SOLVERS = ("ga", "mtz", "decomp")
+MTZ_DEFAULTS = {"time_limit": 60}
+DECOMP_DEFAULTS = {"max_workers": 1}
+# Límites por defecto de la caché de cada worker
+MAX_INSTANCES = 16
+MAX_MATRIX_BYTES = 1 << 30  # 1 GiB
+
+
+class _LRU:
+    """LRU con límite de entradas y, opcionalmente, de bytes (arreglos NumPy)."""
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _size(value) -> int:
+        return int(getattr(value, "nbytes", 0))
+
+    def get(self, key):
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key, value) -> None:
+        if key in self._data:
+            self._bytes -= self._size(self._data.pop(key))
+        self._data[key] = value
+        self._bytes += self._size(value)
+        # Siempre se conserva al menos la entrada recién agregada
+        while len(self._data) > 1 and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, old = self._data.popitem(last=False)
+            self._bytes -= self._size(old)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Estado de cada worker (se crea en _init_worker, vive lo que el proceso)
+_INSTANCES: Optional[_LRU] = None
+_MATRICES: Optional[_LRU] = None
+_DIST_DIR: Optional[str] = DEFAULT_DIST_DIR
+
+
+def _init_worker(max_instances: int, max_matrix_bytes: int, dist_dir: Optional[str]) -> None:
+    global _INSTANCES, _MATRICES, _DIST_DIR
+    _INSTANCES = _LRU(max_instances)
+    _MATRICES = _LRU(max_instances, max_matrix_bytes)
+    _DIST_DIR = dist_dir
+    # Importes del GA por adelantado: el primer trabajo no los paga
+    import src.ga.tsp_ga  # noqa: F401
+
+
+def _is_tsplib(path: str) -> bool:
+    return path.endswith(".tsp") or path.endswith(".tsp.gz")
+
+
+def _instance_key(path: str) -> Tuple[str, int]:
+    """Ruta absoluta + mtime: si el archivo cambia, la entrada vieja no se usa."""
+    p = os.path.abspath(path)
+    return p, os.stat(p).st_mtime_ns
+
+
+def _load_instance(path: str):
+    """
+    Instancia desde la caché del worker o del disco.
+
+    Returns:
+        ((coords, metric, TSPInstance | None), vino_de_la_caché)
+    """
+    key = _instance_key(path)
+    hit = _INSTANCES.get(key)
+    if hit is not None:
+        return hit, True
+    if _is_tsplib(path):
+        from src.io.tsplib import read_tsplib_instance
+
+        inst = read_tsplib_instance(path)
+        entry = (inst.coords[:, :2] if inst.coords is not None else None, inst.edge_weight_type, inst)
+    else:
+        from src.io.gen_custom import load_points
+
+        entry = (load_points(path), "EUC", None)
+    _INSTANCES.put(key, entry)
+    return entry, False
+
+
+def _distances(path: str, entry):
+    """(matriz de distancias, vino_de_la_caché) para la entrada de _load_instance."""
+    key = _instance_key(path)
+    D = _MATRICES.get(key)
+    if D is not None:
+        return D, True
+    coords, metric, inst = entry
+    if inst is not None and inst.weights is not None:
+        D = inst.weights  # EDGE_WEIGHT_SECTION explícita
+    else:
+        from src.common.distance import get_distance_matrix
+
+        D = get_distance_matrix(coords, metric, cache_dir=_DIST_DIR)
+    _MATRICES.put(key, D)
+    return D, False
+
+
+def _solve(job: Dict[str, Any], submitted: float) -> Dict[str, Any]:
+    """Corre un trabajo en el worker; nunca lanza excepciones (las reporta)."""
+    t0 = time.time()
+    timings = {"queue_s": max(0.0, t0 - submitted)}
+    line = {"id": job.get("id"), "instance": job.get("instance"), "solver": job.get("solver"),
+            "worker": os.getpid()}
+    try:
+        solver = job.get("solver")
+        if solver not in SOLVERS:
+            raise ValueError(f"Solver no soportado: {solver!r} (opciones: {', '.join(SOLVERS)})")
+        path = str(job["instance"])
+
+        t = time.time()
+        entry, line["instance_cached"] = _load_instance(path)
+        timings["load_s"] = time.time() - t
+        coords, metric, _ = entry
+        if solver != "decomp":  # la descomposición no usa la matriz n x n
+            t = time.time()
+            D, line["matrix_cached"] = _distances(path, entry)
+            timings["dist_s"] = time.time() - t
+
+        t = time.time()
+        if solver == "ga":
+            from src.ga.tsp_ga import GA_PARAMS, run_ga
+
+            params = {**GA_PARAMS, "seed": 42, **job.get("params", {})}
+            result = run_ga(coords, metric=metric, dist=D, **params)
+            line["best_cost"] = result["best"]["cost"]
+        elif solver == "decomp":
+            from src.decomp.tsp_decomp import run_decomp
+
+            params = {**DECOMP_DEFAULTS, **job.get("params", {})}
+            result = run_decomp(coords, metric=metric, **params)
+            line["best_cost"] = result["best"]["cost"]
+        else:
+            from src.lp.tsp_mtz_pulp import run_mtz
+
+            params = {**MTZ_DEFAULTS, **job.get("params", {})}
+            result = run_mtz(coords, metric=metric, dist=D, **params)
+            line["best_cost"] = result["objective"] if result.get("tour") else None
+            line["proven_optimal"] = result.get("proven_optimal")
+        timings["solve_s"] = time.time() - t
+        line["params"] = params
+
+        if job.get("out"):
+            out = Path(job["out"])
+            out.parent.mkdir(parents=True, exist_ok=True)
+            with open(out, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            line["out"] = str(out)
+        else:
+            line["result"] = result
+        line["status"] = "ok"
+    except Exception as e:
+        line["status"] = "error"
+        line["error"] = repr(e)
+        line["traceback"] = traceback.format_exc()
+    timings["total_s"] = time.time() - t0
+    line["timings"] = timings
+    return line
+
+
+def read_jobs(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Lee la cola JSONL de forma perezosa. Las líneas vacías o que empiezan con
+    '#' se ignoran; una línea inválida produce un trabajo con "_error".
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, raw in enumerate(f, 1):
+            raw = raw.strip()
+            if not raw or raw.startswith("#"):
+                continue
+            try:
+                job = json.loads(raw)
+                if not isinstance(job, dict):
+                    raise ValueError("el trabajo debe ser un objeto JSON")
+            except ValueError as e:
+                job = {"_error": f"línea {lineno}: {e}"}
+            job.setdefault("id", f"line{lineno}")
+            yield job
+
+
+def run_batch(jobs_path: str, out_path: str, max_workers: Optional[int] = None,
+              max_instances: int = MAX_INSTANCES, max_matrix_bytes: int = MAX_MATRIX_BYTES,
+              dist_dir: Optional[str] = DEFAULT_DIST_DIR) -> Dict[str, int]:
+    """
+    Despacha los trabajos de `jobs_path` a un pool persistente y escribe cada
+    resultado en `out_path` (JSONL, en orden de término) en cuanto está listo.
+
+    A lo sumo 2 trabajos por worker están en vuelo, así la cola puede ser
+    arbitrariamente larga. Si un worker muere (p. ej. por memoria), los
+    trabajos en vuelo se reportan como error y el pool se recrea.
+
+    Returns:
+        dict: {"ok": int, "error": int}
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    workers = max_workers or os.cpu_count() or 1
+    initargs = (max_instances, max_matrix_bytes, dist_dir)
+    counts = {"ok": 0, "error": 0}
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+
+    def new_pool():
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs)
+
+    with open(out_path, "w", encoding="utf-8") as out:
+        def emit(line: Dict[str, Any]) -> None:
+            counts[line["status"]] += 1
+            out.write(json.dumps(line, default=str) + "\n")
+            out.flush()
+
+        pool = new_pool()
+        in_flight = {}
+        jobs = read_jobs(jobs_path)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < 2 * workers:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                        break
+                    if "_error" in job:
+                        emit({"id": job["id"], "status": "error", "error": job["_error"], "timings": {}})
+                        continue
+                    in_flight[pool.submit(_solve, job, time.time())] = job
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for fut in done:
+                    job = in_flight.pop(fut)
+                    try:
+                        emit(fut.result())
+                    except BrokenProcessPool as e:
+                        broken = True
+                        emit({"id": job.get("id"), "instance": job.get("instance"),
+                              "solver": job.get("solver"), "status": "error",
+                              "error": f"worker terminó abruptamente: {e!r}", "timings": {}})
+                if broken:
+                    # El resto de los trabajos en vuelo murió con el pool
+                    for fut, job in in_flight.items():
+                        emit({"id": job.get("id"), "instance": job.get("instance"),
+                              "solver": job.get("solver"), "status": "error",
+                              "error": "worker terminó abruptamente", "timings": {}})
+                    in_flight.clear()
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = new_pool()
+        finally:
+            pool.shutdown(cancel_futures=True)
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Ejecuta una cola JSONL de trabajos GA/MTZ con un pool persistente")
+    ap.add_argument("--jobs", required=True, help="Cola de trabajos (JSONL)")
+    ap.add_argument("--out", required=True, help="Resultados (JSONL, una línea por trabajo)")
+    ap.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto, os.cpu_count())")
+    ap.add_argument("--max_instances", type=int, default=MAX_INSTANCES,
+                    help="Instancias en la caché LRU de cada worker")
+    ap.add_argument("--max_matrix_mb", type=int, default=MAX_MATRIX_BYTES >> 20,
+                    help="MB de matrices de distancias en la caché LRU de cada worker")
+    ap.add_argument("--dist_dir", default=DEFAULT_DIST_DIR,
+                    help="Caché .npy de matrices en disco ('' para no usarla)")
+    args = ap.parse_args()
+
+    t0 = time.time()
+    counts = run_batch(args.jobs, args.out, max_workers=args.workers,
+                       max_instances=args.max_instances, max_matrix_bytes=args.max_matrix_mb << 20,
+                       dist_dir=args.dist_dir or None)
+    print(f"[INFO] {counts['ok']} trabajos ok, {counts['error']} con error "
+          f"en {time.time() - t0:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 """
 Script: run_scenario.py
 ------------------------
-Orquestador general: carga datos (TSPLIB o custom), ejecuta GA y MTZ, 
-genera resultados en JSON, PNG y CSV.
+Orquestador general: carga datos (TSPLIB o custom), ejecuta GA y MTZ,
+guarda las corridas en el almacén SQLite (results/results.sqlite) y genera
+PNG y un CSV resumen. Con --json también escribe un JSON por corrida.
 
 Uso desde CLI:
 --------------
@@ -12,45 +13,295 @@ python scripts/run_scenario.py --name gr229 --seeds 42 1337 2025
 
 # Caso Custom
 python scripts/run_scenario.py --name custom --custom_path data/custom/mi_scenario.csv --seeds 42 1337 2025
+
+# Modo portafolio: GA (todas las semillas) y MTZ en paralelo, con incumbente
+# compartido; termina al alcanzar --target o cuando MTZ prueba el óptimo
+python scripts/run_scenario.py --name eil101 --seeds 42 1337 2025 --portfolio --target 650
 """
 
 import argparse
 import json
+import os
+import queue
+import signal
 import time
 from pathlib import Path
 
-import pandas as pd
-
-from src.io.tsplib import read_tsplib
-from src.io.seeded_rng import set_seeds
-from src.ga.tsp_ga import run_ga
-from src.lp.tsp_mtz_pulp import run_mtz
-from src.viz.plot_tour import save_tour_png, save_convergence_png
+from src.io.tsplib import read_tsplib, read_tsplib_instance
+from src.io.gen_custom import load_points
+from src.common.incumbent import SharedIncumbent
+from src.common.result_cache import ResultCache, DEFAULT_CACHE_DIR
+from src.common.results_store import ResultsStore, DEFAULT_DB
+from src.common.distance import DEFAULT_DIST_DIR, coords_hash, get_distance_matrix
+from src.ga.tsp_ga import GA_PARAMS, run_ga
 from src.viz.compare import save_summary_csv
+from src.viz.render import SyncRenderer, DeferredRenderer
+
+# PuLP y matplotlib se importan sólo donde se usan (MTZ / figuras), para que
+# las corridas cortas o sin figuras arranquen rápido
 
 
 def load_data(name: str, custom_path: str = None):
-    """Carga coordenadas desde TSPLIB o un CSV custom."""
+    """Carga coordenadas desde TSPLIB o un archivo custom (.csv, .npy, .tsp, .tsp.gz)."""
     if name in ["eil101", "gr229"]:
         path = f"data/tsplib/{name}.tsp"
         return read_tsplib(path)
     elif name == "custom":
         if not custom_path:
             raise ValueError("Debe especificar --custom_path para escenario custom")
-        import pandas as pd
-
-        df = pd.read_csv(custom_path)
-        return list(zip(df["x"], df["y"]))
+        return load_points(custom_path)
     else:
         raise ValueError(f"Escenario no reconocido: {name}")
 
 
+def load_metric(name: str, custom_path: str = None) -> str:
+    """Métrica de distancias: EDGE_WEIGHT_TYPE del TSPLIB, o EUC para CSV/.npy custom."""
+    if name in ["eil101", "gr229"]:
+        return read_tsplib_instance(f"data/tsplib/{name}.tsp").edge_weight_type
+    if custom_path and (custom_path.endswith(".tsp") or custom_path.endswith(".tsp.gz")):
+        return read_tsplib_instance(custom_path).edge_weight_type
+    return "EUC"
+
+
+# Segundos que MTZ deja mejorar al GA antes de leer el incumbente como cutoff
+MTZ_DELAY_S = 2.0
+# Tolerancia sobre el incumbente: con cutoff exacto CBC descartaría el mismo tour
+MTZ_CUTOFF_EPS = 1e-6
+
+
+def _ga_worker(out_q, coords, metric: str, seed: int, incumbent: SharedIncumbent,
+               cache_dir: str = DEFAULT_DIST_DIR) -> None:
+    """Proceso GA del portafolio: corre una semilla y envía su resultado."""
+    try:
+        start = time.time()
+        D = get_distance_matrix(coords, metric, cache_dir=cache_dir)  # memory-map compartido
+        result = run_ga(coords, seed=seed, incumbent=incumbent, metric=metric, dist=D, **GA_PARAMS)
+        result["time_s"] = time.time() - start
+        out_q.put(("ga", seed, result))
+    except Exception as e:
+        out_q.put(("error", seed, repr(e)))
+
+
+def _mtz_worker(out_q, coords, metric: str, time_limit: int, incumbent: SharedIncumbent,
+                delay: float, cache_dir: str = DEFAULT_DIST_DIR) -> None:
+    """Proceso MTZ del portafolio: usa el incumbente del GA como cutoff."""
+    # Grupo de procesos propio para que el padre pueda matar también a CBC
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    try:
+        if incumbent.wait_stop(delay):
+            return
+        best = incumbent.value
+        cutoff = best * (1 + MTZ_CUTOFF_EPS) if best < float("inf") else None
+        from src.lp.tsp_mtz_pulp import run_mtz
+
+        D = get_distance_matrix(coords, metric, cache_dir=cache_dir)
+        res = run_mtz(coords, time_limit=time_limit, cutoff=cutoff, metric=metric, dist=D)
+        if res["proven_optimal"] and res["objective"] is not None:
+            incumbent.mark_optimal(res["objective"])
+        elif res["tour"] and res["objective"] is not None:
+            # Mejor tour sin óptimo probado: también cuenta para --target
+            incumbent.offer(res["objective"])
+        out_q.put(("mtz", None, res))
+    except Exception as e:
+        out_q.put(("error", "mtz", repr(e)))
+
+
+def _kill_process_tree(proc) -> None:
+    """Termina un worker y, en POSIX, su grupo (incluye el proceso CBC)."""
+    if proc.exitcode is not None:
+        return
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.terminate()
+
+
+def run_portfolio(coords, seeds, time_limit: int, target=None, mtz_delay: float = MTZ_DELAY_S,
+                  with_mtz: bool = True, metric: str = "EUC", cache_dir: str = DEFAULT_DIST_DIR):
+    """
+    Lanza en paralelo un proceso GA por semilla y un proceso MTZ.
+
+    Comparten el incumbente (SharedIncumbent): el GA publica sus mejoras,
+    MTZ arranca tras `mtz_delay` segundos con el mejor costo como cutoff,
+    y todos paran en cuanto se alcanza `target` o MTZ prueba el óptimo.
+    Con `with_mtz=False` sólo corre el GA (p. ej. si MTZ ya está en caché).
+    Los workers abren la misma matriz de distancias memory-mapeada (en
+    `cache_dir`); si es demasiado grande falla con ValueError antes de
+    lanzar nada.
+
+    Returns:
+        (dict[seed, result], mtz_result | None, SharedIncumbent)
+    """
+    import multiprocessing as mp
+
+    get_distance_matrix(coords, metric, cache_dir=cache_dir)  # crea el .npy antes de lanzar workers
+    incumbent = SharedIncumbent(target=target)
+    out_q = mp.Queue()
+    procs = {seed: mp.Process(target=_ga_worker,
+                              args=(out_q, coords, metric, seed, incumbent, cache_dir))
+             for seed in seeds}
+    if with_mtz:
+        procs["mtz"] = mp.Process(target=_mtz_worker,
+                                  args=(out_q, coords, metric, time_limit, incumbent, mtz_delay,
+                                        cache_dir))
+    for p in procs.values():
+        p.start()
+
+    ga_results, mtz_result = {}, None
+    pending = set(procs)
+
+    def handle(msg) -> None:
+        nonlocal mtz_result
+        kind, key, payload = msg
+        if kind == "ga":
+            ga_results[key] = payload
+        elif kind == "mtz":
+            mtz_result = payload
+            key = "mtz"
+        else:
+            print(f"[WARN] Worker {key} falló: {payload}")
+        pending.discard(key)
+
+    while pending:
+        try:
+            handle(out_q.get(timeout=0.2))
+        except queue.Empty:
+            if incumbent.should_stop() and "mtz" in pending:
+                # Meta alcanzada: no esperamos a que CBC termine
+                _kill_process_tree(procs["mtz"])
+                pending.discard("mtz")
+                print("[INFO] Portafolio: meta alcanzada, MTZ detenido.")
+            if all(procs[k].exitcode is not None for k in pending):
+                # Un resultado enviado justo antes de salir puede seguir en
+                # el pipe: drenar antes de dar a alguien por perdido
+                while True:
+                    try:
+                        handle(out_q.get_nowait())
+                    except queue.Empty:
+                        break
+                for k in pending:
+                    print(f"[WARN] Worker {k} terminó sin resultado (exitcode={procs[k].exitcode})")
+                break
+
+    for p in procs.values():
+        p.join(timeout=5)
+    return ga_results, mtz_result, incumbent
+
+
+def _ga_cache_params(seed: int, metric: str) -> dict:
+    return {**GA_PARAMS, "seed": seed, "metric": metric}
+
+
+def _mtz_cache_params(time_limit: int, metric: str) -> dict:
+    return {"time_limit": time_limit, "metric": metric}
+
+
+def _cache_ga(cache, coords, metric: str, seed: int, result: dict) -> None:
+    """Sólo se cachean corridas GA completas (no detenidas por el portafolio)."""
+    if cache is not None and not result.get("stopped_early"):
+        cache.put(coords, "ga", _ga_cache_params(seed, metric), result)
+
+
+def _cache_mtz(cache, coords, metric: str, time_limit: int, result: dict) -> None:
+    """
+    Óptimos probados van al espacio 'complete' (valen para cualquier
+    time_limit); cortes por tiempo al espacio 'timeout'. Un corte por tiempo
+    con cutoff depende del incumbente del GA, así que no se cachea.
+    """
+    if cache is None:
+        return
+    params = _mtz_cache_params(time_limit, metric)
+    if result.get("proven_optimal") and result.get("tour"):
+        cache.put(coords, "mtz", params, result, complete=True)
+    elif result.get("cutoff") is None:
+        cache.put(coords, "mtz", params, result, complete=False)
+
+
+class _Outputs:
+    """
+    Destino de los resultados de una corrida del orquestador: almacén
+    SQLite (siempre), JSON por corrida (opcional, --json) y figuras.
+    """
+
+    def __init__(self, name: str, instance: str, results_dir: Path, store: ResultsStore,
+                 instance_hash: str, renderer=None, write_json: bool = False):
+        self.name = name
+        self.instance = instance
+        self.results_dir = results_dir
+        self.store = store
+        self.instance_hash = instance_hash
+        self.renderer = renderer
+        self.write_json = write_json
+
+    def _persist(self, solver: str, result: dict, params: dict, json_name: str, cached: bool):
+        """Guarda en el almacén (y en JSON si se pidió); devuelve la fuente para las figuras."""
+        # Un hit de caché no es una corrida nueva: no se duplica en el almacén
+        run_id = self.store.add_run(self.instance, solver, result, params,
+                                    instance_hash=self.instance_hash, skip_existing=cached)
+        if self.write_json:
+            out_json = self.results_dir / json_name
+            with open(out_json, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+        return run_id, (self.store.path, run_id)
+
+    def ga(self, seed: int, result: dict, cached: bool = False) -> dict:
+        """Guarda una corrida GA y sus figuras; devuelve su fila de resumen."""
+        run_id, source = self._persist("ga", result, result["params"], f"ga_seed{seed}.json", cached)
+
+        # Graficar tour y convergencia
+        if self.renderer is not None:
+            self.renderer.ga(source, result, self.results_dir / f"{self.name}_tour_GA_seed{seed}.png",
+                             self.results_dir / f"{self.name}_convergence_seed{seed}.png")
+
+        return {
+            "instance": self.instance,
+            "seed": seed,
+            "N": result["params"]["N"],
+            "maxIter": result["params"].get("max_iter", result["params"].get("maxIter")),
+            "crossover": result["params"]["crossover"],
+            "pmut": result["params"]["pmut"],
+            "elitism": result["params"]["elitism"],
+            "best_cost": result["best"]["cost"],
+            "best_len": len(result["best"]["tour"]),
+            "time_s": result["time_s"],
+            "run_id": run_id,
+        }
+
+    def mtz(self, params: dict, result: dict, cached: bool = False) -> None:
+        _, source = self._persist("mtz", result, params, "mtz_opt.json", cached)
+        if self.renderer is not None:
+            self.renderer.mtz(source, result, self.results_dir / f"{self.name}_tour_OPT.png")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Orquestador de escenarios TSP (GA + MTZ)")
     parser.add_argument("--name", type=str, required=True, choices=["eil101", "gr229", "custom"])
     parser.add_argument("--seeds", type=int, nargs="+", required=True, help="Lista de semillas para correr GA")
-    parser.add_argument("--custom_path", type=str, default=None, help="Ruta al CSV del escenario custom")
+    parser.add_argument("--custom_path", type=str, default=None,
+                        help="Ruta del escenario custom (.csv, .npy, .tsp o .tsp.gz)")
     parser.add_argument("--time_limit", type=int, default=600, help="Tiempo límite (seg) para MTZ")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="Corre GA y MTZ en paralelo con incumbente compartido")
+    parser.add_argument("--target", type=float, default=None,
+                        help="Costo objetivo: el portafolio termina al alcanzarlo")
+    parser.add_argument("--mtz_delay", type=float, default=MTZ_DELAY_S,
+                        help="Segundos que MTZ espera al GA antes de tomar el cutoff (portafolio)")
+    parser.add_argument("--plots", choices=["sync", "deferred", "none"], default="sync",
+                        help="Figuras: en el momento, en un pool de procesos en segundo plano, o ninguna")
+    parser.add_argument("--no-plots", dest="plots", action="store_const", const="none",
+                        help="Equivale a --plots none")
+    parser.add_argument("--db", type=str, default=DEFAULT_DB,
+                        help="Almacén SQLite de resultados (ver scripts/make_summary.py)")
+    parser.add_argument("--json", action="store_true",
+                        help="Además escribe un JSON por corrida (formato anterior)")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true",
+                        help="Ignora el caché de resultados y vuelve a resolver todo")
+    parser.add_argument("--cache_dir", type=str, default=DEFAULT_CACHE_DIR,
+                        help="Carpeta del caché de resultados")
     args = parser.parse_args()
 
     # === Preparar carpetas de salida ===
@@ -59,73 +310,116 @@ def main():
 
     # === Cargar datos ===
     coords = load_data(args.name, args.custom_path)
+    metric = load_metric(args.name, args.custom_path)
 
-    summary_rows = []
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+    summary_rows = {}
 
-    # === Ejecutar GA para cada semilla ===
-    for seed in args.seeds:
-        set_seeds(seed)
-        print(f"[INFO] Corriendo GA para {args.name} con semilla {seed}...")
+    # Con --plots deferred las figuras de cada semilla se encolan apenas se
+    # guarda su JSON y se dibujan mientras corren las siguientes
+    renderer = None
+    if args.plots == "sync":
+        renderer = SyncRenderer(coords)
+    elif args.plots == "deferred":
+        renderer = DeferredRenderer(coords)
 
-        start = time.time()
-        result = run_ga(
-            coords,
-            N=100,
-            max_iter=300,
-            crossover="OX",
-            pmut=0.2,
-            elitism=0.03,
-            seed=seed,
-        )
-        elapsed = time.time() - start
-        result["time_s"] = elapsed
-
-        # Guardar JSON
-        out_json = results_dir / f"ga_seed{seed}.json"
-        with open(out_json, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2)
+    instance = args.name if args.name != "custom" else Path(args.custom_path).name.split(".")[0]
+    outputs = _Outputs(args.name, instance, results_dir, ResultsStore(args.db), coords_hash(coords),
+                       renderer=renderer, write_json=args.json)
 
-        # Graficar tour y convergencia
-        save_tour_png(coords, result["best"]["tour"], results_dir / f"{args.name}_tour_GA_seed{seed}.png")
-        save_convergence_png(result["best_history"], results_dir / f"{args.name}_convergence_seed{seed}.png")
-
-        # Agregar fila al resumen
-        summary_rows.append(
-            {
-                "instance": args.name,
-                "seed": seed,
-                "N": result["params"]["N"],
-                "maxIter": result["params"].get("max_iter", result["params"].get("maxIter")),
-                "crossover": result["params"]["crossover"],
-                "pmut": result["params"]["pmut"],
-                "elitism": result["params"]["elitism"],
-                "best_cost": result["best"]["cost"],
-                "best_len": len(coords),
-                "time_s": result["time_s"],
-                "file_json": str(out_json),
-            }
-        )
-
-    # === Ejecutar MTZ (solo si no es demasiado grande) ===
-    if args.name in ["eil101", "gr229", "custom"]:
+    def save_ga(seed: int, result: dict, cached: bool = False) -> None:
+        summary_rows[seed] = outputs.ga(seed, result, cached)
+
+    # === Resultados ya calculados (mismas coordenadas y parámetros) ===
+    ga_results, mtz_result = {}, None
+    if cache is not None:
+        for seed in args.seeds:
+            hit = cache.get(coords, "ga", _ga_cache_params(seed, metric))
+            if hit is not None:
+                print(f"[CACHE] GA semilla {seed}: resultado en caché")
+                ga_results[seed] = hit
+                save_ga(seed, hit, cached=True)
+        mtz_result = cache.get(coords, "mtz", _mtz_cache_params(args.time_limit, metric))
+        if mtz_result is not None:
+            print(f"[CACHE] MTZ: resultado en caché (status={mtz_result['status']})")
+    mtz_cached = mtz_result is not None
+    pending_seeds = [s for s in args.seeds if s not in ga_results]
+
+    if args.portfolio and (pending_seeds or mtz_result is None):
+        target = args.target
+        if mtz_result is not None and mtz_result.get("proven_optimal"):
+            # Óptimo conocido: el GA puede parar en cuanto lo alcance
+            opt = mtz_result["objective"]
+            target = opt if target is None else min(target, opt)
+        mtz_label = " + MTZ" if mtz_result is None else ""
+        print(f"[INFO] Portafolio GA({len(pending_seeds)} semillas){mtz_label} para {args.name}...")
+        t0 = time.time()
         try:
-            print(f"[INFO] Corriendo MTZ para {args.name}...")
-            mtz_result = run_mtz(coords, time_limit=args.time_limit)
+            new_ga, new_mtz, incumbent = run_portfolio(
+                coords, pending_seeds, args.time_limit, target=target, mtz_delay=args.mtz_delay,
+                with_mtz=mtz_result is None, metric=metric,
+            )
+        except ValueError as e:
+            print(f"[WARN] Portafolio omitido: {e}")
+            new_ga, new_mtz = {}, None
+        else:
+            print(f"[INFO] Portafolio terminado en {time.time() - t0:.2f}s "
+                  f"incumbente={incumbent.value:.4f} óptimo_probado={incumbent.proven_optimal}")
+        for seed, result in new_ga.items():
+            _cache_ga(cache, coords, metric, seed, result)
+            save_ga(seed, result)
+        ga_results.update(new_ga)
+        if new_mtz is not None:
+            _cache_mtz(cache, coords, metric, args.time_limit, new_mtz)
+            mtz_result = new_mtz
+    elif not args.portfolio:
+        # La matriz se construye recién cuando un solver la necesita: con todo
+        # en caché no se toca, y si es demasiado grande se omite el solver
+        D = None
+        if pending_seeds:
+            try:
+                D = get_distance_matrix(coords, metric)
+            except ValueError as e:
+                print(f"[WARN] GA omitido: {e}")
+                pending_seeds = []
 
-            out_json = results_dir / "mtz_opt.json"
-            with open(out_json, "w", encoding="utf-8") as f:
-                json.dump(mtz_result, f, indent=2)
+        # === Ejecutar GA para cada semilla ===
+        for seed in pending_seeds:
+            print(f"[INFO] Corriendo GA para {args.name} con semilla {seed}...")
+
+            start = time.time()
+            result = run_ga(coords, seed=seed, metric=metric, dist=D, **GA_PARAMS)
+            elapsed = time.time() - start
+            result["time_s"] = elapsed
+            _cache_ga(cache, coords, metric, seed, result)
+            ga_results[seed] = result
+            save_ga(seed, result)
 
-            if mtz_result.get("tour"):
-                save_tour_png(coords, mtz_result["tour"], results_dir / f"{args.name}_tour_OPT.png")
+        # === Ejecutar MTZ (solo si no es demasiado grande) ===
+        if mtz_result is None and args.name in ["eil101", "gr229", "custom"]:
+            try:
+                print(f"[INFO] Corriendo MTZ para {args.name}...")
+                from src.lp.tsp_mtz_pulp import run_mtz
 
-        except Exception as e:
-            print(f"[WARN] MTZ falló: {e}")
+                if D is None:
+                    D = get_distance_matrix(coords, metric)
+                mtz_result = run_mtz(coords, time_limit=args.time_limit, metric=metric, dist=D)
+                _cache_mtz(cache, coords, metric, args.time_limit, mtz_result)
+
+            except Exception as e:
+                print(f"[WARN] MTZ falló: {e}")
+
+    if mtz_result is not None:
+        outputs.mtz(_mtz_cache_params(args.time_limit, metric), mtz_result, cached=mtz_cached)
 
     # === Guardar resumen CSV ===
     out_csv = results_dir / "summary.csv"
-    save_summary_csv(summary_rows, out_csv)
-    print(f"[INFO] Resumen guardado en {out_csv}")
+    save_summary_csv([summary_rows[s] for s in args.seeds if s in summary_rows], out_csv)
+    print(f"[INFO] Resumen guardado en {out_csv} (corridas en {args.db})")
+
+    if renderer is not None:
+        for err in renderer.close():
+            print(f"[WARN] Figura falló: {err}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""
+Módulo: anytime
+----------------
+Métricas "anytime" sobre la traza del incumbente (costo vs tiempo) de una
+corrida, para comparar solvers y parámetros a igual tiempo:
+
+- time-to-target (TTT): primer instante en que el incumbente queda a menos
+  de un % del costo de referencia.
+- perfiles de desempeño (Dolan-Moré) sobre los TTT.
+- área bajo la curva gap-vs-tiempo (AUC), normalizada por el horizonte.
+
+Una traza es un par (t, cost) de arreglos: t creciente en segundos y cost el
+mejor costo conocido en ese instante (función escalón, continua por derecha).
+"""
+
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Gap máximo (fracción) antes del primer incumbente o por encima de él
+GAP_CAP = 1.0
+
+
+def trace_from_result(result: dict, offset: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Traza de un resultado de GA/descomposición (best_history + time_history)
+    o de MTZ (un solo punto al final, si encontró tour).
+
+    Args:
+        result (dict): resultado del solver
+        offset (float): segundos a sumar (p. ej. lectura + matriz de distancias)
+    """
+    if "best_history" in result and result.get("time_history"):
+        t = np.asarray(result["time_history"], dtype=np.float64)
+        c = np.minimum.accumulate(np.asarray(result["best_history"], dtype=np.float64))
+    elif result.get("tour") and result.get("objective") is not None:
+        t = np.array([float(result.get("time_s") or 0.0)])
+        c = np.array([float(result["objective"])])
+    else:
+        t, c = np.empty(0), np.empty(0)
+    return t + offset, c
+
+
+def time_to_target(t: np.ndarray, cost: np.ndarray, target: float, rtol: float = 1e-9) -> float:
+    """
+    Primer instante con cost <= target (inf si nunca). `rtol` absorbe el ruido
+    de punto flotante entre solvers que suman el mismo tour en otro orden.
+    """
+    hit = np.flatnonzero(cost <= target * (1.0 + rtol))
+    return float(t[hit[0]]) if hit.size else float("inf")
+
+
+def gap_at(t: np.ndarray, cost: np.ndarray, ref: float, grid: np.ndarray,
+           cap: float = GAP_CAP) -> np.ndarray:
+    """Gap relativo (cost - ref) / ref del incumbente en cada instante de `grid`."""
+    gaps = np.minimum((cost - ref) / ref, cap) if len(cost) else np.empty(0)
+    k = np.searchsorted(t, grid, side="right") - 1
+    out = np.full(len(grid), cap, dtype=np.float64)
+    seen = k >= 0
+    out[seen] = gaps[k[seen]]
+    return out
+
+
+def quality_auc(t: np.ndarray, cost: np.ndarray, ref: float, horizon: float,
+                cap: float = GAP_CAP) -> float:
+    """
+    Área bajo gap(t) en [0, horizon], dividida por horizon (0 = óptimo desde
+    el instante 0; `cap` = sin solución útil en todo el horizonte). Integral
+    exacta de la función escalón.
+    """
+    if horizon <= 0:
+        raise ValueError("horizon debe ser positivo")
+    inside = t < horizon
+    ts = np.concatenate(([0.0], t[inside], [horizon]))
+    gaps = np.concatenate(([cap], np.minimum((cost[inside] - ref) / ref, cap)))
+    return float((np.diff(ts) * gaps).sum() / horizon)
+
+
+def ecdf(values: Sequence[float], grid: np.ndarray) -> np.ndarray:
+    """Fracción de `values` <= cada punto de `grid` (los inf nunca cuentan)."""
+    v = np.sort(np.asarray(values, dtype=np.float64))
+    if v.size == 0:
+        return np.zeros(len(grid))
+    return np.searchsorted(v, grid, side="right") / v.size
+
+
+def performance_profile(table: Dict[Hashable, Dict[str, float]],
+                        taus: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Perfil de desempeño de Dolan-Moré.
+
+    Args:
+        table: {problema: {config: medida}} (menor es mejor; inf = falló)
+        taus: factores sobre el mejor (por defecto 1..máximo ratio finito)
+
+    Returns:
+        (taus, {config: rho}) con rho[i] = fracción de problemas en que la
+        config queda a un factor <= taus[i] de la mejor
+    """
+    configs = sorted({c for row in table.values() for c in row})
+    ratios = {c: [] for c in configs}
+    for row in table.values():
+        best = min(row.get(c, float("inf")) for c in configs)
+        for c in configs:
+            v = row.get(c, float("inf"))
+            if not np.isfinite(v) or not np.isfinite(best):
+                ratios[c].append(float("inf"))
+            else:
+                ratios[c].append(v / best if best > 0 else (1.0 if v <= best else float("inf")))
+    if taus is None:
+        finite = [r for rs in ratios.values() for r in rs if np.isfinite(r)]
+        top = max(finite) if finite else 1.0
+        taus = np.unique(np.concatenate(([1.0], np.geomspace(1.0, max(top, 1.0 + 1e-9), 200))))
+    return taus, {c: ecdf(ratios[c], taus) for c in configs}
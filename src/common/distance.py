@@ -0,0 +1,163 @@
+"""
+Módulo: distance
+-----------------
+Servicio único de distancias para GA, MTZ y métricas.
+
+Calcula matrices con NumPy (por bloques de filas) para las métricas TSPLIB
+EUC_2D, CEIL_2D, ATT y GEO, más EUC (euclídea sin redondeo, la que usan los
+CSV custom). Las matrices se guardan en disco como .npy, indexadas por hash
+de la instancia + métrica, y se abren con memory-map: corridas repetidas y
+workers en paralelo comparten una sola copia (la caché de páginas del SO).
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+DEFAULT_DIST_DIR = ".cache/dist"
+METRICS = ("EUC", "EUC_2D", "CEIL_2D", "ATT", "GEO")
+# Filas por bloque al construir la matriz (acota la memoria temporal)
+BLOCK_ROWS = 1024
+# Tope para una matriz densa n x n float64 (~23k ciudades); por encima, usar
+# src.decomp.tsp_decomp, que no necesita la matriz completa
+MAX_MATRIX_BYTES = 4 * 2**30
+
+# Constantes de la especificación TSPLIB para GEO
+_GEO_PI = 3.141592
+_GEO_RRR = 6378.388
+
+
+def coords_hash(coords) -> str:
+    """Hash SHA-256 (hex) del arreglo de coordenadas (float64, forma incluida)."""
+    arr = np.ascontiguousarray(np.asarray(coords, dtype=np.float64))
+    h = hashlib.sha256()
+    h.update(str(arr.shape).encode())
+    h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def check_metric(metric: str) -> str:
+    """Normaliza `metric` a mayúsculas; ValueError si no está en METRICS."""
+    metric = metric.upper()
+    if metric not in METRICS:
+        raise ValueError(f"Métrica no soportada: {metric} (opciones: {', '.join(METRICS)})")
+    return metric
+
+
+def _geo_radians(xy: np.ndarray) -> np.ndarray:
+    """Convierte DDD.MM (grados.minutos, formato TSPLIB) a radianes."""
+    deg = np.trunc(xy)
+    minutes = xy - deg
+    return _GEO_PI * (deg + 5.0 * minutes / 3.0) / 180.0
+
+
+def pairwise(a: np.ndarray, b: np.ndarray, metric: str = "EUC") -> np.ndarray:
+    """
+    Distancias entre a[i] y b[j] con broadcasting.
+
+    Args:
+        a (ndarray): forma (..., 2)
+        b (ndarray): forma (..., 2), compatible por broadcasting con `a`
+        metric (str): una de METRICS
+
+    Returns:
+        ndarray: distancias con la forma del broadcasting de a[..., 0] y b[..., 0]
+    """
+    metric = check_metric(metric)
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+
+    if metric == "GEO":
+        ra, rb = _geo_radians(a), _geo_radians(b)
+        q1 = np.cos(ra[..., 1] - rb[..., 1])
+        q2 = np.cos(ra[..., 0] - rb[..., 0])
+        q3 = np.cos(ra[..., 0] + rb[..., 0])
+        arg = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        d = np.floor(_GEO_RRR * np.arccos(arg) + 1.0)
+        # La fórmula da 1 para un nodo consigo mismo
+        same = (a[..., 0] == b[..., 0]) & (a[..., 1] == b[..., 1])
+        return np.where(same, 0.0, d)
+
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    sq = dx * dx + dy * dy
+    if metric == "EUC":
+        return np.sqrt(sq)
+    if metric == "EUC_2D":
+        return np.floor(np.sqrt(sq) + 0.5)
+    if metric == "CEIL_2D":
+        return np.ceil(np.sqrt(sq))
+    # ATT (pseudo-euclídea)
+    r = np.sqrt(sq / 10.0)
+    t = np.floor(r + 0.5)
+    return np.where(t < r, t + 1.0, t)
+
+
+def distance_matrix(coords, metric: str = "EUC", out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Matriz n x n de distancias (float64), calculada por bloques de filas.
+
+    Args:
+        coords: lista de (x, y) o ndarray (n, 2)
+        metric (str): una de METRICS
+        out (ndarray | None): arreglo destino (p. ej. un memmap)
+    """
+    xy = np.asarray(coords, dtype=np.float64)
+    n = len(xy)
+    D = out if out is not None else np.empty((n, n), dtype=np.float64)
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(n, start + BLOCK_ROWS)
+        D[start:stop] = pairwise(xy[start:stop, None, :], xy[None, :, :], metric)
+    return D
+
+
+def check_matrix_size(n: int, max_bytes: int = MAX_MATRIX_BYTES) -> None:
+    """ValueError si la matriz densa de `n` ciudades supera `max_bytes` (antes de reservarla)."""
+    size = 8 * n * n
+    if size > max_bytes:
+        raise ValueError(f"La matriz de distancias de {n} ciudades ocuparía {size / 2**30:.1f} GiB "
+                         f"(tope {max_bytes / 2**30:.1f} GiB); para instancias de este tamaño "
+                         f"usar src.decomp.tsp_decomp")
+
+
+def get_distance_matrix(coords, metric: str = "EUC",
+                        cache_dir: Optional[str] = DEFAULT_DIST_DIR) -> np.ndarray:
+    """
+    Devuelve la matriz de distancias memory-mapeada (solo lectura) desde el
+    caché .npy, construyéndola la primera vez. Con cache_dir=None se calcula
+    en memoria sin tocar el disco. Falla con ValueError antes de reservar
+    nada si la matriz superaría MAX_MATRIX_BYTES.
+    """
+    metric = check_metric(metric)
+    check_matrix_size(len(coords))
+    if cache_dir is None:
+        return distance_matrix(coords, metric)
+
+    path = Path(cache_dir) / f"{coords_hash(coords)}_{metric}.npy"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        n = len(coords)
+        # Se escribe directo a un memmap temporal y se publica con un rename
+        # atómico, para que workers concurrentes nunca vean un archivo a medias
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        D = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float64, shape=(n, n))
+        distance_matrix(coords, metric, out=D)
+        D.flush()
+        del D
+        os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+
+def tour_cost(order: Sequence[int], D: np.ndarray) -> float:
+    """Costo del ciclo `order` (cierra en el primer nodo) usando la matriz D."""
+    idx = np.asarray(order, dtype=np.intp)
+    return float(D[idx, np.roll(idx, -1)].sum())
+
+
+def population_costs(pop, D: np.ndarray) -> np.ndarray:
+    """Costos de todos los tours de una población (arreglo pop_size x n) a la vez."""
+    P = np.asarray(pop, dtype=np.intp)
+    return D[P, np.roll(P, -1, axis=1)].sum(axis=1)
@@ -0,0 +1,71 @@
+"""
+Módulo: incumbent
+------------------
+Canal liviano para compartir el mejor costo conocido (incumbente) entre
+procesos: los GA publican sus mejoras, MTZ lo usa como cutoff y cualquiera
+puede pedir que todos se detengan cuando se alcanza la meta de calidad.
+"""
+
+import math
+import multiprocessing as mp
+from typing import Optional
+
+
+class SharedIncumbent:
+    """
+    Incumbente compartido entre procesos (multiprocessing.Value + Event).
+
+    Debe pasarse como argumento al crear cada Process para que sea heredado.
+
+    Args:
+        target (float | None): costo objetivo; al alcanzarlo se pide parar
+        ctx: contexto de multiprocessing (por defecto el global)
+    """
+
+    def __init__(self, target: Optional[float] = None, ctx=None):
+        ctx = ctx or mp.get_context()
+        self.target = target
+        self._best = ctx.Value("d", math.inf)
+        self._proven = ctx.Value("b", 0)
+        self._stop = ctx.Event()
+
+    @property
+    def value(self) -> float:
+        """Mejor costo publicado hasta ahora (inf si no hay ninguno)."""
+        return self._best.value
+
+    @property
+    def proven_optimal(self) -> bool:
+        """True si algún solver probó que el incumbente es óptimo."""
+        return bool(self._proven.value)
+
+    def offer(self, cost: float) -> bool:
+        """
+        Publica un costo; devuelve True si mejora el incumbente.
+        Si alcanza el objetivo, activa la señal de parada.
+        """
+        with self._best.get_lock():
+            improved = cost < self._best.value
+            if improved:
+                self._best.value = cost
+        if self.target is not None and cost <= self.target:
+            self._stop.set()
+        return improved
+
+    def mark_optimal(self, cost: float) -> None:
+        """Registra un óptimo probado y pide a todos que se detengan."""
+        with self._best.get_lock():
+            self._best.value = min(self._best.value, cost)
+        with self._proven.get_lock():
+            self._proven.value = 1
+        self._stop.set()
+
+    def wait_stop(self, timeout: Optional[float] = None) -> bool:
+        """Espera hasta `timeout` segundos; True si ya se pidió parar."""
+        return self._stop.wait(timeout)
+
+    def should_stop(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self) -> None:
+        self._stop.set()
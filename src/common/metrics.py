@@ -1,21 +1,20 @@
 # src/common/metrics.py
 from __future__ import annotations
-import math
 from typing import List, Tuple
 
+import numpy as np
+
+from .distance import pairwise
+
 Coords = List[Tuple[float, float]]
 Tour = List[int]
 
-def tour_length(order: Tour, coords: Coords) -> float:
-    n = len(order)
-    d = 0.0
-    for i in range(n):
-        a = order[i]
-        b = order[(i + 1) % n]
-        ax, ay = coords[a]
-        bx, by = coords[b]
-        d += math.hypot(ax - bx, ay - by)
-    return d
+def tour_length(order: Tour, coords: Coords, metric: str = "EUC") -> float:
+    # largo del ciclo (cierra en el primer nodo) con la métrica indicada
+    if len(order) == 0:
+        return 0.0
+    xy = np.asarray(coords, dtype=np.float64)[np.asarray(order, dtype=np.intp)]
+    return float(pairwise(xy, np.roll(xy, -1, axis=0), metric).sum())
 
 def percent_error(value: float, optimum: float) -> float:
     if optimum <= 0:
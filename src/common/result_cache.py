@@ -0,0 +1,143 @@
+"""
+Módulo: result_cache
+---------------------
+Caché local en disco de resultados de solvers (GA / MTZ), direccionado por
+contenido: la llave es un hash de las coordenadas, el solver y el conjunto
+completo de parámetros (semilla y time_limit incluidos).
+
+Los resultados se guardan como el mismo JSON que produce el solver, en dos
+espacios separados:
+  - complete/: corridas que terminaron (GA completo, MTZ con óptimo probado).
+    Un óptimo probado no depende del time_limit, así que se indexa sin él.
+  - timeout/: corridas cortadas por tiempo; sólo valen para el mismo time_limit.
+
+Evicción LRU (por mtime, que se refresca en cada hit) por número de entradas
+y por tamaño total.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .distance import coords_hash
+
+DEFAULT_CACHE_DIR = ".cache/results"
+# Subirlo invalida entradas viejas si cambia el formato de resultados o si
+# la misma semilla deja de dar el mismo resultado (3: RNG por corrida,
+# 4: reinicios por diversidad en el GA, 5: torneos sorteados por índices,
+# 6: inmigrantes de vecino más cercano)
+CACHE_VERSION = 6
+# Parámetros que sólo afectan corridas cortadas por tiempo
+TIME_KEYS = ("time_limit",)
+
+COMPLETE = "complete"
+TIMEOUT = "timeout"
+
+
+def make_key(coords, solver: str, params: Dict[str, Any], chash: Optional[str] = None) -> str:
+    """Llave de caché: hash de coordenadas + solver + parámetros (orden estable)."""
+    material = json.dumps(
+        {
+            "v": CACHE_VERSION,
+            "coords": chash or coords_hash(coords),
+            "solver": solver,
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Caché de resultados JSON en disco.
+
+    Args:
+        root (str): carpeta raíz del caché
+        max_entries (int): máximo de entradas (complete + timeout)
+        max_bytes (int): tamaño máximo total en bytes
+    """
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_entries: int = 500,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.root / kind / f"{key}.json"
+
+    @staticmethod
+    def _without_time(params: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in params.items() if k not in TIME_KEYS}
+
+    def get(self, coords, solver: str, params: Dict[str, Any]) -> Optional[dict]:
+        """
+        Busca un resultado: primero uno completo (ignora time_limit),
+        luego uno cortado por tiempo con exactamente los mismos parámetros.
+        """
+        chash = coords_hash(coords)
+        candidates = [
+            self._path(COMPLETE, make_key(None, solver, self._without_time(params), chash)),
+            self._path(TIMEOUT, make_key(None, solver, params, chash)),
+        ]
+        for path in candidates:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    result = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            os.utime(path)  # marca como usado recientemente (LRU)
+            return result
+        return None
+
+    def put(self, coords, solver: str, params: Dict[str, Any], result: dict,
+            complete: bool = True) -> Path:
+        """
+        Guarda un resultado. `complete=False` para corridas cortadas por
+        tiempo: se indexan con el time_limit y en su propio espacio.
+        """
+        if complete:
+            path = self._path(COMPLETE, make_key(coords, solver, self._without_time(params)))
+        else:
+            path = self._path(TIMEOUT, make_key(coords, solver, params))
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Escritura atómica: varios procesos pueden compartir el caché
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Borra las entradas menos usadas hasta cumplir los límites; devuelve cuántas."""
+        entries = []
+        for kind in (COMPLETE, TIMEOUT):
+            for p in (self.root / kind).glob("*.json"):
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()  # más antiguo primero
+
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        removed = 0
+        for _, size, p in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+            count -= 1
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,301 @@
+"""
+Módulo: results_store
+----------------------
+Almacén de resultados append-only en SQLite, con índices para consultar
+por instancia, solver, parámetros y semilla.
+
+Los metadatos de cada corrida (costo, tiempo, status, parámetros) van en la
+tabla `runs`; los arreglos voluminosos (tour, best_history, time_history,
+top3 y las trazas de diversidad del GA) van aparte en `arrays` como binario
+comprimido (tours en int32, historias en float64 + zlib). Así los
+resúmenes recorren sólo `runs` y nunca cargan historias.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_DB = "results/results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id            INTEGER PRIMARY KEY,
+    instance      TEXT NOT NULL,
+    instance_hash TEXT,
+    solver        TEXT NOT NULL,
+    seed          INTEGER,
+    params        TEXT NOT NULL,
+    params_hash   TEXT NOT NULL,
+    run_key       TEXT NOT NULL,
+    status        TEXT,
+    best_cost     REAL,
+    time_s        REAL,
+    n             INTEGER,
+    created       REAL NOT NULL,
+    extra         TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_runs_lookup ON runs (instance, solver, params_hash, seed);
+CREATE INDEX IF NOT EXISTS ix_runs_key ON runs (run_key);
+CREATE TABLE IF NOT EXISTS arrays (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name   TEXT NOT NULL,
+    dtype  TEXT NOT NULL,
+    data   BLOB NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+# Corridas MTZ que sirven de referencia: sólo óptimos probados (un corte por
+# tiempo es una cota superior y puede ser peor que el GA)
+_REFERENCE_SQL = ("{t}solver = 'mtz' AND {t}best_cost IS NOT NULL"
+                  " AND json_extract({t}extra, '$.proven_optimal') = 1")
+
+# Claves del resultado que se guardan como arreglos y no en `extra`
+_ARRAY_KEYS = ("best", "top3", "best_history", "time_history", "tour")
+# Trazas de result["diversity"] que van a `arrays` (los eventos quedan en `extra`)
+_DIVERSITY_ARRAYS = {"generation": "int32", "entropy": "float64", "edge_distance": "float64"}
+
+
+def _canonical(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _sha1(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _pack(values, dtype: str) -> bytes:
+    return zlib.compress(np.asarray(values, dtype=dtype).tobytes())
+
+
+def _unpack(blob: bytes, dtype: str) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype=dtype)
+
+
+class ResultsStore:
+    """
+    Almacén SQLite de corridas.
+
+    Args:
+        path (str): ruta del archivo .sqlite (se crea si no existe)
+    """
+
+    def __init__(self, path: str = DEFAULT_DB):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        # WAL: lectores (p. ej. el pool de figuras) no bloquean al escritor
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------ escritura
+    def add_run(self, instance: str, solver: str, result: dict,
+                params: Optional[Dict[str, Any]] = None, instance_hash: Optional[str] = None,
+                skip_existing: bool = False) -> int:
+        """
+        Agrega una corrida y devuelve su id.
+
+        Args:
+            instance (str): nombre de la instancia (p. ej. "eil101")
+            solver (str): "ga", "mtz", ...
+            result (dict): resultado tal como lo devuelve el solver
+            params (dict | None): parámetros completos (incluida la semilla si
+                aplica); por defecto result["params"]. Si el resultado trae
+                "params" deben coincidir: se guardan sólo en la columna params
+            instance_hash (str | None): hash de coordenadas (ver distance.coords_hash)
+            skip_existing (bool): si ya hay una corrida con la misma instancia,
+                solver y parámetros, no duplica y devuelve su id (hits de caché)
+        """
+        if params is None:
+            params = result.get("params", {})
+        elif "params" in result and _canonical(result["params"]) != _canonical(params):
+            raise ValueError("params no coincide con result['params'] (se guardan una sola vez)")
+        canon = _canonical(params)
+        run_key = _sha1(f"{instance}|{instance_hash}|{solver}|{canon}")
+        if skip_existing:
+            row = self.conn.execute("SELECT id FROM runs WHERE run_key = ? LIMIT 1", (run_key,)).fetchone()
+            if row is not None:
+                return int(row["id"])
+
+        params_wo_seed = {k: v for k, v in params.items() if k != "seed"}
+        if "best" in result:
+            best_cost = result["best"]["cost"]
+            n = len(result["best"]["tour"])
+        else:
+            best_cost = result.get("objective") if result.get("tour") else None
+            n = len(result["tour"]) if result.get("tour") else None
+        extra = {k: v for k, v in result.items() if k not in _ARRAY_KEYS and k != "params"}
+        diversity = result.get("diversity")
+        if diversity is not None:
+            extra["diversity"] = {k: v for k, v in diversity.items() if k not in _DIVERSITY_ARRAYS}
+
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (instance, instance_hash, solver, seed, params, params_hash, run_key,"
+                " status, best_cost, time_s, n, created, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (instance, instance_hash, solver, params.get("seed"), canon,
+                 _sha1(_canonical(params_wo_seed)), run_key, result.get("status"),
+                 best_cost, result.get("time_s"), n, time.time(), json.dumps(extra, default=str)),
+            )
+            run_id = int(cur.lastrowid)
+            arrays = []
+            if "best" in result:
+                arrays.append(("tour", "int32", result["best"]["tour"]))
+            elif result.get("tour"):
+                arrays.append(("tour", "int32", result["tour"]))
+            for key in ("best_history", "time_history"):
+                if key in result:
+                    arrays.append((key, "float64", result[key]))
+            if diversity is not None:
+                for key, dt in _DIVERSITY_ARRAYS.items():
+                    arrays.append((f"diversity_{key}", dt, diversity.get(key, [])))
+            for k, t in enumerate(result.get("top3", [])):
+                arrays.append((f"top3_{k}", "int32", t["tour"]))
+                arrays.append((f"top3_{k}_cost", "float64", [t["cost"]]))
+            self.conn.executemany(
+                "INSERT INTO arrays (run_id, name, dtype, data) VALUES (?, ?, ?, ?)",
+                [(run_id, name, dt, _pack(v, dt)) for name, dt, v in arrays],
+            )
+        return run_id
+
+    # ------------------------------------------------------------------ lectura
+    def query(self, instance: Optional[str] = None, solver: Optional[str] = None,
+              seed: Optional[int] = None, **params) -> List[Dict[str, Any]]:
+        """
+        Corridas que cumplen los filtros (sin arreglos). Los filtros extra
+        comparan parámetros: query(instance="eil101", solver="ga", N=100).
+        """
+        where, args = [], []
+        for col, val in (("instance", instance), ("solver", solver), ("seed", seed)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        for key, val in params.items():
+            where.append("json_extract(params, ?) = ?")
+            args.extend([f"$.{key}", val])
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id"
+        rows = []
+        for r in self.conn.execute(sql, args):
+            row = dict(r)
+            row["params"] = json.loads(row["params"])
+            row["extra"] = json.loads(row["extra"]) if row["extra"] else {}
+            rows.append(row)
+        return rows
+
+    def load_array(self, run_id: int, name: str) -> Optional[np.ndarray]:
+        row = self.conn.execute("SELECT dtype, data FROM arrays WHERE run_id = ? AND name = ?",
+                                (run_id, name)).fetchone()
+        if row is None:
+            return None
+        return _unpack(row["data"], row["dtype"])
+
+    def load_result(self, run_id: int) -> dict:
+        """Reconstruye el dict de resultado original (mismo formato que el JSON)."""
+        row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No existe la corrida {run_id}")
+        result = json.loads(row["extra"]) if row["extra"] else {}
+        tour = self.load_array(run_id, "tour")
+        tour = tour.tolist() if tour is not None else None
+        if row["solver"] == "ga":
+            top3, k = [], 0
+            while (t := self.load_array(run_id, f"top3_{k}")) is not None:
+                top3.append({"cost": float(self.load_array(run_id, f"top3_{k}_cost")[0]),
+                             "tour": t.tolist()})
+                k += 1
+            result["best"] = {"cost": row["best_cost"], "tour": tour}
+            # Filas viejas guardaban los params también en `extra`
+            result.setdefault("params", json.loads(row["params"]))
+            result["top3"] = top3
+            hist = self.load_array(run_id, "best_history")
+            result["best_history"] = hist.tolist() if hist is not None else []
+        else:
+            result["tour"] = tour
+        times = self.load_array(run_id, "time_history")
+        if times is not None:
+            result["time_history"] = times.tolist()
+        if "diversity" in result:
+            for key in _DIVERSITY_ARRAYS:
+                trace = self.load_array(run_id, f"diversity_{key}")
+                result["diversity"][key] = trace.tolist() if trace is not None else []
+        return result
+
+    # ------------------------------------------------------------------ resúmenes
+    def reference_cost(self, instance: str) -> Optional[float]:
+        """Óptimo probado por MTZ para la instancia (None si ninguna corrida lo probó)."""
+        row = self.conn.execute(
+            f"SELECT MIN(best_cost) AS c FROM runs WHERE instance = ? AND {_REFERENCE_SQL.format(t='')}",
+            (instance,),
+        ).fetchone()
+        return row["c"]
+
+    def summary(self, by: str = "params", solver: str = "ga",
+                instance: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Agrega corridas en SQL (sin cargar arreglos).
+
+        Args:
+            by (str): "instance", "params" (instancia + parámetros sin semilla)
+                      o "seed" (instancia + parámetros + semilla)
+            solver (str): solver a resumir
+            instance (str | None): filtra una instancia
+        """
+        groups = {
+            "instance": ["instance"],
+            "params": ["instance", "params_hash"],
+            "seed": ["instance", "params_hash", "seed"],
+        }
+        if by not in groups:
+            raise ValueError(f"Agrupación no soportada: {by} (opciones: {', '.join(groups)})")
+        cols = ", ".join(groups[by])
+        sql = (
+            f"SELECT {cols}, MIN(params) AS params, COUNT(*) AS runs,"
+            " MIN(best_cost) AS best_cost, AVG(best_cost) AS mean_cost, MAX(best_cost) AS worst_cost,"
+            " AVG(best_cost * best_cost) AS mean_sq, AVG(time_s) AS mean_time_s,"
+            " (SELECT MIN(m.best_cost) FROM runs m WHERE m.instance = runs.instance"
+            f"  AND {_REFERENCE_SQL.format(t='m.')}) AS ref_cost"
+            " FROM runs WHERE solver = ?"
+        )
+        args: List[Any] = [solver]
+        if instance is not None:
+            sql += " AND instance = ?"
+            args.append(instance)
+        sql += f" GROUP BY {cols} ORDER BY {cols}"
+
+        out = []
+        for r in self.conn.execute(sql, args):
+            row = dict(r)
+            mean_sq = row.pop("mean_sq")
+            mean = row["mean_cost"]
+            row["std_cost"] = max(0.0, mean_sq - mean * mean) ** 0.5 if mean is not None else None
+            ref = row["ref_cost"]
+            row["best_pct_error"] = 100.0 * (row["best_cost"] - ref) / ref if ref else None
+            row["mean_pct_error"] = 100.0 * (mean - ref) / ref if ref else None
+            if by == "instance":
+                row.pop("params")
+            elif by == "params":
+                params = json.loads(row["params"])
+                params.pop("seed", None)
+                row["params"] = _canonical(params)
+            out.append(row)
+        return out
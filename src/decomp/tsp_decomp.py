@@ -0,0 +1,428 @@
+# src/decomp/tsp_decomp.py
+"""
+Solver por descomposición para instancias muy grandes (decenas de miles de
+ciudades), donde ni el GA ni MTZ escalan:
+
+1. Partición espacial en clusters de ~cluster_size ciudades: k-means o
+   bloques consecutivos de una curva de Hilbert.
+2. Orden de visita de los clusters: tour sobre los centroides.
+3. Entre clusters consecutivos se elige el par de ciudades más cercano
+   (salida de uno, entrada del siguiente). Cada cluster se resuelve en
+   paralelo como camino de entrada a salida: se fuerza la arista
+   salida-entrada con costo muy negativo y se corta el ciclo ahí. MTZ para
+   clusters chicos, GA (sembrado con vecino más cercano + búsqueda local)
+   para el resto.
+4. Se concatenan los caminos y se aplica búsqueda local (2-opt +
+   reubicación, src.ga.reopt) alrededor de las uniones.
+
+Devuelve el mismo formato de resultado que run_ga.
+"""
+from __future__ import annotations
+import argparse, json, math, time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.common.distance import check_metric, distance_matrix, pairwise
+from src.common.metrics import tour_length
+from src.ga.reopt import local_search
+from src.io.seeded_rng import make_rng, spawn_seeds
+
+PARTITIONS = ("kmeans", "hilbert")
+SOLVERS = ("auto", "ga", "mtz")
+# Parámetros del GA por cluster (se combinan con ga_params)
+CLUSTER_GA_PARAMS = dict(N=60, max_iter=150, crossover="OX", pmut=0.2, elitism=0.05)
+# Clusters de hasta este tamaño van a MTZ con solver="auto"
+MTZ_MAX_NODES = 12
+# Filas por bloque al asignar puntos a centroides
+_ASSIGN_BLOCK = 8192
+
+# ---------------------------------------------------------------- partición
+
+def hilbert_index(xy: np.ndarray, order: int = 16) -> np.ndarray:
+    """Índice en la curva de Hilbert (grilla 2^order x 2^order) de cada punto."""
+    xy = np.asarray(xy, dtype=np.float64)[:, :2]
+    lo = xy.min(axis=0)
+    span = float((xy.max(axis=0) - lo).max()) or 1.0
+    side = 1 << order
+    g = np.minimum(((xy - lo) / span * (side - 1)).astype(np.int64), side - 1)
+    x, y = g[:, 0].copy(), g[:, 1].copy()
+    d = np.zeros(len(xy), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        d += s * s * ((3 * rx.astype(np.int64)) ^ ry.astype(np.int64))
+        # Rotación del cuadrante
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return d
+
+def _assign(xy: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    labels = np.empty(len(xy), dtype=np.intp)
+    for start in range(0, len(xy), _ASSIGN_BLOCK):
+        blk = xy[start:start + _ASSIGN_BLOCK]
+        d2 = ((blk[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels[start:start + _ASSIGN_BLOCK] = np.argmin(d2, axis=1)
+    return labels
+
+def _kmeans(xy: np.ndarray, k: int, rng: np.random.Generator, iters: int = 15) -> np.ndarray:
+    """Lloyd con inicialización k-means++ (sobre una muestra si n es grande)."""
+    n = len(xy)
+    sample = xy[rng.choice(n, min(n, 20 * k), replace=False)]
+    centers = np.empty((k, 2))
+    centers[0] = sample[rng.integers(len(sample))]
+    d2 = ((sample - centers[0]) ** 2).sum(axis=1)
+    for c in range(1, k):
+        total = d2.sum()
+        idx = rng.choice(len(sample), p=d2 / total) if total > 0 else rng.integers(len(sample))
+        centers[c] = sample[idx]
+        d2 = np.minimum(d2, ((sample - centers[c]) ** 2).sum(axis=1))
+    labels = _assign(xy, centers)
+    for _ in range(iters):
+        counts = np.bincount(labels, minlength=k)
+        sx = np.bincount(labels, weights=xy[:, 0], minlength=k)
+        sy = np.bincount(labels, weights=xy[:, 1], minlength=k)
+        nonempty = counts > 0
+        centers[nonempty] = np.column_stack((sx, sy))[nonempty] / counts[nonempty, None]
+        new = _assign(xy, centers)
+        if np.array_equal(new, labels):
+            break
+        labels = new
+    return labels
+
+def partition(coords, cluster_size: int = 150, method: str = "kmeans",
+              seed=42) -> List[np.ndarray]:
+    """
+    Parte la instancia en clusters espaciales.
+
+    Args:
+        coords: coordenadas (n, 2)
+        cluster_size (int): tamaño objetivo de cada cluster
+        method (str): "kmeans" o "hilbert" (bloques consecutivos de la curva)
+        seed: semilla o flujo para k-means
+
+    Returns:
+        list[ndarray]: índices de cada cluster (no vacíos). Con k-means, los
+        clusters de más de 2 * cluster_size se subdividen por Hilbert.
+    """
+    if method not in PARTITIONS:
+        raise ValueError(f"Partición no soportada: {method} (opciones: {', '.join(PARTITIONS)})")
+    xy = np.asarray(coords, dtype=np.float64)[:, :2]
+    n = len(xy)
+    k = max(1, math.ceil(n / cluster_size))
+    if k == 1:
+        return [np.arange(n)]
+    if method == "hilbert":
+        order = np.argsort(hilbert_index(xy), kind="stable")
+        return [order[i:i + cluster_size] for i in range(0, n, cluster_size)]
+    labels = _kmeans(xy, k, make_rng(seed))
+    clusters = []
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(k + 1))
+    for c in range(k):
+        idx = order[bounds[c]:bounds[c + 1]]
+        if len(idx) > 2 * cluster_size:
+            sub = idx[np.argsort(hilbert_index(xy[idx]), kind="stable")]
+            clusters.extend(sub[i:i + cluster_size] for i in range(0, len(sub), cluster_size))
+        elif len(idx):
+            clusters.append(idx)
+    return clusters
+
+# ---------------------------------------------------------------- orden y uniones
+
+def cluster_order(centroids: np.ndarray) -> np.ndarray:
+    """Tour sobre los centroides: orden de Hilbert mejorado con 2-opt."""
+    k = len(centroids)
+    if k <= 3:
+        return np.arange(k)
+    start = np.argsort(hilbert_index(centroids), kind="stable")
+    tour, _ = local_search(start, centroids, np.arange(k), "EUC", neighbors=min(10, k - 1),
+                           max_moves=50 * k, depth=k)
+    return tour
+
+def _closest_pair(a: np.ndarray, b: np.ndarray, metric: str,
+                  ban_a: Optional[int] = None, ban_b: Optional[int] = None) -> Tuple[int, int]:
+    """Índices (en a y en b) del par más cercano, evitando los vetados."""
+    d = pairwise(a[:, None, :], b[None, :, :], metric)
+    if ban_a is not None and len(a) > 1:
+        d[ban_a, :] = np.inf
+    if ban_b is not None and len(b) > 1:
+        d[:, ban_b] = np.inf
+    i, j = np.unravel_index(np.argmin(d), d.shape)
+    return int(i), int(j)
+
+def choose_endpoints(xy: np.ndarray, clusters: Sequence[np.ndarray], order: Sequence[int],
+                     metric: str) -> Tuple[List[int], List[int]]:
+    """
+    Entrada y salida (índices locales) de cada cluster en el orden dado.
+    La salida de cada cluster y la entrada del siguiente son el par más
+    cercano entre ambos; entrada != salida si el cluster tiene 2+ ciudades.
+    """
+    k = len(order)
+    entry: List[Optional[int]] = [None] * k
+    exit_: List[Optional[int]] = [None] * k
+    # El último par (k-1 -> 0) va al final: ya conoce la salida de 0
+    for p in range(k):
+        q = (p + 1) % k
+        a, b = clusters[order[p]], clusters[order[q]]
+        i, j = _closest_pair(xy[a], xy[b], metric, ban_a=entry[p], ban_b=exit_[q])
+        exit_[p], entry[q] = i, j
+    return entry, exit_  # type: ignore
+
+# ---------------------------------------------------------------- caminos por cluster
+
+def _nearest_other(xy: np.ndarray, s: int, metric: str) -> int:
+    """Ciudad más cercana a s distinta de s (con puntos repetidos hay empates en 0)."""
+    d = pairwise(xy[s], xy, metric)
+    d[s] = np.inf
+    return int(np.argmin(d))
+
+def _nn_path(D: np.ndarray, s: int, t: int) -> List[int]:
+    """Camino de vecino más cercano de s a t (t al final)."""
+    m = len(D)
+    left = np.ones(m, dtype=bool)
+    left[[s, t]] = False
+    path = [s]
+    cur = s
+    for _ in range(m - 2):
+        row = np.where(left, D[cur], np.inf)
+        cur = int(np.argmin(row))
+        left[cur] = False
+        path.append(cur)
+    return path + [t]
+
+def _as_path(tour: Sequence[int], s: int, t: int) -> List[int]:
+    """Rota/invierte un ciclo que contiene la arista (t, s) para que vaya de s a t."""
+    tour = list(tour)
+    k = tour.index(s)
+    tour = tour[k:] + tour[:k]
+    if tour[-1] != t:
+        tour = [s] + tour[1:][::-1]
+    return tour
+
+def solve_path(xy: np.ndarray, s: int, t: int, metric: str = "EUC", solver: str = "auto",
+               ga_params: Optional[Dict[str, Any]] = None, mtz_time_limit: int = 10,
+               seed=42) -> Tuple[List[int], str]:
+    """
+    Camino hamiltoniano de s a t sobre los puntos `xy` (índices locales).
+
+    Returns:
+        (camino, solver usado): "trivial", "mtz" o "ga"
+    """
+    m = len(xy)
+    if m == 1:
+        return [s], "trivial"
+    if m <= 3:
+        return [s] + [v for v in range(m) if v not in (s, t)] + [t], "trivial"
+    D = distance_matrix(xy, metric)
+    # Arista s-t forzada: cualquier ciclo que la use es más barato que uno que no
+    big = D.max() * m + 1.0
+    forced = D.copy()
+    forced[s, t] = forced[t, s] = -big
+
+    if solver == "mtz" or (solver == "auto" and m <= MTZ_MAX_NODES):
+        try:
+            from src.lp.tsp_mtz_pulp import run_mtz
+
+            # MTZ es asimétrico: se fuerza sólo el arco t -> s y se encarece
+            # s -> t (con ambos negativos la relajación LP usa el 2-ciclo s-t
+            # y CBC tarda órdenes de magnitud más)
+            arcs = D.copy()
+            arcs[t, s], arcs[s, t] = -big, big
+            res = run_mtz(None, time_limit=mtz_time_limit, dist=arcs, metric=metric)
+            if res.get("tour"):
+                return _as_path(res["tour"], s, t), "mtz"
+        except Exception:
+            if solver == "mtz":
+                raise
+        # Sin CBC o sin tour: se sigue con el GA
+
+    from src.ga.tsp_ga import run_ga
+
+    seed_path = _nn_path(D, s, t)
+    seed_path, _ = local_search(seed_path, None, np.arange(m), metric, neighbors=8,
+                                max_moves=20 * m, depth=m, dist=forced)
+    params = {**CLUSTER_GA_PARAMS, **(ga_params or {})}
+    res = run_ga(xy, seed=seed, metric=metric, dist=forced, initial_tours=[seed_path.tolist()],
+                 rng=make_rng(seed), **params)
+    tour, _ = local_search(res["best"]["tour"], None, np.arange(m), metric, neighbors=8,
+                           max_moves=20 * m, depth=m, dist=forced)
+    return _as_path(tour.tolist(), s, t), "ga"
+
+def _solve_cluster(job: Tuple) -> Tuple[int, List[int], str, float]:
+    c, xy, s, t, metric, solver, ga_params, mtz_time_limit, seed = job
+    t0 = time.time()
+    path, used = solve_path(xy, s, t, metric, solver, ga_params, mtz_time_limit, seed)
+    return c, path, used, time.time() - t0
+
+# ---------------------------------------------------------------- solver
+
+def run_decomp(coords, cluster_size: int = 150, partition_method: str = "kmeans",
+               solver: str = "auto", ga_params: Optional[Dict[str, Any]] = None,
+               mtz_time_limit: int = 10, seed: int = 42, metric: str = "EUC",
+               max_workers: Optional[int] = None, boundary_window: int = 5,
+               neighbors: int = 8) -> Dict[str, Any]:
+    """
+    Resuelve por descomposición (ver docstring del módulo).
+
+    Args:
+        coords: coordenadas (n, 2)
+        cluster_size (int): tamaño objetivo de cada cluster
+        partition_method (str): "kmeans" o "hilbert"
+        solver (str): "auto" (MTZ hasta MTZ_MAX_NODES, GA el resto), "ga" o "mtz"
+        ga_params (dict | None): sobreescribe CLUSTER_GA_PARAMS
+        mtz_time_limit (int): segundos de CBC por cluster
+        seed (int): semilla raíz; cada cluster usa un flujo hijo (mismo
+            resultado con cualquier número de workers)
+        metric (str): métrica de distancias
+        max_workers (int | None): procesos para los clusters (1 = en serie)
+        boundary_window (int): posiciones a cada lado de cada unión que
+            arrancan la búsqueda local final
+        neighbors (int): tamaño de las listas de vecinos de esa búsqueda
+
+    Devuelve el formato de run_ga ("best", "top3", "best_history",
+    "time_history", "time_s", "stopped_early", "params") más
+    "decomposition" con el detalle.
+    """
+    metric = check_metric(metric)
+    if solver not in SOLVERS:
+        raise ValueError(f"Solver no soportado: {solver} (opciones: {', '.join(SOLVERS)})")
+    if coords is None:
+        raise ValueError("La descomposición necesita coordenadas (no sirve con EDGE_WEIGHT_SECTION)")
+    t0 = time.time()
+    xy = np.asarray(coords, dtype=np.float64)[:, :2]
+    n = len(xy)
+    part_seed, cluster_root = spawn_seeds(seed, 2)
+
+    clusters = partition(xy, cluster_size, partition_method, seed=part_seed)
+    k = len(clusters)
+    cluster_seeds = spawn_seeds(cluster_root, k)
+    t_part = time.time() - t0
+
+    t = time.time()
+    centroids = np.array([xy[c].mean(axis=0) for c in clusters])
+    order = cluster_order(centroids)
+    if k > 1:
+        entry, exit_ = choose_endpoints(xy, clusters, order, metric)
+    else:
+        entry, exit_ = [0], [None]
+    t_order = time.time() - t
+
+    t = time.time()
+    jobs = []
+    for p, c in enumerate(order):
+        s = entry[p]
+        e = exit_[p]
+        if e is None:  # un solo cluster: ciclo, se corta en cualquier arista
+            e = _nearest_other(xy[clusters[c]], s, metric) if len(clusters[c]) > 1 else s
+        jobs.append((p, xy[clusters[c]], s, e, metric, solver, ga_params, mtz_time_limit,
+                     cluster_seeds[p]))
+    paths: List[Optional[List[int]]] = [None] * k
+    used: Dict[str, int] = {}
+    cluster_times = [0.0] * k
+    if max_workers == 1 or k == 1:
+        results = map(_solve_cluster, jobs)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+        # Los clusters grandes primero: mejor balance de carga
+        big_first = sorted(jobs, key=lambda j: -len(j[1]))
+        results = pool.map(_solve_cluster, big_first, chunksize=max(1, k // (8 * (max_workers or 8))))
+    try:
+        for p, path, how, dt in results:
+            paths[p] = path
+            used[how] = used.get(how, 0) + 1
+            cluster_times[p] = dt
+    finally:
+        if not (max_workers == 1 or k == 1):
+            pool.shutdown()
+    t_solve = time.time() - t
+
+    t = time.time()
+    tour = np.concatenate([clusters[c][paths[p]] for p, c in enumerate(order)])
+    stitched_cost = tour_length(tour, xy, metric)
+    t_stitched = time.time() - t0
+    # Búsqueda local alrededor de cada unión entre clusters
+    joins = np.cumsum([len(clusters[c]) for c in order])
+    offsets = np.arange(-boundary_window, boundary_window)
+    active = np.unique(tour[(joins[:, None] + offsets) % n]) if n > 4 else np.array([], dtype=np.intp)
+    tour, moves = local_search(tour, xy, active, metric, neighbors=neighbors,
+                               max_moves=max(100, 50 * k), depth=2)
+    cost = tour_length(tour, xy, metric)
+    t_stitch = time.time() - t
+
+    best = {"cost": float(cost), "tour": [int(v) for v in tour]}
+    sizes = [len(c) for c in clusters]
+    return {
+        "best": best,
+        "top3": [best],
+        "best_history": [float(stitched_cost), float(cost)],
+        "time_history": [t_stitched, time.time() - t0],
+        "time_s": float(time.time() - t0),
+        "stopped_early": False,
+        "params": {
+            "cluster_size": cluster_size, "partition": partition_method, "solver": solver,
+            "ga_params": {**CLUSTER_GA_PARAMS, **(ga_params or {})},
+            "mtz_time_limit": mtz_time_limit, "seed": seed, "metric": metric,
+            "boundary_window": boundary_window, "neighbors": neighbors,
+        },
+        "decomposition": {
+            "clusters": k,
+            "size_min": int(min(sizes)), "size_max": int(max(sizes)),
+            "cluster_order": [int(c) for c in order],
+            "solvers": used,
+            "stitched_cost": float(stitched_cost),
+            "boundary_moves": int(moves),
+            "cluster_time_max_s": float(max(cluster_times)),
+            "timings": {"partition_s": t_part, "order_s": t_order, "solve_s": t_solve,
+                        "stitch_s": t_stitch},
+        },
+    }
+
+def _load(path: str) -> Tuple[np.ndarray, str]:
+    if path.endswith(".tsp") or path.endswith(".tsp.gz"):
+        from src.io.tsplib import read_tsplib_instance
+
+        inst = read_tsplib_instance(path)
+        if inst.coords is None:
+            raise ValueError("La instancia no tiene coordenadas (EDGE_WEIGHT_SECTION)")
+        return inst.coords[:, :2], inst.edge_weight_type
+    from src.io.gen_custom import load_points
+
+    return load_points(path), "EUC"
+
+def main():
+    ap = argparse.ArgumentParser(description="TSP por descomposición (clusters + GA/MTZ + unión)")
+    ap.add_argument("--data", required=True, help="Instancia (.tsp, .tsp.gz, .csv o .npy)")
+    ap.add_argument("--cluster_size", type=int, default=150)
+    ap.add_argument("--partition", choices=PARTITIONS, default="kmeans")
+    ap.add_argument("--solver", choices=SOLVERS, default="auto")
+    ap.add_argument("--N", type=int, default=CLUSTER_GA_PARAMS["N"])
+    ap.add_argument("--maxIter", type=int, default=CLUSTER_GA_PARAMS["max_iter"])
+    ap.add_argument("--mtz_time_limit", type=int, default=10)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", type=str, required=True)
+    args = ap.parse_args()
+
+    coords, metric = _load(args.data)
+    res = run_decomp(coords, cluster_size=args.cluster_size, partition_method=args.partition,
+                     solver=args.solver, ga_params={"N": args.N, "max_iter": args.maxIter},
+                     mtz_time_limit=args.mtz_time_limit, seed=args.seed, metric=metric,
+                     max_workers=args.workers)
+    print(f"[INFO] costo={res['best']['cost']:.1f} clusters={res['decomposition']['clusters']} "
+          f"tiempo={res['time_s']:.1f}s")
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(res, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# src/ga/diversity.py
+from __future__ import annotations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Diversidad de la población por frecuencia de aristas (no dirigidas).
+# Cada tour aporta n aristas; f_e = cuántos tours usan la arista e. Con esas
+# cuentas salen, sin comparar tours de a pares:
+#   - entropía de aristas: sum_e -(f_e/N) log(f_e/N), normalizada por
+#     n log N (0 = todos iguales, 1 = ninguna arista compartida)
+#   - distancia media entre pares: 1 - (aristas compartidas por par) / n,
+#     con aristas compartidas = sum_e C(f_e, 2) / C(N, 2)
+
+def edge_keys(pop: np.ndarray) -> np.ndarray:
+    """Clave min(a, b) * n + max(a, b) de cada arista de cada tour, forma (N, n)."""
+    nxt = np.roll(pop, -1, axis=1)
+    n = pop.shape[1]
+    return np.minimum(pop, nxt).astype(np.int64) * n + np.maximum(pop, nxt)
+
+def edge_frequencies(pop: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(claves, cuentas) de las aristas presentes en la población."""
+    return np.unique(edge_keys(pop), return_counts=True)
+
+def population_diversity(pop: Sequence[Sequence[int]]) -> Tuple[float, float]:
+    """
+    Args:
+        pop: población (N tours de n ciudades)
+
+    Returns:
+        (entropía normalizada, distancia media entre pares normalizada), ambas en [0, 1]
+    """
+    P = np.asarray(pop)
+    N, n = P.shape
+    if N < 2 or n < 3:
+        return 0.0, 0.0
+    _, f = edge_frequencies(P)
+    f = f.astype(np.float64)
+    p = f / N
+    entropy = -(p * np.log(p)).sum() / (n * np.log(N))
+    shared = (f * (f - 1)).sum() / (N * (N - 1))
+    return float(entropy), float(1.0 - shared / n)
+
+def immigrants(D: np.ndarray, k: int, rng: np.random.Generator) -> List[List[int]]:
+    """
+    `k` tours nuevos para una población colapsada: vecino más cercano desde
+    ciudades de partida distintas sorteadas (buenos pero ajenos a la
+    población); si k > n, el resto son permutaciones aleatorias.
+    """
+    n = len(D)
+    out = []
+    for s in rng.choice(n, min(k, n), replace=False):
+        left = np.ones(n, dtype=bool)
+        cur = int(s)
+        left[cur] = False
+        tour = [cur]
+        for _ in range(n - 1):
+            cur = int(np.argmin(np.where(left, D[cur], np.inf)))
+            left[cur] = False
+            tour.append(cur)
+        out.append(tour)
+    out.extend(rng.permutation(n).tolist() for _ in range(k - len(out)))
+    return out
@@ -1,42 +1,60 @@
 # src/ga/operators.py
 from __future__ import annotations
 import random
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 Tour = List[int]
 
-def ox(parent1: Tour, parent2: Tour) -> Tour:
+# Cada operador tiene un núcleo determinista (recibe los cortes/índices ya
+# sorteados) y una versión que sortea con `rng` (np.random.Generator) o, si
+# no se pasa, con el módulo global `random`. run_ga sortea todo lo de una
+# generación de una vez y llama a los núcleos.
+
+def _two_points(n: int, rng: Optional[np.random.Generator]) -> Tuple[int, int]:
+    if rng is None:
+        a, b = random.sample(range(n), 2)
+    else:
+        a, b = rng.choice(n, 2, replace=False)
+    return int(a), int(b)
+
+def ox_cut(parent1: Tour, parent2: Tour, a: int, b: int) -> Tour:
+    """OX con el segmento parent1[a..b] (a <= b) ya elegido."""
     n = len(parent1)
-    a, b = sorted(random.sample(range(n), 2))
     child = [None] * n
     child[a:b+1] = parent1[a:b+1]
-    fill = [g for g in parent2 if g not in child]
+    seg = set(child[a:b+1])
+    fill = [g for g in parent2 if g not in seg]
     j = 0
     for i in range(n):
         if child[i] is None:
             child[i] = fill[j]; j += 1
     return child  # type: ignore
 
-def pmx(parent1: Tour, parent2: Tour) -> Tour:
+def ox(parent1: Tour, parent2: Tour, rng: Optional[np.random.Generator] = None) -> Tour:
+    a, b = sorted(_two_points(len(parent1), rng))
+    return ox_cut(parent1, parent2, a, b)
+
+def pmx_cut(parent1: Tour, parent2: Tour, a: int, b: int) -> Tour:
+    """PMX con el segmento parent1[a..b] (a <= b) ya elegido."""
     n = len(parent1)
-    a, b = sorted(random.sample(range(n), 2))
     child = [None] * n
 
     # Copiar segmento de parent1
     child[a:b+1] = parent1[a:b+1]
+    seg = set(child[a:b+1])
+    pos2 = {g: i for i, g in enumerate(parent2)}
 
-    # Para cada gen en el segmento de parent2, mapear si no está ya en el hijo
+    # Cada gen del segmento de parent2 que falta en el hijo va a la posición
+    # que resulta de seguir el mapeo parent1[pos] -> su posición en parent2
+    # hasta salir del segmento
     for i in range(a, b+1):
-        if parent2[i] not in child:
+        if parent2[i] not in seg:
             pos = i
-            val = parent2[i]
-            # Seguir el ciclo de mapeo hasta encontrar hueco
-            while True:
-                pos = parent1.index(val)
-                if child[pos] is None:
-                    child[pos] = parent2[i]
-                    break
-                val = parent2[pos]
+            while a <= pos <= b:
+                pos = pos2[parent1[pos]]
+            child[pos] = parent2[i]
 
     # Rellenar los huecos restantes con genes de parent2
     for i in range(n):
@@ -45,24 +63,66 @@ def pmx(parent1: Tour, parent2: Tour) -> Tour:
 
     return child  # type: ignore
 
+def pmx(parent1: Tour, parent2: Tour, rng: Optional[np.random.Generator] = None) -> Tour:
+    a, b = sorted(_two_points(len(parent1), rng))
+    return pmx_cut(parent1, parent2, a, b)
 
-
-
-def mutate_inversion(order: Tour, p: float = 0.2) -> Tour:
-    if random.random() > p:
-        return order[:]
-    i, j = sorted(random.sample(range(len(order)), 2))
+def invert_at(order: Tour, i: int, j: int) -> Tour:
+    """Invierte order[i..j] (i <= j)."""
     return order[:i] + list(reversed(order[i:j+1])) + order[j+1:]
 
-def mutate_swap(order: Tour, p: float = 0.1) -> Tour:
-    if random.random() > p:
-        return order[:]
-    i, j = random.sample(range(len(order)), 2)
+def swap_at(order: Tour, i: int, j: int) -> Tour:
     out = order[:]
     out[i], out[j] = out[j], out[i]
     return out
 
-def tournament_select(pop: List[Tour], fitness: List[float], k: int = 3) -> Tour:
-    idx = random.sample(range(len(pop)), k)
+def mutate_inversion(order: Tour, p: float = 0.2, rng: Optional[np.random.Generator] = None) -> Tour:
+    if (random.random() if rng is None else rng.random()) > p:
+        return order[:]
+    i, j = sorted(_two_points(len(order), rng))
+    return invert_at(order, i, j)
+
+def mutate_swap(order: Tour, p: float = 0.1, rng: Optional[np.random.Generator] = None) -> Tour:
+    if (random.random() if rng is None else rng.random()) > p:
+        return order[:]
+    i, j = _two_points(len(order), rng)
+    return swap_at(order, i, j)
+
+def tournament_select(pop: List[Tour], fitness: List[float], k: int = 3,
+                      rng: Optional[np.random.Generator] = None) -> Tour:
+    if rng is None:
+        idx = random.sample(range(len(pop)), k)
+    else:
+        idx = rng.choice(len(pop), k, replace=False).tolist()
     best = min(idx, key=lambda i: fitness[i])
     return pop[best][:]
+
+# --- sorteos en bloque (una llamada por generación) --------------------------
+
+def draw_pairs(rng: np.random.Generator, n: int, size: int) -> np.ndarray:
+    """`size` pares (i, j) con i < j, distintos, uniformes en 0..n-1."""
+    a = rng.integers(0, n, size=size)
+    b = rng.integers(0, n - 1, size=size)
+    b = b + (b >= a)
+    return np.sort(np.stack((a, b), axis=1), axis=1)
+
+def draw_tournaments(rng: np.random.Generator, fitness: np.ndarray, size: int, k: int) -> np.ndarray:
+    """
+    Ganadores de `size` torneos de k participantes distintos. Se sortean
+    índices en bloque (O(size * k)) y sólo se vuelven a sortear las filas
+    con participantes repetidos.
+    """
+    n = len(fitness)
+    k = min(k, n)
+    if 2 * k > n:
+        # población chica: claves aleatorias por fila (el rechazo sería lento)
+        keys = rng.random((size, n))
+        idx = np.argpartition(keys, k - 1, axis=1)[:, :k] if k < n else np.argsort(keys, axis=1)
+        return idx[np.arange(size), np.argmin(fitness[idx], axis=1)]
+    idx = rng.integers(0, n, size=(size, k))
+    while True:
+        s = np.sort(idx, axis=1)
+        dup = np.flatnonzero((s[:, 1:] == s[:, :-1]).any(axis=1))
+        if dup.size == 0:
+            return idx[np.arange(size), np.argmin(fitness[idx], axis=1)]
+        idx[dup] = rng.integers(0, n, size=(dup.size, k))
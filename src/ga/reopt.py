@@ -0,0 +1,335 @@
+# src/ga/reopt.py
+"""
+Re-optimización incremental: cuando la instancia cambia poco (ciudades
+agregadas, quitadas o movidas), se repara el tour anterior en vez de
+resolver desde cero.
+
+1. Reparación: los nodos quitados se sacan del ciclo (uniendo a sus
+   vecinos) y los agregados/movidos se insertan con inserción más barata.
+2. Búsqueda local acotada (2-opt y reubicación de un nodo, con listas de
+   k vecinos más cercanos y "don't look bits") que arranca sólo en los
+   nodos afectados y se propaga a los que cambian de arista.
+3. Opcional: el tour reparado siembra la población del GA.
+
+No se construye la matriz n x n: las distancias se calculan al vuelo desde
+las coordenadas, así un cambio chico en una instancia grande toma milisegundos.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.common.distance import check_metric, pairwise
+from src.common.metrics import tour_length
+from src.io.seeded_rng import make_rng, spawn_seeds
+
+@dataclass
+class CoordDiff:
+    """
+    Cambios sobre una instancia, en índices de la instancia anterior.
+
+    added: coordenadas de las ciudades nuevas (van al final, en este orden)
+    removed: índices de ciudades quitadas
+    moved: {índice: (x, y)} ciudades que cambian de posición
+    """
+    added: Sequence[Tuple[float, float]] = field(default_factory=list)
+    removed: Sequence[int] = field(default_factory=list)
+    moved: Dict[int, Tuple[float, float]] = field(default_factory=dict)
+
+def apply_diff(coords, diff: CoordDiff) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aplica el diff. Las ciudades que quedan conservan su orden relativo y las
+    nuevas se agregan al final.
+
+    Returns:
+        (new_coords (m, 2), old_to_new (n,)): índice nuevo de cada ciudad
+        anterior, -1 si se quitó
+    """
+    xy = np.array(coords, dtype=np.float64)[:, :2]
+    n = len(xy)
+    removed = np.asarray(list(diff.removed), dtype=np.intp)
+    if removed.size and (removed.min() < 0 or removed.max() >= n):
+        raise ValueError("Índice de ciudad quitada fuera de rango")
+    for i, p in diff.moved.items():
+        if int(i) in set(removed.tolist()):
+            raise ValueError(f"La ciudad {i} está a la vez movida y quitada")
+        xy[int(i)] = p
+    keep = np.ones(n, dtype=bool)
+    keep[removed] = False
+    old_to_new = np.full(n, -1, dtype=np.intp)
+    old_to_new[keep] = np.arange(int(keep.sum()))
+    added = np.asarray(diff.added, dtype=np.float64).reshape(-1, 2)
+    return np.vstack((xy[keep], added)), old_to_new
+
+def _cheapest_insert(tour: np.ndarray, xy: np.ndarray, v: int, metric: str) -> np.ndarray:
+    """Inserta v entre el par de nodos consecutivos que menos alarga el ciclo."""
+    if len(tour) < 2:
+        return np.append(tour, v)
+    a = xy[tour]
+    b = np.roll(a, -1, axis=0)
+    p = xy[v]
+    delta = pairwise(a, p, metric) + pairwise(p, b, metric) - pairwise(a, b, metric)
+    k = int(np.argmin(delta))
+    return np.insert(tour, k + 1, v)
+
+def repair_tour(tour: Sequence[int], old_to_new: np.ndarray, new_coords: np.ndarray,
+                moved: Sequence[int] = (), metric: str = "EUC") -> Tuple[np.ndarray, List[int]]:
+    """
+    Lleva el tour anterior a la nueva instancia: saca quitadas y movidas, e
+    inserta movidas y agregadas con inserción más barata.
+
+    Returns:
+        (tour reparado, nodos afectados): los insertados y los vecinos que
+        quedaron unidos al sacar nodos (en índices nuevos)
+    """
+    metric = check_metric(metric)
+    old = np.asarray(tour, dtype=np.intp)
+    mapped = old_to_new[old]
+    moved_new = set(int(old_to_new[i]) for i in moved)
+    drop = mapped < 0
+    if moved_new:
+        drop |= np.isin(mapped, list(moved_new))
+    affected = set()
+    if drop.any() and not drop.all():
+        # Vecinos que quedan unidos: el primer nodo conservado antes y después
+        # de cada tramo quitado
+        keep_pos = np.flatnonzero(~drop)
+        gaps = np.flatnonzero(np.diff(np.append(keep_pos, keep_pos[0] + len(old))) > 1)
+        for g in gaps:
+            affected.add(int(mapped[keep_pos[g]]))
+            affected.add(int(mapped[keep_pos[(g + 1) % len(keep_pos)]]))
+    out = mapped[~drop]
+    n_old_kept = int((old_to_new >= 0).sum())
+    to_insert = sorted(moved_new) + list(range(n_old_kept, len(new_coords)))
+    for v in to_insert:
+        out = _cheapest_insert(out, new_coords, v, metric)
+        affected.add(v)
+    return out, sorted(affected)
+
+class _LocalSearch:
+    """2-opt + reubicación con listas de vecinos, restringida a nodos activos."""
+
+    def __init__(self, tour: np.ndarray, xy: Optional[np.ndarray], metric: str, k: int,
+                 dist: Optional[np.ndarray] = None):
+        self.tour = tour.copy()
+        self.xy = xy
+        self.metric = metric
+        self.D = dist
+        self.n = len(tour)
+        self.k = min(k, self.n - 1)
+        self.pos = np.empty(self.n, dtype=np.intp)
+        self.pos[self.tour] = np.arange(self.n)
+        self._knn: Dict[int, np.ndarray] = {}
+
+    def d(self, i, j) -> np.ndarray:
+        if self.D is not None:
+            return self.D[i, j]
+        return pairwise(self.xy[i], self.xy[j], self.metric)
+
+    def knn(self, v: int) -> np.ndarray:
+        nb = self._knn.get(v)
+        if nb is None:
+            if self.D is not None:
+                dist = np.array(self.D[v], dtype=np.float64)
+            else:
+                dist = pairwise(self.xy[v], self.xy, self.metric)
+            dist[v] = np.inf
+            nb = np.argpartition(dist, self.k - 1)[: self.k]
+            self._knn[v] = nb
+        return nb
+
+    def succ(self, v):
+        return self.tour[(self.pos[v] + 1) % self.n]
+
+    def pred(self, v):
+        return self.tour[self.pos[v] - 1]
+
+    def _reverse(self, i: int, j: int) -> None:
+        """Quita las aristas que salen de las posiciones i y j (i < j) e invierte t[i+1..j]."""
+        seg = self.tour[i + 1: j + 1][::-1].copy()
+        self.tour[i + 1: j + 1] = seg
+        self.pos[seg] = np.arange(i + 1, j + 1)
+
+    def _try_2opt(self, a: int) -> Optional[List[int]]:
+        c = self.knn(a)
+        # Variante sucesor: (a, sa) y (c, sc) -> (a, c) y (sa, sc)
+        sa, sc = self.succ(a), self.succ(c)
+        gain = self.d(a, sa) + self.d(c, sc) - self.d(a, c) - self.d(sa, sc)
+        # Variante predecesor: (pa, a) y (pc, c) -> (a, c) y (pa, pc)
+        pa, pc = self.pred(a), self.pred(c)
+        gain_p = self.d(pa, a) + self.d(pc, c) - self.d(a, c) - self.d(pa, pc)
+        best_s, best_p = int(np.argmax(gain)), int(np.argmax(gain_p))
+        if max(gain[best_s], gain_p[best_p]) <= 1e-9:
+            return None
+        if gain[best_s] >= gain_p[best_p]:
+            c = int(c[best_s])
+            i, j = self.pos[a], self.pos[c]
+            touched = [a, int(sa), c, int(sc[best_s])]
+        else:
+            c = int(c[best_p])
+            i, j = self.pos[a] - 1, self.pos[c] - 1
+            touched = [a, int(pa), c, int(pc[best_p])]
+        i, j = (i, j) if i < j else (j, i)
+        if i < 0:  # arista (t[n-1], t[0]): equivalente a invertir el complemento
+            i, j = j, self.n - 1
+        self._reverse(int(i), int(j))
+        return touched
+
+    def _try_relocate(self, a: int) -> Optional[List[int]]:
+        pa, sa = self.pred(a), self.succ(a)
+        if pa == sa:
+            return None
+        c = self.knn(a)
+        c = c[(c != pa)]
+        if c.size == 0:
+            return None
+        sc = self.succ(c)
+        removal = float(self.d(pa, a) + self.d(a, sa) - self.d(pa, sa))
+        insert = self.d(c, a) + self.d(a, sc) - self.d(c, sc)
+        k = int(np.argmin(insert))
+        if removal - insert[k] <= 1e-9:
+            return None
+        c, sc = int(c[k]), int(sc[k])
+        i, j = int(self.pos[a]), int(self.pos[c])
+        # Se desplaza sólo el tramo entre la posición vieja y la nueva
+        if i < j:
+            self.tour[i:j] = self.tour[i + 1: j + 1]
+            self.tour[j] = a
+            lo, hi = i, j
+        else:
+            self.tour[j + 2: i + 1] = self.tour[j + 1: i].copy()
+            self.tour[j + 1] = a
+            lo, hi = j + 1, i
+        self.pos[self.tour[lo: hi + 1]] = np.arange(lo, hi + 1)
+        return [a, int(pa), int(sa), c, sc]
+
+    def run(self, active: Sequence[int], max_moves: int, depth: int) -> int:
+        """
+        Procesa la cola de nodos activos. Un nodo tocado por un movimiento se
+        reactiva con un nivel más que el que lo tocó; a partir de `depth`
+        niveles no se propaga (la búsqueda no se escapa de la zona del cambio).
+        """
+        if self.n < 5:
+            return 0
+        level = {int(v): 0 for v in active}
+        queue = list(level)
+        queued = set(queue)
+        moves = 0
+        while queue and moves < max_moves:
+            a = queue.pop()
+            queued.discard(a)
+            touched = self._try_2opt(a) or self._try_relocate(a)
+            if touched is None:
+                continue
+            moves += 1
+            nxt = level[a] + 1
+            for v in touched:
+                if v in queued or (v not in level and nxt > depth):
+                    continue
+                level[v] = min(level.get(v, nxt), nxt)
+                queue.append(v)
+                queued.add(v)
+        return moves
+
+def local_search(tour: Sequence[int], coords, active: Sequence[int], metric: str = "EUC",
+                 neighbors: int = 10, max_moves: int = 1000,
+                 depth: int = 3, dist=None) -> Tuple[np.ndarray, int]:
+    """
+    Mejora `tour` con 2-opt y reubicación partiendo de los nodos `active`;
+    los nodos tocados se reactivan hasta `depth` niveles de distancia.
+    Con `dist` (matriz n x n) se usan sus distancias en vez de `coords`.
+
+    Returns:
+        (tour mejorado, cantidad de movimientos aplicados)
+    """
+    xy = np.asarray(coords, dtype=np.float64)[:, :2] if dist is None else None
+    ls = _LocalSearch(np.asarray(tour, dtype=np.intp), xy, check_metric(metric), neighbors,
+                      dist=dist)
+    moves = ls.run(active, max_moves, depth)
+    return ls.tour, moves
+
+def reoptimize(coords, tour: Sequence[int], diff: CoordDiff, metric: str = "EUC",
+               neighbors: int = 10, max_moves: int = 1000, depth: int = 3, ring: int = 2,
+               ga_params: Optional[Dict[str, Any]] = None, seed: int = 42) -> Dict[str, Any]:
+    """
+    Re-optimiza un tour tras un cambio chico en la instancia.
+
+    Args:
+        coords: coordenadas de la instancia anterior
+        tour (list[int]): tour anterior (índices de `coords`)
+        diff (CoordDiff): ciudades agregadas, quitadas y movidas
+        metric (str): métrica de distancias (ver src.common.distance)
+        neighbors (int): tamaño de las listas de vecinos de la búsqueda local
+        max_moves (int): tope de movimientos de la búsqueda local
+        depth (int): niveles de propagación desde los nodos afectados
+        ring (int): además de los nodos afectados, se activan los `ring`
+            anteriores y siguientes en el tour
+        ga_params (dict | None): si se pasa, corre run_ga con esos parámetros
+            (N, max_iter, ...; el resto de tsp_ga.GA_PARAMS) sembrado con el
+            tour reparado y devuelve el mejor
+        seed (int): semilla del GA y de las variantes sembradas
+
+    Returns:
+        {
+          "tour": list[int], "cost": float,     # en índices de la nueva instancia
+          "old_to_new": list[int],              # -1 para ciudades quitadas
+          "repair_cost": float, "ls_moves": int, "affected": int,
+          "time_s": float, "timings": {"repair_s", "ls_s", "ga_s"},
+          "ga": dict | None                     # resultado de run_ga si se pidió
+        }
+    """
+    metric = check_metric(metric)
+    t0 = time.time()
+    new_coords, old_to_new = apply_diff(coords, diff)
+    repaired, affected = repair_tour(tour, old_to_new, new_coords, list(diff.moved), metric)
+    t_repair = time.time() - t0
+    repair_cost = tour_length(repaired, new_coords, metric)
+
+    t = time.time()
+    n = len(repaired)
+    pos = np.empty(n, dtype=np.intp)
+    pos[repaired] = np.arange(n)
+    offsets = np.arange(-ring, ring + 1)
+    active = np.unique(repaired[(pos[np.asarray(affected, dtype=np.intp)][:, None] + offsets) % n]) \
+        if affected and n else np.array([], dtype=np.intp)
+    improved, moves = local_search(repaired, new_coords, active, metric, neighbors,
+                                  max_moves, depth)
+    t_ls = time.time() - t
+    best = improved.tolist()
+    cost = tour_length(best, new_coords, metric)
+
+    ga_result, t_ga = None, 0.0
+    if ga_params is not None:
+        from .tsp_ga import GA_PARAMS, run_ga
+
+        t = time.time()
+        N = int(ga_params.get("N", GA_PARAMS["N"]))
+        # Flujos independientes para las variantes y para el GA
+        var_seed, ga_seed = spawn_seeds(seed, 2)
+        rng = make_rng(var_seed)
+        # Tour reparado + variantes con una inversión aleatoria (~10% de la población)
+        seeds = [best]
+        for _ in range(max(0, N // 10 - 1)):
+            i, j = np.sort(rng.choice(n, 2, replace=False))
+            seeds.append(best[:i] + best[i:j + 1][::-1] + best[j + 1:])
+        params = {**GA_PARAMS, **ga_params, "N": N}
+        ga_result = run_ga(new_coords, seed=seed, metric=metric, initial_tours=seeds,
+                           rng=make_rng(ga_seed), **params)
+        t_ga = time.time() - t
+        if ga_result["best"]["cost"] < cost - 1e-9:
+            best, cost = ga_result["best"]["tour"], ga_result["best"]["cost"]
+
+    return {
+        "tour": [int(v) for v in best],
+        "cost": float(cost),
+        "old_to_new": old_to_new.tolist(),
+        "repair_cost": float(repair_cost),
+        "ls_moves": int(moves),
+        "affected": len(affected),
+        "time_s": float(time.time() - t0),
+        "timings": {"repair_s": t_repair, "ls_s": t_ls, "ga_s": t_ga},
+        "ga": ga_result,
+    }
@@ -1,43 +1,89 @@
 # src/ga/tsp_ga.py
 from __future__ import annotations
-import argparse, json, random, time
+import argparse, json, time
 from pathlib import Path
 from typing import Dict, Any, List
 import numpy as np
 
-from src.io.tsplib import read_tsplib
-from src.common.metrics import tour_length
-from src.io.seeded_rng import set_seeds
-from .operators import ox, pmx, mutate_inversion, mutate_swap, tournament_select
+from src.io.tsplib import read_tsplib_instance
+from src.common.distance import distance_matrix, population_costs
+from src.io.seeded_rng import make_rng, seed_repr
+from .operators import ox_cut, pmx_cut, invert_at, swap_at, draw_pairs, draw_tournaments
+from .diversity import population_diversity, immigrants
 
-def _make_initial_population(n: int, pop_size: int) -> List[List[int]]:
-    base = list(range(n))
-    return [random.sample(base, n) for _ in range(pop_size)]
+# Parámetros por defecto de una corrida del GA (orquestador, lotes, reopt)
+GA_PARAMS = dict(N=100, max_iter=300, crossover="OX", pmut=0.2, elitism=0.03)
 
-def _crossover(name: str, p1: List[int], p2: List[int]) -> List[int]:
-    if name.upper() == "PMX":
-        return pmx(p1, p2)
-    return ox(p1, p2)
+def _make_initial_population(n: int, pop_size: int, rng: np.random.Generator) -> List[List[int]]:
+    base = np.tile(np.arange(n), (pop_size, 1))
+    return rng.permuted(base, axis=1).tolist()
 
 def run_ga(coords, N: int, max_iter: int, crossover: str, pmut: float,
            elitism: float, seed: int, mut_kind: str = "invert",
-           tournament_k: int = 3) -> Dict[str, Any]:
+           tournament_k: int = 3, incumbent=None, metric: str = "EUC",
+           dist=None, initial_tours=None, rng=None,
+           time_limit: float = None, diversity_every: int = 10,
+           immigrant_below: float = 0.03, restart_below: float = 0.01,
+           immigrant_frac: float = 0.10, restart_frac: float = 0.50) -> Dict[str, Any]:
     """
+    Los números aleatorios salen de `rng` (np.random.Generator; por defecto
+    make_rng(seed)) y se sortean en bloque por generación. No se usa estado
+    global: la misma semilla da el mismo resultado en serie o en paralelo.
+    Para varias corridas independientes ver seeded_rng.spawn_seeds.
+
+    `time_history[i]` son los segundos transcurridos al registrar
+    `best_history[i]` (traza anytime del incumbente). Con `time_limit` la
+    corrida termina al agotar ese presupuesto aunque falten iteraciones.
+
+    `dist` es la matriz de distancias (p. ej. memory-map de
+    get_distance_matrix); si no se pasa, se calcula en memoria con `metric`.
+
+    Si se pasa `incumbent` (SharedIncumbent), publica cada mejora y se
+    detiene en cuanto otro proceso pide parar (meta alcanzada u óptimo probado).
+
+    `initial_tours` (lista de permutaciones) reemplaza a los primeros
+    individuos de la población inicial aleatoria (p. ej. un tour reparado
+    por src.ga.reopt).
+
+    Cada `diversity_every` generaciones (0 = nunca) se mide la diversidad
+    por frecuencia de aristas (ver src.ga.diversity). Si la distancia media
+    entre tours cae bajo `immigrant_below`, la fracción `immigrant_frac` de
+    los peores hijos se reemplaza por inmigrantes (vecino más cercano desde
+    ciudades al azar); bajo `restart_below`, la fracción `restart_frac` se
+    reemplaza por tours aleatorios y pmut vuelve a su valor inicial (reinicio
+    parcial). La élite nunca se toca.
+
     Devuelve:
       {
         "best": {"cost": float, "tour": list[int]},
         "top3": [{"cost": float, "tour": list[int]}, ...],
         "best_history": list[float],
+        "time_history": list[float],
         "time_s": float,
+        "stopped_early": bool,
+        "diversity": {"generation", "entropy", "edge_distance": list,
+                      "events": [{"generation", "action", "replaced"}, ...]},
         "params": {...}
       }
     """
-    set_seeds(seed)
-    n = len(coords)
+    rng = make_rng(seed if rng is None else rng)
     elite_k = max(1, int(elitism * N))
-    pop = _make_initial_population(n, N)
-    fitness = [tour_length(ind, coords) for ind in pop]
+    D = dist if dist is not None else distance_matrix(coords, metric)
+    n = len(D)
+    pop = _make_initial_population(n, N, rng)
+    for k, t in enumerate((initial_tours or [])[:N]):
+        t = [int(v) for v in t]
+        if sorted(t) != list(range(n)):
+            raise ValueError(f"initial_tours[{k}] no es una permutación de 0..{n - 1}")
+        pop[k] = t
+    fitness = population_costs(pop, D).tolist()
     best_hist: List[float] = []
+    time_hist: List[float] = []
+    stopped_early = False
+    pmut0 = pmut
+    diversity = {"generation": [], "entropy": [], "edge_distance": [], "events": []}
+    if incumbent is not None:
+        incumbent.offer(min(fitness))
     t0 = time.time()
 
     for it in range(max_iter):
@@ -45,26 +91,68 @@ def run_ga(coords, N: int, max_iter: int, crossover: str, pmut: float,
         elite_idx = np.argsort(fitness)[:elite_k]
         elites = [pop[i][:] for i in elite_idx]
 
-        # reproducción
+        # reproducción: todos los sorteos de la generación de una vez
+        m = N - elite_k
+        fit = np.asarray(fitness)
+        parents = draw_tournaments(rng, fit, 2 * m, tournament_k)
+        cuts = draw_pairs(rng, n, m)
+        do_mut = rng.random(m) <= pmut
+        mut_idx = draw_pairs(rng, n, m)
+        cross = pmx_cut if crossover.upper() == "PMX" else ox_cut
+        mutate = swap_at if mut_kind == "swap" else invert_at
         children: List[List[int]] = []
-        while len(children) < N - elite_k:
-            p1 = tournament_select(pop, fitness, k=tournament_k)
-            p2 = tournament_select(pop, fitness, k=tournament_k)
-            c = _crossover(crossover, p1, p2)
-            if mut_kind == "swap":
-                c = mutate_swap(c, p=pmut)
-            else:
-                c = mutate_inversion(c, p=pmut)
-            children.append(c)
+        for c in range(m):
+            a, b = cuts[c]
+            child = cross(pop[parents[2 * c]], pop[parents[2 * c + 1]], int(a), int(b))
+            if do_mut[c]:
+                child = mutate(child, int(mut_idx[c, 0]), int(mut_idx[c, 1]))
+            children.append(child)
 
         pop = elites + children
-        fitness = [tour_length(ind, coords) for ind in pop]
+        fitness = population_costs(pop, D).tolist()
         best_hist.append(min(fitness))
+        elapsed = time.time() - t0
+        time_hist.append(elapsed)
+
+        if incumbent is not None:
+            if len(best_hist) == 1 or best_hist[-1] < best_hist[-2]:
+                incumbent.offer(best_hist[-1])
+            if incumbent.should_stop():
+                stopped_early = True
+                break
+
+        if time_limit is not None and elapsed >= time_limit:
+            break
 
         # pequeña adaptación si se estanca
         if it > 50 and min(best_hist[-50:]) >= best_hist[-51]:
             pmut = min(0.6, pmut * 1.1)
 
+        # diversidad: inmigrantes o reinicio parcial si la población colapsa
+        if diversity_every and (it + 1) % diversity_every == 0:
+            entropy, spread = population_diversity(pop)
+            diversity["generation"].append(it + 1)
+            diversity["entropy"].append(entropy)
+            diversity["edge_distance"].append(spread)
+            if spread < restart_below:
+                action, k = "restart", int(restart_frac * m)
+            elif spread < immigrant_below:
+                action, k = "immigrants", int(immigrant_frac * m)
+            else:
+                k = 0
+            if k > 0:
+                worst = elite_k + np.argsort(fitness[elite_k:])[::-1][:k]
+                if action == "restart":
+                    fresh = _make_initial_population(n, k, rng)
+                    pmut = pmut0
+                else:
+                    fresh = immigrants(D, k, rng)
+                new_costs = population_costs(fresh, D)
+                for i, t, c in zip(worst, fresh, new_costs):
+                    pop[i] = t
+                    fitness[i] = float(c)
+                diversity["events"].append({"generation": it + 1, "action": action, "replaced": k})
+
     dt = time.time() - t0
     order = np.argsort(fitness)
     top3 = [{"cost": float(fitness[i]), "tour": pop[i][:]} for i in order[:3]]
@@ -72,18 +160,25 @@ def run_ga(coords, N: int, max_iter: int, crossover: str, pmut: float,
         "best": top3[0],
         "top3": top3,
         "best_history": [float(v) for v in best_hist],
+        "time_history": time_hist,
         "time_s": float(dt),
+        "stopped_early": stopped_early,
+        "diversity": diversity,
         "params": {
             "N": N, "maxIter": max_iter, "crossover": crossover,
-            "pmut": pmut, "elitism": elitism, "seed": seed,
-            "mut_kind": mut_kind, "tournament_k": tournament_k
+            "pmut": pmut, "elitism": elitism, "seed": seed_repr(seed),
+            "mut_kind": mut_kind, "tournament_k": tournament_k,
+            "metric": metric, "time_limit": time_limit,
+            "diversity_every": diversity_every, "immigrant_below": immigrant_below,
+            "restart_below": restart_below, "immigrant_frac": immigrant_frac,
+            "restart_frac": restart_frac
         }
     }
     return result
 
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--data", required=True, help="Ruta TSPLIB .tsp")
+    ap.add_argument("--data", required=True, help="Ruta TSPLIB .tsp o .tsp.gz")
     ap.add_argument("--N", type=int, default=300)
     ap.add_argument("--maxIter", type=int, default=2000)
     ap.add_argument("--crossover", choices=["OX", "PMX"], default="OX")
@@ -92,12 +187,17 @@ def main():
     ap.add_argument("--seed", type=int, default=42)
     ap.add_argument("--mut", choices=["invert","swap"], default="invert")
     ap.add_argument("--tournament_k", type=int, default=3)
+    ap.add_argument("--diversity_every", type=int, default=10,
+                    help="Cada cuántas generaciones medir diversidad (0 = nunca)")
     ap.add_argument("--out", type=str, required=True)
     args = ap.parse_args()
 
-    coords = read_tsplib(args.data)
-    res = run_ga(coords, args.N, args.maxIter, args.crossover, args.pmut,
-                 args.elitism, args.seed, mut_kind=args.mut, tournament_k=args.tournament_k)
+    inst = read_tsplib_instance(args.data)
+    D = inst.distances()
+    res = run_ga(inst.coords, args.N, args.maxIter, args.crossover, args.pmut,
+                 args.elitism, args.seed, mut_kind=args.mut, tournament_k=args.tournament_k,
+                 diversity_every=args.diversity_every,
+                 metric=inst.edge_weight_type, dist=D)
 
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
     with open(args.out, "w", encoding="utf-8") as f:
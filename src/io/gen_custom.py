@@ -2,35 +2,100 @@
 Módulo: gen_custom
 -------------------
 Generador de instancias TSP personalizadas (custom).
-Produce un CSV con columnas: id,x,y
+
+Los generadores están vectorizados (un solo sorteo NumPy por patrón), así
+que instancias de millones de ciudades se generan en segundos. La salida se
+escribe por bloques en CSV (id,x,y), .npy o TSPLIB (.tsp / .tsp.gz) según la
+extensión del archivo de salida; `load_points` lee cualquiera de esos formatos.
 """
 
 import argparse
-import csv
+import gzip
 import math
-import random
+from pathlib import Path
 from typing import List, Tuple
 
 import numpy as np
 
-from .seeded_rng import set_seeds
+from src.io.seeded_rng import make_rng
+
+SHAPES = ("ring_clusters", "uniform", "islands", "grid_noise", "gaussian_mixture")
+# Filas por bloque al escribir CSV / TSPLIB
+CHUNK_ROWS = 100_000
+# Lado del cuadrado donde se generan los puntos
+SIZE = 500.0
+
 
+def _split_counts(n: int, k: int) -> np.ndarray:
+    """Reparte n puntos en k grupos lo más parejos posible."""
+    counts = np.full(k, n // k, dtype=np.int64)
+    counts[: n % k] += 1
+    return counts
 
-def _generate_ring_clusters(n: int, seed: int) -> List[Tuple[float, float]]:
+
+def _generate_ring_clusters(n: int, rng: np.random.Generator) -> np.ndarray:
     """Genera puntos agrupados en clusters circulares."""
-    rng = np.random.default_rng(seed)
-    coords = []
     clusters = max(3, n // 20)  # número de clusters aproximado
     radius = 50
-    for c in range(clusters):
-        cx, cy = rng.uniform(0, 500), rng.uniform(0, 500)
-        for _ in range(n // clusters):
-            angle = rng.uniform(0, 2 * math.pi)
-            r = rng.uniform(0, radius)
-            x = cx + r * math.cos(angle)
-            y = cy + r * math.sin(angle)
-            coords.append((x, y))
-    return coords[:n]
+    centers = rng.uniform(0, SIZE, size=(clusters, 2))
+    labels = np.repeat(np.arange(clusters), _split_counts(n, clusters))
+    angle = rng.uniform(0, 2 * math.pi, size=n)
+    r = rng.uniform(0, radius, size=n)
+    return centers[labels] + np.column_stack((r * np.cos(angle), r * np.sin(angle)))
+
+
+def _generate_uniform(n: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.uniform(0, SIZE, size=(n, 2))
+
+
+def _generate_islands(n: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.normal(SIZE / 2, 80, size=(n, 2))
+
+
+def _generate_grid_noise(n: int, rng: np.random.Generator, noise: float = 0.15) -> np.ndarray:
+    """Grilla regular (ciudades tipo manzanas) con ruido gaussiano relativo al paso."""
+    side = math.ceil(math.sqrt(n))
+    step = SIZE / side
+    k = np.arange(n)
+    grid = np.column_stack((k % side, k // side)) * step + step / 2
+    return grid + rng.normal(0, noise * step, size=(n, 2))
+
+
+def _generate_gaussian_mixture(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Mezcla de gaussianas con pesos y dispersiones distintas por componente."""
+    k = max(2, min(50, n // 100))
+    centers = rng.uniform(0, SIZE, size=(k, 2))
+    sigmas = rng.uniform(5, 40, size=k)
+    weights = rng.dirichlet(np.ones(k))
+    labels = rng.choice(k, size=n, p=weights)
+    return centers[labels] + rng.normal(size=(n, 2)) * sigmas[labels, None]
+
+
+_GENERATORS = {
+    "ring_clusters": _generate_ring_clusters,
+    "uniform": _generate_uniform,
+    "islands": _generate_islands,
+    "grid_noise": _generate_grid_noise,
+    "gaussian_mixture": _generate_gaussian_mixture,
+}
+
+
+def generate_points(n: int, seed: int, shape: str) -> np.ndarray:
+    """
+    Genera coordenadas según un patrón, como arreglo (n, 2).
+
+    Args:
+        n (int): número de nodos
+        seed (int | SeedSequence | Generator): semilla o flujo (ver seeded_rng)
+        shape (str): uno de SHAPES
+
+    Returns:
+        np.ndarray: coordenadas (n, 2) float64
+    """
+    if shape not in _GENERATORS:
+        raise ValueError(f"Forma no reconocida: {shape}")
+    rng = make_rng(seed)
+    return _GENERATORS[shape](n, rng)
 
 
 def generate_custom(n: int, seed: int, shape: str) -> List[Tuple[float, float]]:
@@ -40,41 +105,97 @@ def generate_custom(n: int, seed: int, shape: str) -> List[Tuple[float, float]]:
     Args:
         n (int): número de nodos
         seed (int): semilla para reproducibilidad
-        shape (str): tipo de patrón (ring_clusters, islands, uniform)
+        shape (str): tipo de patrón (ver SHAPES)
 
     Returns:
         List[Tuple[float, float]]: coordenadas generadas
     """
-    set_seeds(seed)
-    if shape == "ring_clusters":
-        return _generate_ring_clusters(n, seed)
-    elif shape == "uniform":
-        return [(random.uniform(0, 500), random.uniform(0, 500)) for _ in range(n)]
-    elif shape == "islands":
-        return [(random.gauss(250, 80), random.gauss(250, 80)) for _ in range(n)]
-    else:
-        raise ValueError(f"Forma no reconocida: {shape}")
+    return [tuple(xy) for xy in generate_points(n, seed, shape).tolist()]
 
 
-def save_custom_csv(coords: List[Tuple[float, float]], out_path: str) -> None:
-    """Guarda coordenadas en CSV con formato id,x,y."""
+def save_custom_csv(coords, out_path: str) -> None:
+    """Guarda coordenadas en CSV con formato id,x,y (por bloques)."""
+    xy = np.asarray(coords, dtype=np.float64)
     with open(out_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["id", "x", "y"])
-        for i, (x, y) in enumerate(coords):
-            writer.writerow([i, x, y])
+        f.write("id,x,y\n")
+        for start in range(0, len(xy), CHUNK_ROWS):
+            block = xy[start:start + CHUNK_ROWS]
+            ids = np.arange(start, start + len(block))
+            np.savetxt(f, np.column_stack((ids, block)), fmt=("%d", "%.17g", "%.17g"), delimiter=",")
+
+
+def save_npy(coords, out_path: str) -> None:
+    """Guarda coordenadas como arreglo .npy (n, 2) float64."""
+    np.save(out_path, np.asarray(coords, dtype=np.float64))
+
+
+def save_tsplib(coords, out_path: str, name: str = None, edge_weight_type: str = "EUC") -> None:
+    """
+    Guarda coordenadas como TSPLIB (NODE_COORD_SECTION); .gz comprime.
+
+    Por defecto EUC (sin redondeo), como los CSV: con EUC_2D cada distancia
+    se redondea al entero y el costo no coincidiría con el del mismo CSV
+    (con coordenadas en [0, 1], casi todas valdrían 0 o 1).
+    """
+    xy = np.asarray(coords, dtype=np.float64)
+    out_path = str(out_path)
+    name = name or Path(out_path).name.split(".")[0]
+    opener = gzip.open if out_path.endswith(".gz") else open
+    with opener(out_path, "wt", encoding="utf-8") as f:
+        f.write(f"NAME : {name}\nTYPE : TSP\nDIMENSION : {len(xy)}\n"
+                f"EDGE_WEIGHT_TYPE : {edge_weight_type}\nNODE_COORD_SECTION\n")
+        for start in range(0, len(xy), CHUNK_ROWS):
+            block = xy[start:start + CHUNK_ROWS]
+            ids = np.arange(start + 1, start + len(block) + 1)
+            np.savetxt(f, np.column_stack((ids, block)), fmt=("%d", "%.17g", "%.17g"))
+        f.write("EOF\n")
+
+
+def save_points(coords, out_path: str) -> None:
+    """Guarda según la extensión: .csv, .npy, .tsp o .tsp.gz."""
+    out = str(out_path)
+    if out.endswith(".npy"):
+        save_npy(coords, out)
+    elif out.endswith(".tsp") or out.endswith(".tsp.gz"):
+        save_tsplib(coords, out)
+    elif out.endswith(".csv"):
+        save_custom_csv(coords, out)
+    else:
+        raise ValueError(f"Formato de salida no soportado: {out} (use .csv, .npy, .tsp o .tsp.gz)")
+
+
+def load_points(path: str) -> np.ndarray:
+    """Lee coordenadas (n, 2) desde .csv (columnas x,y), .npy, .tsp o .tsp.gz."""
+    path = str(path)
+    if path.endswith(".npy"):
+        return np.load(path)
+    if path.endswith(".tsp") or path.endswith(".tsp.gz"):
+        from .tsplib import read_tsplib_instance
+
+        inst = read_tsplib_instance(path)
+        if inst.coords is None:
+            raise ValueError(f"{path}: la instancia no tiene coordenadas "
+                             f"(EDGE_WEIGHT_TYPE {inst.edge_weight_type}); use read_tsplib_instance")
+        return inst.coords[:, :2]
+    if path.endswith(".csv"):
+        import pandas as pd
+
+        df = pd.read_csv(path, usecols=["x", "y"], float_precision="round_trip")
+        return df[["x", "y"]].to_numpy(dtype=np.float64)
+    raise ValueError(f"Formato no soportado: {path} (use .csv, .npy, .tsp o .tsp.gz)")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generador de instancias custom para TSP")
     parser.add_argument("--n", type=int, required=True, help="Número de nodos")
     parser.add_argument("--seed", type=int, required=True, help="Semilla para reproducibilidad")
-    parser.add_argument("--shape", type=str, required=True, choices=["ring_clusters", "uniform", "islands"])
-    parser.add_argument("--out", type=str, default="data/custom/mi_scenario.csv", help="Ruta del CSV de salida")
+    parser.add_argument("--shape", type=str, required=True, choices=SHAPES)
+    parser.add_argument("--out", type=str, default="data/custom/mi_scenario.csv",
+                        help="Ruta de salida (.csv, .npy, .tsp o .tsp.gz)")
     args = parser.parse_args()
 
-    coords = generate_custom(args.n, args.seed, args.shape)
-    save_custom_csv(coords, args.out)
+    coords = generate_points(args.n, args.seed, args.shape)
+    save_points(coords, args.out)
     print(f"Instancia custom guardada en {args.out} con {len(coords)} nodos.")
 
 
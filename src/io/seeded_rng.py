@@ -2,15 +2,61 @@
 Módulo: seeded_rng
 -------------------
 Maneja la fijación de semillas para reproducibilidad.
+
+El GA y los generadores reciben un np.random.Generator explícito (sin
+estado global): una corrida da el mismo resultado en serie, en hilos o en
+otro proceso. Para varias corridas derivadas de una semilla (semillas,
+islas, workers) se usan flujos hijos de una SeedSequence, independientes
+entre sí.
 """
 
 import random
+from typing import List, Union
+
 import numpy as np
 
+SeedLike = Union[int, np.random.SeedSequence, np.random.Generator, None]
+
+
+def make_rng(seed: SeedLike = None) -> np.random.Generator:
+    """
+    Generator a partir de una semilla entera, una SeedSequence o un
+    Generator existente (se devuelve tal cual).
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed: Union[int, np.random.SeedSequence], k: int) -> List[np.random.SeedSequence]:
+    """
+    k SeedSequence hijas e independientes. Son picklables: se pueden enviar
+    a workers, y el hijo i es el mismo sin importar cuántos workers haya.
+    """
+    ss = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return ss.spawn(k)
+
+
+def spawn_rngs(seed: Union[int, np.random.SeedSequence], k: int) -> List[np.random.Generator]:
+    """k Generators con flujos independientes derivados de `seed`."""
+    return [np.random.default_rng(s) for s in spawn_seeds(seed, k)]
+
+
+def seed_repr(seed: SeedLike):
+    """Semilla en forma serializable a JSON (para guardar en los parámetros)."""
+    if isinstance(seed, np.random.SeedSequence):
+        return {"entropy": seed.entropy, "spawn_key": list(seed.spawn_key)}
+    if isinstance(seed, np.integer):
+        return int(seed)
+    if isinstance(seed, np.random.Generator):
+        return None
+    return seed
+
 
 def set_seeds(seed: int) -> None:
     """
-    Fija las semillas de random y numpy para reproducibilidad.
+    Fija las semillas globales de random y numpy (código heredado; lo nuevo
+    debe usar make_rng / spawn_rngs).
 
     Args:
         seed (int): semilla
@@ -1,11 +1,232 @@
 """
 Módulo: tsplib
 ---------------
-Funciones para leer instancias de TSP en formato TSPLIB (EUC_2D).
-Devuelve una lista de coordenadas en el orden correcto (índices 0..n-1).
+Funciones para leer instancias de TSP en formato TSPLIB.
+
+`read_tsplib_instance` devuelve un registro con los metadatos del encabezado
+(DIMENSION, EDGE_WEIGHT_TYPE, ...) y las secciones como arreglos NumPy:
+NODE_COORD_SECTION, DISPLAY_DATA_SECTION y EDGE_WEIGHT_SECTION (todas las
+variantes de EDGE_WEIGHT_FORMAT). Acepta archivos .tsp y .tsp.gz, y guarda
+un sidecar .npz junto al archivo para que las siguientes cargas sean casi
+instantáneas.
+
+`read_tsplib` se mantiene como envoltorio compatible: lista de (x, y) con
+índices 0..n-1.
 """
 
-from typing import List, Tuple
+import gzip
+import json
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Versión del formato del sidecar .npz (subirla invalida sidecars viejos)
+SIDECAR_VERSION = 1
+
+# Línea de palabra clave TSPLIB: "CLAVE", "CLAVE: valor" o "CLAVE : valor"
+_KEYWORD_RE = re.compile(r"^[ \t]*([A-Z][A-Z0-9_]*)[ \t]*(?::[ \t]*([^\n]*?))?[ \t]*$", re.M)
+
+_COORD_DIMS = {"TWOD_COORDS": 2, "THREED_COORDS": 3}
+
+
+@dataclass
+class TSPInstance:
+    """Instancia TSPLIB: metadatos del encabezado + secciones en NumPy."""
+
+    name: str
+    type: str
+    dimension: int
+    edge_weight_type: str
+    edge_weight_format: Optional[str] = None
+    comment: str = ""
+    header: Dict[str, str] = field(default_factory=dict)
+    coords: Optional[np.ndarray] = None   # (n, 2) o (n, 3), orden 0..n-1
+    weights: Optional[np.ndarray] = None  # (n, n) si EDGE_WEIGHT_TYPE = EXPLICIT
+
+    def distances(self, cache_dir: Optional[str] = None) -> np.ndarray:
+        """
+        Matriz de distancias de la instancia: la explícita si existe; si no,
+        la de `src.common.distance` con el EDGE_WEIGHT_TYPE declarado.
+        """
+        if self.weights is not None:
+            return self.weights
+        from src.common.distance import get_distance_matrix, DEFAULT_DIST_DIR
+
+        return get_distance_matrix(self.coords[:, :2], self.edge_weight_type,
+                                   cache_dir=cache_dir or DEFAULT_DIST_DIR)
+
+
+def _open_text(path: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _numbers(body: str) -> np.ndarray:
+    """Convierte el cuerpo de una sección en un vector float64 (un solo split)."""
+    return np.array(body.split(), dtype=np.float64)
+
+
+def _node_table(values: np.ndarray, n: int, dims: int, section: str) -> np.ndarray:
+    """Tabla "id x y [z]" -> arreglo (n, dims) ordenado por id (1..n)."""
+    if values.size % (dims + 1) != 0:
+        raise ValueError(f"{section}: se esperaban {dims + 1} columnas por nodo")
+    table = values.reshape(-1, dims + 1)
+    if n and len(table) != n:
+        raise ValueError(f"{section}: {len(table)} nodos, DIMENSION declara {n}")
+    ids = table[:, 0].astype(np.int64)
+    if not np.array_equal(np.sort(ids), np.arange(1, len(table) + 1)):
+        raise ValueError(f"{section}: los ids de nodo deben ser 1..{len(table)} sin repetidos ni huecos")
+    out = np.empty((len(table), dims), dtype=np.float64)
+    out[ids - 1] = table[:, 1:]
+    return out
+
+
+def _weights_matrix(values: np.ndarray, n: int, fmt: str) -> np.ndarray:
+    """Arma la matriz n x n simétrica a partir de EDGE_WEIGHT_SECTION."""
+    fmt = (fmt or "FULL_MATRIX").upper()
+    if fmt == "FULL_MATRIX":
+        if values.size != n * n:
+            raise ValueError(f"EDGE_WEIGHT_SECTION: {values.size} valores, se esperaban {n * n}")
+        return values.reshape(n, n)
+
+    # Un formato por columnas equivale al formato por filas del triángulo opuesto
+    # (la matriz es simétrica), así que se reducen a cuatro casos
+    by_row = {
+        "UPPER_ROW": ("upper", 1), "LOWER_COL": ("upper", 1),
+        "LOWER_ROW": ("lower", -1), "UPPER_COL": ("lower", -1),
+        "UPPER_DIAG_ROW": ("upper", 0), "LOWER_DIAG_COL": ("upper", 0),
+        "LOWER_DIAG_ROW": ("lower", 0), "UPPER_DIAG_COL": ("lower", 0),
+    }
+    if fmt not in by_row:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT no soportado: {fmt}")
+    tri, k = by_row[fmt]
+    rows, cols = np.triu_indices(n, k) if tri == "upper" else np.tril_indices(n, k)
+    if values.size != rows.size:
+        raise ValueError(f"EDGE_WEIGHT_SECTION: {values.size} valores, se esperaban {rows.size} ({fmt})")
+    W = np.zeros((n, n), dtype=np.float64)
+    W[rows, cols] = values
+    W[cols, rows] = values
+    return W
+
+
+def parse_tsplib(text: str) -> TSPInstance:
+    """Parsea el contenido completo de un archivo TSPLIB."""
+    header: Dict[str, str] = {}
+    sections: Dict[str, str] = {}
+    matches = list(_KEYWORD_RE.finditer(text))
+    for k, m in enumerate(matches):
+        key, value = m.group(1), m.group(2)
+        if key == "EOF":
+            break
+        if key.endswith("_SECTION"):
+            end = matches[k + 1].start() if k + 1 < len(matches) else len(text)
+            sections[key] = text[m.end():end]
+        elif value is not None:
+            header[key] = value.strip()
+
+    n = int(header.get("DIMENSION", 0))
+    ewt = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    dims = _COORD_DIMS.get(header.get("NODE_COORD_TYPE", "TWOD_COORDS").upper(), 2)
+
+    coords = None
+    if "NODE_COORD_SECTION" in sections:
+        coords = _node_table(_numbers(sections["NODE_COORD_SECTION"]), n, dims, "NODE_COORD_SECTION")
+    elif "DISPLAY_DATA_SECTION" in sections:
+        coords = _node_table(_numbers(sections["DISPLAY_DATA_SECTION"]), n, 2, "DISPLAY_DATA_SECTION")
+
+    weights = None
+    if "EDGE_WEIGHT_SECTION" in sections:
+        weights = _weights_matrix(_numbers(sections["EDGE_WEIGHT_SECTION"]), n,
+                                  header.get("EDGE_WEIGHT_FORMAT"))
+
+    if not n:
+        n = len(coords) if coords is not None else (len(weights) if weights is not None else 0)
+
+    return TSPInstance(
+        name=header.get("NAME", ""),
+        type=header.get("TYPE", "TSP"),
+        dimension=n,
+        edge_weight_type=ewt,
+        edge_weight_format=header.get("EDGE_WEIGHT_FORMAT"),
+        comment=header.get("COMMENT", ""),
+        header=header,
+        coords=coords,
+        weights=weights,
+    )
+
+
+def _sidecar_path(path: str) -> str:
+    return f"{path}.npz"
+
+
+def _source_stamp(path: str) -> np.ndarray:
+    st = os.stat(path)
+    return np.array([SIDECAR_VERSION, st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def _load_sidecar(path: str) -> Optional[TSPInstance]:
+    sidecar = _sidecar_path(path)
+    try:
+        with np.load(sidecar, allow_pickle=False) as z:
+            if not np.array_equal(z["stamp"], _source_stamp(path)):
+                return None  # el .tsp cambió desde que se creó el sidecar
+            meta = json.loads(str(z["meta"]))
+            coords = z["coords"] if "coords" in z.files else None
+            weights = z["weights"] if "weights" in z.files else None
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None  # ausente o truncado (p. ej. proceso matado): se vuelve a parsear
+    return TSPInstance(coords=coords, weights=weights, **meta)
+
+
+def _save_sidecar(path: str, inst: TSPInstance) -> None:
+    meta = {
+        "name": inst.name, "type": inst.type, "dimension": inst.dimension,
+        "edge_weight_type": inst.edge_weight_type,
+        "edge_weight_format": inst.edge_weight_format,
+        "comment": inst.comment, "header": inst.header,
+    }
+    arrays = {"stamp": _source_stamp(path), "meta": np.array(json.dumps(meta))}
+    if inst.coords is not None:
+        arrays["coords"] = inst.coords
+    if inst.weights is not None:
+        arrays["weights"] = inst.weights
+    sidecar = _sidecar_path(path)
+    tmp = f"{sidecar}.{os.getpid()}.tmp.npz"
+    try:
+        np.savez(tmp, **arrays)
+        os.replace(tmp, sidecar)
+    except OSError:
+        # Carpeta de solo lectura: el sidecar es opcional
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def read_tsplib_instance(path: str, use_cache: bool = True) -> TSPInstance:
+    """
+    Lee un archivo TSPLIB (.tsp o .tsp.gz) con sus metadatos.
+
+    Args:
+        path (str): ruta al archivo
+        use_cache (bool): usar/crear el sidecar .npz junto al archivo
+
+    Returns:
+        TSPInstance: metadatos + coords (n, 2) y/o weights (n, n)
+    """
+    path = str(path)
+    if use_cache:
+        inst = _load_sidecar(path)
+        if inst is not None:
+            return inst
+    with _open_text(path) as f:
+        inst = parse_tsplib(f.read())
+    if use_cache:
+        _save_sidecar(path, inst)
+    return inst
 
 
 def read_tsplib(path: str) -> List[Tuple[float, float]]:
@@ -19,24 +240,10 @@ def read_tsplib(path: str) -> List[Tuple[float, float]]:
         List[Tuple[float, float]]: Lista de pares (x, y) para cada nodo
                                    con índices 0..n-1
     """
-    coords = []
-    with open(path, "r", encoding="utf-8") as f:
-        in_node_section = False
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith("NODE_COORD_SECTION"):
-                in_node_section = True
-                continue
-            if line.startswith("EOF"):
-                break
-            if in_node_section:
-                parts = line.split()
-                if len(parts) >= 3:
-                    _, x, y = parts[:3]
-                    coords.append((float(x), float(y)))
-    return coords
+    inst = read_tsplib_instance(path)
+    if inst.coords is None:
+        return []
+    return [tuple(xy) for xy in inst.coords[:, :2].tolist()]
 
 
 if __name__ == "__main__":
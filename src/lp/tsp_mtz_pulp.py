@@ -2,28 +2,16 @@
 from __future__ import annotations
 import argparse
 import json
-import math
 import os
 import time
 from typing import List, Tuple, Optional
 
 import pulp
 
-from src.common.metrics import tour_length
+from src.common.distance import distance_matrix
 
 Coords = List[Tuple[float, float]]
 
-def _euclid_dmatrix(coords: Coords) -> List[List[float]]:
-    n = len(coords)
-    D = [[0.0] * n for _ in range(n)]
-    for i in range(n):
-        xi, yi = coords[i]
-        for j in range(i + 1, n):
-            xj, yj = coords[j]
-            dij = math.hypot(xi - xj, yi - yj)
-            D[i][j] = D[j][i] = dij
-    return D
-
 def _extract_tour_from_x(x_vars, n: int) -> Optional[List[int]]:
     """
     Reconstruye el tour siguiendo sucesores desde 0.
@@ -64,16 +52,25 @@ def _extract_tour_from_x(x_vars, n: int) -> Optional[List[int]]:
 
     return tour
 
-def run_mtz(coords: Coords, time_limit: Optional[int] = None) -> dict:
+def run_mtz(coords: Coords, time_limit: Optional[int] = None,
+            cutoff: Optional[float] = None, metric: str = "EUC", dist=None) -> dict:
     """
     Resuelve TSP con modelo MTZ clásico en PuLP (CBC).
     Retorna diccionario serializable a JSON con status, objective, tour, etc.
+
+    `cutoff` (p. ej. el costo de un tour del GA) se pasa a CBC para podar
+    nodos que no pueden mejorarlo. Con cutoff, status "Infeasible" significa
+    que no existe tour más barato que el cutoff.
+
+    `dist` es la matriz de distancias (p. ej. memory-map de
+    get_distance_matrix); si no se pasa, se calcula en memoria con `metric`.
     """
-    n = len(coords)
+    n = len(dist) if dist is not None else len(coords)
     if n < 3:
         raise ValueError(f"Instancia inválida: se leyeron {n} nodos. "
                             "Verifica el archivo TSPLIB y el parser.")
-    D = _euclid_dmatrix(coords)
+    # Lista de listas: indexar floats de Python es más rápido al armar el modelo
+    D = (dist if dist is not None else distance_matrix(coords, metric)).tolist()
 
     # Modelo
     prob = pulp.LpProblem("TSP_MTZ", pulp.LpMinimize)
@@ -101,9 +98,11 @@ def run_mtz(coords: Coords, time_limit: Optional[int] = None) -> dict:
             prob += u[i] - u[j] + n * x[i][j] <= n - 1, f"mtz_{i}_{j}"
 
     # Resolver con CBC
+    options = [f"cutoff {cutoff!r}"] if cutoff is not None else []
     solver = pulp.PULP_CBC_CMD(
         msg=False,  # pon True si quieres ver el log
         timeLimit=int(time_limit) if time_limit else None,
+        options=options,
     )
 
     t0 = time.perf_counter()
@@ -111,6 +110,9 @@ def run_mtz(coords: Coords, time_limit: Optional[int] = None) -> dict:
     elapsed = time.perf_counter() - t0
 
     status = pulp.LpStatus[status_code]
+    # CBC reporta "Optimal" también al cortar por tiempo con incumbente;
+    # sol_status distingue óptimo probado de solución factible
+    proven_optimal = prob.sol_status == pulp.LpSolutionOptimal
 
     # Extraer solución (si hay incumbente)
     tour = None
@@ -130,8 +132,11 @@ def run_mtz(coords: Coords, time_limit: Optional[int] = None) -> dict:
     result = {
         "instance": None,        # lo llena la CLI (nombre del archivo)
         "solver": "CBC",
+        "metric": metric,
         "status": status,
+        "proven_optimal": proven_optimal,
         "best_bound": best_bound,
+        "cutoff": cutoff,
         "objective": objective,
         "time_s": elapsed,
         "tour": tour,
@@ -140,21 +145,24 @@ def run_mtz(coords: Coords, time_limit: Optional[int] = None) -> dict:
 
 def _infer_instance_name(path: str) -> str:
     base = os.path.basename(path)
+    if base.endswith(".gz"):
+        base = base[:-3]
     name, _ = os.path.splitext(base)
     return name
 
 def main():
     ap = argparse.ArgumentParser(description="TSP ILP (MTZ) con PuLP/CBC")
-    ap.add_argument("--data", required=True, help="Ruta a archivo TSPLIB .tsp (EUC_2D)")
+    ap.add_argument("--data", required=True, help="Ruta a archivo TSPLIB .tsp o .tsp.gz")
     ap.add_argument("--time_limit", type=int, default=None, help="Límite de tiempo en segundos (opcional)")
     ap.add_argument("--out", required=True, help="Ruta de salida JSON")
     args = ap.parse_args()
 
 
-    from src.io.tsplib import read_tsplib
+    from src.io.tsplib import read_tsplib_instance
 
-    coords = read_tsplib(args.data)
-    res = run_mtz(coords, time_limit=args.time_limit)
+    inst = read_tsplib_instance(args.data)
+    res = run_mtz(inst.coords, time_limit=args.time_limit, metric=inst.edge_weight_type,
+                  dist=inst.distances())
     res["instance"] = _infer_instance_name(args.data)
 
     # Si no hay tour pero sí objective, renombra mentalmente como 'mtz_bound'
@@ -0,0 +1,87 @@
+"""
+Módulo: anytime
+----------------
+Gráficos del benchmark anytime (scripts/benchmark.py): distribuciones de
+time-to-target, perfiles de desempeño y gap vs tiempo.
+matplotlib se importa sólo al graficar.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from src.common.anytime import ecdf
+
+
+def save_ttt_png(ttt: Dict[float, Dict[str, Sequence[float]]], out_png: str) -> None:
+    """
+    ECDF de time-to-target: un panel por objetivo, una curva por config.
+
+    Args:
+        ttt: {target_pct: {config: [ttt_s, ...]}} (inf = no alcanzó)
+        out_png (str): ruta del archivo de salida
+    """
+    import matplotlib.pyplot as plt
+
+    targets = sorted(ttt)
+    fig, axs = plt.subplots(1, len(targets), figsize=(5 * len(targets), 4), squeeze=False)
+    for ax, target in zip(axs[0], targets):
+        finite = [v for vals in ttt[target].values() for v in vals if np.isfinite(v)]
+        hi = max(finite) * 1.05 if finite else 1.0
+        grid = np.linspace(0.0, hi, 400)
+        for config, vals in sorted(ttt[target].items()):
+            ax.step(grid, ecdf(vals, grid), where="post", label=config)
+        ax.set_title(f"Objetivo: {target:g}% sobre la referencia")
+        ax.set_xlabel("Tiempo (s)")
+        ax.set_ylabel("Fracción de corridas")
+        ax.set_ylim(0, 1.02)
+        ax.grid(True, linestyle="--", alpha=0.5)
+    axs[0][0].legend()
+    fig.tight_layout()
+    fig.savefig(out_png, dpi=150)
+    plt.close(fig)
+
+
+def save_profile_png(taus: np.ndarray, rho: Dict[str, np.ndarray], out_png: str,
+                     title: str = "Perfil de desempeño") -> None:
+    """Perfil de desempeño (eje x en log2 del factor sobre la mejor config)."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    for config, r in sorted(rho.items()):
+        ax.step(taus, r, where="post", label=config)
+    ax.set_xscale("log", base=2)
+    ax.set_xlabel("τ (factor sobre la mejor)")
+    ax.set_ylabel("ρ(τ)")
+    ax.set_ylim(0, 1.02)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.5)
+    fig.tight_layout()
+    fig.savefig(out_png, dpi=150)
+    plt.close(fig)
+
+
+def save_quality_png(grid: np.ndarray, curves: Dict[str, np.ndarray], out_png: str) -> None:
+    """
+    Gap (%) vs tiempo: mediana y rango intercuartil por config.
+
+    Args:
+        grid (ndarray): instantes (s)
+        curves: {config: matriz (corridas, len(grid)) de gaps en fracción}
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    for config, G in sorted(curves.items()):
+        q25, med, q75 = np.percentile(100.0 * G, [25, 50, 75], axis=0)
+        line, = ax.step(grid, med, where="post", label=config)
+        ax.fill_between(grid, q25, q75, step="post", alpha=0.2, color=line.get_color())
+    ax.set_xlabel("Tiempo (s)")
+    ax.set_ylabel("Gap vs referencia (%)")
+    ax.set_title("Calidad vs tiempo")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.5)
+    fig.tight_layout()
+    fig.savefig(out_png, dpi=150)
+    plt.close(fig)
@@ -2,13 +2,12 @@
 Módulo: compare
 ----------------
 Funciones para generar comparaciones y resúmenes de resultados GA vs LP.
+matplotlib se importa sólo al graficar.
 """
 
 import csv
 from typing import List, Dict, Tuple
 
-import matplotlib.pyplot as plt
-
 
 def save_summary_csv(rows: List[Dict], out_csv: str) -> None:
     """
@@ -41,32 +40,22 @@ def save_side_by_side(
     Grafica lado a lado los tours de GA y LP/MTZ para comparación.
 
     Args:
-        coords (list[(x,y)]): lista de coordenadas
+        coords (list[(x,y)] | ndarray): coordenadas
         ga_order (list[int]): tour generado por GA
         lp_order (list[int]): tour generado por LP/MTZ
         out_png (str): ruta del archivo de salida
     """
-    fig, axs = plt.subplots(1, 2, figsize=(10, 5))
+    import matplotlib.pyplot as plt
 
-    # Tour GA
-    xs_ga = [coords[i][0] for i in ga_order] + [coords[ga_order[0]][0]]
-    ys_ga = [coords[i][1] for i in ga_order] + [coords[ga_order[0]][1]]
-    axs[0].plot(xs_ga, ys_ga, "-o", markersize=3)
-    axs[0].set_title("Tour GA")
-    axs[0].set_xlabel("X")
-    axs[0].set_ylabel("Y")
+    from .plot_tour import draw_tour
 
-    # Tour LP
-    xs_lp = [coords[i][0] for i in lp_order] + [coords[lp_order[0]][0]]
-    ys_lp = [coords[i][1] for i in lp_order] + [coords[lp_order[0]][1]]
-    axs[1].plot(xs_lp, ys_lp, "-o", markersize=3, color="orange")
-    axs[1].set_title("Tour LP/MTZ")
-    axs[1].set_xlabel("X")
-    axs[1].set_ylabel("Y")
+    fig, axs = plt.subplots(1, 2, figsize=(10, 5))
+    draw_tour(axs[0], coords, ga_order, title="Tour GA", markersize=3)
+    draw_tour(axs[1], coords, lp_order, color="orange", title="Tour LP/MTZ", markersize=3)
 
-    plt.tight_layout()
-    plt.savefig(out_png, dpi=150)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(out_png, dpi=150)
+    plt.close(fig)
 
 
 if __name__ == "__main__":
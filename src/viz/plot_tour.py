@@ -2,10 +2,88 @@
 Módulo: plot_tour
 ------------------
 Funciones para visualizar tours y curvas de convergencia del TSP.
+
+matplotlib se importa dentro de cada función: importar este módulo es
+barato y los modos sin figuras no pagan su costo de arranque.
 """
 
-import matplotlib.pyplot as plt
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Con más ciudades que esto se omiten los marcadores de nodos
+MARKER_MAX_NODES = 500
+# Vértices máximos dibujados por tour: más allá se decima el recorrido
+# (a 150 dpi no se distinguen más segmentos que píxeles)
+MAX_TOUR_VERTICES = 200_000
+# Puntos máximos de una curva de convergencia (se preservan mínimos/máximos)
+MAX_HISTORY_POINTS = 2_000
+
+
+def tour_path(coords, order, max_vertices: int = MAX_TOUR_VERTICES) -> np.ndarray:
+    """
+    Vértices (m, 2) del ciclo cerrado, construidos con NumPy. Si el tour
+    tiene más de `max_vertices` nodos se toma uno de cada k.
+    """
+    idx = np.asarray(order, dtype=np.intp)
+    if len(idx) > max_vertices:
+        idx = idx[:: -(-len(idx) // max_vertices)]
+    xy = np.asarray(coords, dtype=np.float64)[idx, :2]
+    return np.vstack((xy, xy[:1]))
+
+
+def downsample_minmax(history, max_points: int = MAX_HISTORY_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce una serie a ~max_points puntos conservando, en cada bloque, su
+    mínimo y su máximo (los saltos de la curva no desaparecen).
+
+    Returns:
+        (x, y): iteraciones y valores seleccionados, en orden
+    """
+    y = np.asarray(history, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n), y
+    buckets = max(1, max_points // 2)
+    edges = np.linspace(0, n, buckets + 1, dtype=np.int64)
+    starts = edges[:-1]
+    # argmin/argmax por bloque con reduceat sobre índices
+    mins = np.minimum.reduceat(y, starts)
+    maxs = np.maximum.reduceat(y, starts)
+    block = np.repeat(np.arange(buckets), np.diff(edges))
+    is_min = y == mins[block]
+    is_max = y == maxs[block]
+    first_min = np.full(buckets, n)
+    first_max = np.full(buckets, n)
+    pos = np.arange(n)
+    np.minimum.at(first_min, block[is_min], pos[is_min])
+    np.minimum.at(first_max, block[is_max], pos[is_max])
+    x = np.unique(np.concatenate(([0, n - 1], first_min, first_max)))
+    return x, y[x]
+
+
+def draw_tour(ax, coords, order, color: Optional[str] = None, title: str = "Tour TSP",
+              markersize: float = 4, linewidth: float = 1.2) -> None:
+    """
+    Dibuja un tour en `ax` con un LineCollection (un solo artista aunque
+    haya millones de segmentos). Los marcadores de nodos sólo se dibujan si
+    hay pocas ciudades.
+    """
+    from matplotlib.collections import LineCollection
+
+    path = tour_path(coords, order)
+    segments = np.stack((path[:-1], path[1:]), axis=1)
+    n = len(order)
+    lw = linewidth if n <= MARKER_MAX_NODES else max(0.2, linewidth * (MARKER_MAX_NODES / n) ** 0.5)
+    lc = LineCollection(segments, colors=color or "C0", linewidths=lw,
+                        rasterized=n > MARKER_MAX_NODES)
+    ax.add_collection(lc)
+    if n <= MARKER_MAX_NODES:
+        ax.plot(path[:-1, 0], path[:-1, 1], "o", markersize=markersize, color=color or "C0")
+    ax.autoscale_view()
+    ax.set_title(title)
+    ax.set_xlabel("X")
+    ax.set_ylabel("Y")
 
 
 def save_tour_png(coords: List[Tuple[float, float]], order: List[int], out_path: str) -> None:
@@ -13,41 +91,41 @@ def save_tour_png(coords: List[Tuple[float, float]], order: List[int], out_path:
     Guarda un gráfico PNG del tour.
 
     Args:
-        coords (list[(x,y)]): lista de coordenadas
+        coords (list[(x,y)] | ndarray): coordenadas
         order (list[int]): orden de visita (tour, ciclo implícito)
         out_path (str): ruta del archivo de salida
     """
-    xs = [coords[i][0] for i in order] + [coords[order[0]][0]]
-    ys = [coords[i][1] for i in order] + [coords[order[0]][1]]
+    import matplotlib.pyplot as plt
 
-    plt.figure(figsize=(6, 6))
-    plt.plot(xs, ys, "-o", markersize=4, linewidth=1.2)
-    plt.title("Tour TSP")
-    plt.xlabel("X")
-    plt.ylabel("Y")
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
+    fig, ax = plt.subplots(figsize=(6, 6))
+    draw_tour(ax, coords, order)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
+    plt.close(fig)
 
 
 def save_convergence_png(history: List[float], out_path: str) -> None:
     """
     Guarda la curva de convergencia (mejor costo vs iteración).
+    Historias largas se reducen con downsample_minmax.
 
     Args:
         history (list[float]): lista de valores del mejor costo por iteración
         out_path (str): ruta del archivo de salida
     """
-    plt.figure(figsize=(6, 4))
-    plt.plot(history, label="Mejor costo", linewidth=1.2)
-    plt.xlabel("Iteración")
-    plt.ylabel("Costo")
-    plt.title("Convergencia del GA")
-    plt.legend()
-    plt.grid(True, linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=150)
-    plt.close()
+    import matplotlib.pyplot as plt
+
+    x, y = downsample_minmax(history)
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.plot(x, y, label="Mejor costo", linewidth=1.2)
+    ax.set_xlabel("Iteración")
+    ax.set_ylabel("Costo")
+    ax.set_title("Convergencia del GA")
+    ax.legend()
+    ax.grid(True, linestyle="--", alpha=0.5)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150)
+    plt.close(fig)
 
 
 if __name__ == "__main__":
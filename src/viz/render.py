@@ -0,0 +1,234 @@
+"""
+Módulo: render
+---------------
+Generación de figuras (tour y convergencia) separada de la ejecución de
+los solvers.
+
+- SyncRenderer: grafica en el momento, desde el resultado en memoria.
+- DeferredRenderer: encola cada figura en un pool de procesos en segundo
+  plano que lee el resultado ya guardado; el solver sigue corriendo
+  mientras tanto y `close()` espera a que terminen.
+- render_batch: grafica en paralelo un lote de resultados de varias
+  instancias (cada worker carga las coordenadas de cada instancia una vez).
+
+La fuente de un resultado es la ruta de un JSON o un par (db, run_id) del
+almacén de resultados (src.common.results_store).
+
+También se puede usar como CLI para graficar más tarde:
+
+python -m src.viz.render --db results/results.sqlite --instance eil101 --data data/tsplib/eil101.tsp --results results/eil101
+python -m src.viz.render --results results/eil101 --data data/tsplib/eil101.tsp --name eil101
+"""
+
+import argparse
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+# Coordenadas del worker: se envían una vez por proceso (initializer),
+# no una vez por figura
+_COORDS = None
+
+
+def _init_worker(coords) -> None:
+    global _COORDS
+    _COORDS = coords
+
+
+def _load_result(source) -> dict:
+    """Lee un resultado desde un JSON o desde (db, run_id) del almacén."""
+    if isinstance(source, (tuple, list)):
+        from src.common.results_store import ResultsStore
+
+        db, run_id = source
+        with ResultsStore(db) as store:
+            return store.load_result(run_id)
+    with open(source, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def render_ga_json(source, tour_png: Optional[str], conv_png: Optional[str],
+                   coords=None) -> None:
+    """Grafica tour y convergencia de un resultado del GA."""
+    from .plot_tour import save_tour_png, save_convergence_png
+
+    coords = _COORDS if coords is None else coords
+    result = _load_result(source)
+    if tour_png:
+        save_tour_png(coords, result["best"]["tour"], tour_png)
+    if conv_png:
+        save_convergence_png(result["best_history"], conv_png)
+
+
+def render_mtz_json(source, tour_png: str, coords=None) -> None:
+    """Grafica el tour de un resultado de MTZ (si tiene tour)."""
+    from .plot_tour import save_tour_png
+
+    coords = _COORDS if coords is None else coords
+    result = _load_result(source)
+    if result.get("tour"):
+        save_tour_png(coords, result["tour"], tour_png)
+
+
+@lru_cache(maxsize=8)
+def _coords_for(data: str):
+    from src.io.gen_custom import load_points
+
+    return load_points(data)
+
+
+def _render_job(job: Dict) -> None:
+    coords = _coords_for(str(job["data"]))
+    if job["kind"] == "ga":
+        render_ga_json(job["source"], job.get("tour_png"), job.get("conv_png"), coords=coords)
+    elif job["kind"] == "mtz":
+        render_mtz_json(job["source"], job["tour_png"], coords=coords)
+    else:
+        raise ValueError(f"Tipo de figura no soportado: {job['kind']}")
+
+
+def render_batch(jobs: Iterable[Dict], max_workers: Optional[int] = None) -> List[str]:
+    """
+    Grafica un lote de resultados en paralelo.
+
+    Args:
+        jobs (iterable[dict]): figuras a generar, cada una con
+            kind ("ga" | "mtz"), source (JSON o (db, run_id)), data (ruta de
+            la instancia), tour_png y, para "ga", conv_png (None para omitir)
+        max_workers (int | None): procesos del pool (por defecto, os.cpu_count())
+
+    Returns:
+        list[str]: errores, uno por figura fallida (el resto se genera igual)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = [{k: str(v) if isinstance(v, Path) else v for k, v in job.items()} for job in jobs]
+    if not jobs:
+        return []
+    errors = []
+    # Agrupar por instancia: los jobs de una misma instancia caen seguidos y
+    # aprovechan la caché de coordenadas de cada worker
+    jobs.sort(key=lambda j: j["data"])
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [(job["source"], pool.submit(_render_job, job)) for job in jobs]
+        for source, fut in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                errors.append(f"{source}: {e!r}")
+    return errors
+
+
+class SyncRenderer:
+    """Grafica inmediatamente, en el proceso actual."""
+
+    def __init__(self, coords):
+        self.coords = coords
+
+    def ga(self, source, result: dict, tour_png, conv_png) -> None:
+        from .plot_tour import save_tour_png, save_convergence_png
+
+        save_tour_png(self.coords, result["best"]["tour"], tour_png)
+        save_convergence_png(result["best_history"], conv_png)
+
+    def mtz(self, source, result: dict, tour_png) -> None:
+        from .plot_tour import save_tour_png
+
+        if result.get("tour"):
+            save_tour_png(self.coords, result["tour"], tour_png)
+
+    def close(self) -> List[str]:
+        return []
+
+
+class DeferredRenderer:
+    """
+    Encola figuras en un ProcessPoolExecutor que lee los resultados guardados.
+
+    Args:
+        coords: coordenadas de la instancia (se copian una vez por worker)
+        max_workers (int | None): procesos del pool (por defecto, os.cpu_count())
+    """
+
+    def __init__(self, coords, max_workers: Optional[int] = None):
+        self.coords = coords
+        self.max_workers = max_workers
+        self._pool = None
+        self._futures = []
+
+    def _submit(self, fn, *args) -> None:
+        if self._pool is None:
+            # El pool se crea con la primera figura: sin figuras no hay procesos
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             initializer=_init_worker, initargs=(self.coords,))
+        args = [str(a) if isinstance(a, Path) else a for a in args]
+        self._futures.append((args[0], self._pool.submit(fn, *args)))
+
+    def ga(self, source, result: dict, tour_png, conv_png) -> None:
+        self._submit(render_ga_json, source, tour_png, conv_png)
+
+    def mtz(self, source, result: dict, tour_png) -> None:
+        self._submit(render_mtz_json, source, tour_png)
+
+    def close(self) -> List[str]:
+        """Espera a que terminen las figuras; devuelve los errores (uno por figura fallida)."""
+        errors = []
+        for source, fut in self._futures:
+            try:
+                fut.result()
+            except Exception as e:
+                errors.append(f"{source}: {e!r}")
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._futures = []
+        return errors
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Genera figuras desde resultados guardados")
+    ap.add_argument("--results", required=True, help="Carpeta de salida de las figuras (y de los JSON, si no hay --db)")
+    ap.add_argument("--data", required=True, help="Instancia (.tsp, .tsp.gz, .csv o .npy)")
+    ap.add_argument("--db", default=None, help="Almacén SQLite: grafica sus corridas en vez de los JSON")
+    ap.add_argument("--instance", default=None, help="Instancia a graficar desde --db")
+    ap.add_argument("--name", default=None, help="Prefijo de las figuras (por defecto, la carpeta)")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    from src.io.gen_custom import load_points
+
+    results_dir = Path(args.results)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    name = args.name or results_dir.name
+    renderer = DeferredRenderer(load_points(args.data), max_workers=args.workers)
+    if args.db:
+        from src.common.results_store import ResultsStore
+
+        with ResultsStore(args.db) as store:
+            runs = store.query(instance=args.instance or name)
+        for r in runs:
+            if r["solver"] == "ga":
+                tag = f"seed{r['seed']}_run{r['id']}"
+                renderer.ga((args.db, r["id"]), None, results_dir / f"{name}_tour_GA_{tag}.png",
+                            results_dir / f"{name}_convergence_{tag}.png")
+            elif r["solver"] == "mtz":
+                renderer.mtz((args.db, r["id"]), None, results_dir / f"{name}_tour_OPT_run{r['id']}.png")
+    else:
+        for p in sorted(results_dir.glob("ga_seed*.json")):
+            seed = p.stem[len("ga_seed"):]
+            renderer.ga(p, None, results_dir / f"{name}_tour_GA_seed{seed}.png",
+                        results_dir / f"{name}_convergence_seed{seed}.png")
+        mtz_json = results_dir / "mtz_opt.json"
+        if mtz_json.exists():
+            renderer.mtz(mtz_json, None, results_dir / f"{name}_tour_OPT.png")
+    errors = renderer.close()
+    for e in errors:
+        print(f"[WARN] Figura falló: {e}")
+    print(f"[INFO] Figuras generadas en {results_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# tests/test_anytime.py
+import csv
+
+import numpy as np
+import pytest
+
+from src.common.anytime import (ecdf, performance_profile, quality_auc,
+                                time_to_target, trace_from_result)
+
+def test_ttt_and_auc_on_step_trace():
+    t = np.array([1.0, 2.0, 4.0])
+    c = np.array([150.0, 120.0, 100.0])  # gaps 0.5, 0.2, 0.0 sobre ref=100
+    assert time_to_target(t, c, 120.0) == 2.0
+    assert time_to_target(t, c, 99.0) == float("inf")
+    # [0,1): cap=1, [1,2): 0.5, [2,4): 0.2, [4,10]: 0 -> (1 + 0.5 + 0.4) / 10
+    assert quality_auc(t, c, 100.0, horizon=10.0) == pytest.approx(0.19)
+    assert quality_auc(t, c, 100.0, horizon=1.5) == pytest.approx((1 + 0.25) / 1.5)
+
+def test_trace_from_result_is_monotone_and_offset():
+    res = {"best_history": [5.0, 4.0, 4.5, 3.0], "time_history": [0.1, 0.2, 0.3, 0.4]}
+    t, c = trace_from_result(res, offset=1.0)
+    assert np.allclose(t, [1.1, 1.2, 1.3, 1.4]) and c.tolist() == [5.0, 4.0, 4.0, 3.0]
+    t, c = trace_from_result({"tour": [0, 1, 2], "objective": 7.0, "time_s": 2.0})
+    assert t.tolist() == [2.0] and c.tolist() == [7.0]
+
+def test_performance_profile_and_ecdf():
+    table = {"p1": {"a": 1.0, "b": 2.0}, "p2": {"a": 4.0, "b": 2.0}, "p3": {"a": 1.0, "b": float("inf")}}
+    taus, rho = performance_profile(table, taus=np.array([1.0, 2.0, 10.0]))
+    assert rho["a"].tolist() == [2 / 3, 1.0, 1.0]
+    assert rho["b"].tolist() == [1 / 3, 2 / 3, 2 / 3]
+    assert ecdf([1.0, float("inf")], np.array([0.0, 5.0])).tolist() == [0.0, 0.5]
+
+def test_run_ga_records_time_history_and_respects_time_limit():
+    from src.ga.tsp_ga import run_ga
+    coords = np.random.default_rng(0).random((30, 2)).tolist()
+    res = run_ga(coords, N=20, max_iter=10**6, crossover="OX", pmut=0.2, elitism=0.1,
+                 seed=1, time_limit=0.3)
+    assert len(res["time_history"]) == len(res["best_history"]) > 1
+    assert np.all(np.diff(res["time_history"]) >= 0) and res["time_history"][-1] < 2.0
+
+def test_benchmark_end_to_end(tmp_path):
+    from scripts.benchmark import analyze, build_jobs, load_runs, references
+    from scripts.run_batch import run_batch
+    import json
+    inst = tmp_path / "pts.npy"
+    np.save(inst, np.random.default_rng(0).random((15, 2)))
+    configs = [{"name": "ox", "solver": "ga", "params": {"crossover": "OX", "N": 10, "max_iter": 30}},
+               {"name": "pmx", "solver": "ga", "params": {"crossover": "PMX", "N": 10, "max_iter": 30}}]
+    jobs = build_jobs([str(inst)], [1, 2], configs, time_limit=5.0)
+    assert len(jobs) == 4 and all(j["params"]["time_limit"] == 5.0 for j in jobs)
+    jobs_path = tmp_path / "jobs.jsonl"
+    jobs_path.write_text("\n".join(json.dumps(j) for j in jobs) + "\n", encoding="utf-8")
+    assert run_batch(str(jobs_path), str(tmp_path / "runs.jsonl"), max_workers=1,
+                     dist_dir=str(tmp_path / "dist")) == {"ok": 4, "error": 0}
+
+    runs = load_runs(str(tmp_path / "runs.jsonl"))
+    refs = references(runs, {})
+    assert refs["pts"] == min(r["cost"][-1] for r in runs)
+    summary = analyze(runs, refs, 5.0, [0.0, 5.0], 5.0, tmp_path / "out", plots=False)
+    assert {row["config"] for row in summary} == {"ox", "pmx"}
+    # La referencia sale de las propias corridas: alguien la alcanza
+    assert max(row["success_0pct"] for row in summary) > 0
+    with open(tmp_path / "out" / "auc.csv", newline="", encoding="utf-8") as f:
+        aucs = [float(r["auc"]) for r in csv.DictReader(f)]
+    assert len(aucs) == 4 and all(0.0 <= a <= 1.0 for a in aucs)
+    assert (tmp_path / "out" / "profile.csv").exists()
+
+def test_load_runs_charges_instance_setup_to_every_run(tmp_path):
+    import json
+    from scripts.benchmark import load_runs
+    result = {"best_history": [5.0, 4.0], "time_history": [0.1, 0.2]}
+    rows = [{"id": "ga|a|1", "status": "ok", "result": result, "timings": {"load_s": 1.0, "dist_s": 2.0}},
+            {"id": "ga|a|2", "status": "ok", "result": result, "timings": {"load_s": 0.0, "dist_s": 0.0}},
+            {"id": "ga|b|1", "status": "ok", "result": result, "timings": {"load_s": 0.5, "dist_s": 0.0}}]
+    path = tmp_path / "runs.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    # La corrida en caliente (semilla 2) carga con la preparación de la fría
+    t = {(r["instance"], r["seed"]): r["t"] for r in load_runs(str(path))}
+    assert np.allclose(t["a", "1"], [3.1, 3.2]) and np.allclose(t["a", "2"], [3.1, 3.2])
+    assert np.allclose(t["b", "1"], [0.6, 0.7])
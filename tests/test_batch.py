@@ -0,0 +1,39 @@
+# tests/test_batch.py
+import json
+
+import numpy as np
+
+from scripts.run_batch import _LRU, run_batch
+
+def test_lru_evicts_by_entries_and_bytes():
+    lru = _LRU(max_entries=2, max_bytes=100)
+    lru.put("a", np.zeros(5))   # 40 B
+    lru.put("b", np.zeros(5))
+    lru.get("a")                # "b" pasa a ser el menos usado
+    lru.put("c", np.zeros(5))
+    assert lru.get("b") is None and lru.get("a") is not None
+    lru.put("big", np.zeros(20))  # 160 B: desaloja todo lo demás
+    assert len(lru) == 1 and lru.get("big") is not None
+
+def test_run_batch_streams_results_and_isolates_failures(tmp_path):
+    inst = tmp_path / "pts.npy"
+    np.save(inst, np.random.default_rng(0).random((12, 2)))
+    jobs = tmp_path / "jobs.jsonl"
+    lines = [
+        {"id": "s1", "instance": str(inst), "solver": "ga", "params": {"seed": 1, "N": 10, "max_iter": 5}},
+        {"id": "s2", "instance": str(inst), "solver": "ga", "params": {"seed": 2, "N": 10, "max_iter": 5},
+         "out": str(tmp_path / "s2.json")},
+        {"id": "bad", "instance": str(tmp_path / "missing.npy"), "solver": "ga"},
+    ]
+    jobs.write_text("\n".join(json.dumps(l) for l in lines) + "\nnot json\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    counts = run_batch(str(jobs), str(out), max_workers=1, dist_dir=None)
+    assert counts == {"ok": 2, "error": 2}
+
+    rows = {r["id"]: r for r in map(json.loads, out.read_text(encoding="utf-8").splitlines())}
+    assert rows["s1"]["status"] == "ok" and rows["s1"]["result"]["best"]["cost"] == rows["s1"]["best_cost"]
+    # Mismo worker, misma instancia: segunda vez desde la caché
+    assert rows["s2"]["instance_cached"] and rows["s2"]["matrix_cached"]
+    assert json.loads((tmp_path / "s2.json").read_text())["best"]["cost"] == rows["s2"]["best_cost"]
+    assert rows["bad"]["status"] == "error" and "solve_s" not in rows["bad"]["timings"]
+    assert rows["line4"]["status"] == "error"
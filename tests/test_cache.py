@@ -0,0 +1,30 @@
+# tests/test_cache.py
+from src.common.result_cache import ResultCache, coords_hash
+
+COORDS = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+
+def test_cache_hit_depends_on_coords_and_params(tmp_path):
+    cache = ResultCache(tmp_path)
+    res = {"best": {"cost": 4.0, "tour": [0, 1, 2, 3]}}
+    cache.put(COORDS, "ga", {"N": 10, "seed": 1}, res)
+
+    assert cache.get(COORDS, "ga", {"seed": 1, "N": 10}) == res
+    assert cache.get(COORDS, "ga", {"N": 10, "seed": 2}) is None
+    assert cache.get(COORDS[::-1], "ga", {"N": 10, "seed": 1}) is None
+    assert coords_hash(COORDS) != coords_hash(COORDS[::-1])
+
+def test_cache_proven_vs_timeout_and_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_entries=2)
+    timeout = {"status": "Not Solved", "proven_optimal": False}
+    cache.put(COORDS, "mtz", {"time_limit": 5}, timeout, complete=False)
+    # Un corte por tiempo sólo vale para el mismo time_limit
+    assert cache.get(COORDS, "mtz", {"time_limit": 5}) == timeout
+    assert cache.get(COORDS, "mtz", {"time_limit": 60}) is None
+
+    # Un óptimo probado vale para cualquier time_limit y tiene prioridad
+    opt = {"status": "Optimal", "proven_optimal": True}
+    cache.put(COORDS, "mtz", {"time_limit": 60}, opt, complete=True)
+    assert cache.get(COORDS, "mtz", {"time_limit": 5}) == opt
+
+    cache.put(COORDS, "ga", {"seed": 1}, {"x": 1})
+    assert len(list(tmp_path.rglob("*.json"))) == 2
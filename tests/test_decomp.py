@@ -0,0 +1,51 @@
+# tests/test_decomp.py
+import numpy as np
+
+from src.common.metrics import tour_length
+from src.decomp.tsp_decomp import hilbert_index, partition, run_decomp, solve_path
+from src.io.gen_custom import generate_points
+
+def test_hilbert_index_is_a_bijection_on_the_grid():
+    g = np.array([(x, y) for x in range(4) for y in range(4)], dtype=float)
+    assert sorted(hilbert_index(g, order=2).tolist()) == list(range(16))
+
+def test_partition_covers_every_city_once():
+    xy = generate_points(500, 3, "islands")
+    for method in ("kmeans", "hilbert"):
+        clusters = partition(xy, cluster_size=60, method=method, seed=1)
+        assert sorted(np.concatenate(clusters).tolist()) == list(range(500))
+        assert max(len(c) for c in clusters) <= 120
+
+def test_solve_path_goes_from_entry_to_exit():
+    xy = generate_points(30, 2, "uniform")
+    path, how = solve_path(xy, 3, 17, solver="ga", ga_params={"N": 20, "max_iter": 10}, seed=1)
+    assert how == "ga" and path[0] == 3 and path[-1] == 17
+    assert sorted(path) == list(range(30))
+
+def test_run_decomp_valid_tour_same_format_and_worker_independent():
+    xy = generate_points(400, 5, "gaussian_mixture")
+    kw = dict(cluster_size=50, solver="ga", ga_params={"N": 20, "max_iter": 10}, seed=7)
+    res = run_decomp(xy, max_workers=1, **kw)
+    assert sorted(res["best"]["tour"]) == list(range(400))
+    assert abs(res["best"]["cost"] - tour_length(res["best"]["tour"], xy)) < 1e-6
+    assert res["best_history"][-1] <= res["best_history"][0]
+    assert {"best", "top3", "best_history", "time_s", "stopped_early", "params"} <= set(res)
+    assert run_decomp(xy, max_workers=2, **kw)["best"] == res["best"]
+
+def test_single_cluster_with_duplicate_points_keeps_every_city():
+    from src.decomp.tsp_decomp import _nearest_other
+    # Empates en 0: el corte del ciclo nunca puede ser la propia ciudad
+    same = np.zeros((6, 2))
+    assert all(_nearest_other(same, s, "EUC") != s for s in range(6))
+    xy = np.repeat(generate_points(8, 1, "uniform"), 3, axis=0)
+    res = run_decomp(xy, cluster_size=100, solver="ga", ga_params={"N": 10, "max_iter": 5}, seed=1)
+    assert res["decomposition"]["clusters"] == 1
+    assert sorted(res["best"]["tour"]) == list(range(24))
+
+def test_run_decomp_checks_metric_before_partitioning():
+    import pytest
+    xy = generate_points(20, 1, "uniform")
+    assert run_decomp(xy, cluster_size=100, solver="ga", ga_params={"N": 10, "max_iter": 2},
+                      metric="euc", seed=1)["params"]["metric"] == "EUC"
+    with pytest.raises(ValueError, match="Métrica no soportada"):
+        run_decomp(xy, metric="MANHATTAN")
@@ -0,0 +1,39 @@
+# tests/test_distance.py
+import numpy as np
+
+from src.common.distance import distance_matrix, get_distance_matrix, tour_cost
+from src.common.metrics import tour_length
+from src.io.tsplib import read_tsplib
+
+def test_tsplib_rounding_rules():
+    coords = [(0.0, 0.0), (1.0, 1.0)]  # distancia real sqrt(2) = 1.414...
+    assert distance_matrix(coords, "EUC")[0, 1] == np.sqrt(2)
+    assert distance_matrix(coords, "EUC_2D")[0, 1] == 1.0
+    assert distance_matrix(coords, "CEIL_2D")[0, 1] == 2.0
+    # ATT: sqrt(2/10) = 0.447 -> nint 0 < 0.447 -> 1
+    assert distance_matrix(coords, "ATT")[0, 1] == 1.0
+
+def test_geo_matrix_is_symmetric_integer_km():
+    coords = read_tsplib("data/tsplib/gr229.tsp")[:20]
+    D = distance_matrix(coords, "GEO")
+    assert np.allclose(D, D.T)
+    assert np.all(np.diag(D) == 0)
+    assert np.all(D == np.round(D))
+    # gr229 usa lat/long en grados: las distancias son de cientos/miles de km
+    assert D[0, 1] > 100
+
+def test_cached_matrix_is_memory_mapped(tmp_path):
+    coords = read_tsplib("data/tsplib/eil101.tsp")
+    D1 = get_distance_matrix(coords, "EUC_2D", cache_dir=tmp_path)
+    D2 = get_distance_matrix(coords, "EUC_2D", cache_dir=tmp_path)
+    assert isinstance(D2, np.memmap)
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+    order = list(range(len(coords)))
+    assert tour_cost(order, D1) == tour_cost(order, D2) == tour_length(order, coords, "EUC_2D")
+
+def test_oversized_matrix_fails_before_allocating(tmp_path):
+    import pytest
+    coords = np.zeros((30_000, 2))  # 30k x 30k float64 = 6.7 GiB > tope
+    with pytest.raises(ValueError, match="tsp_decomp"):
+        get_distance_matrix(coords, "EUC", cache_dir=tmp_path)
+    assert not list(tmp_path.iterdir())
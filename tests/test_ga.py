@@ -19,10 +19,113 @@ def test_tour_length_wraps_cycle():
     assert abs(tour_length(order, coords) - 4.0) < 1e-6
 
 def test_pmx_valid_permutation_and_differs():
+    import numpy as np
     from src.ga.operators import pmx
+    # Con p2 = p1 invertido, los cortes (0, b>=9) devuelven p1 tal cual:
+    # generador propio con semilla fija para que el test no dependa del sorteo
     p1 = list(range(20))
     p2 = list(range(19, -1, -1))
-    child = pmx(p1, p2)
+    child = pmx(p1, p2, rng=np.random.default_rng(0))
     assert sorted(child) == sorted(p1)  # misma multiconjunto
     assert child != p1 and child != p2  # no calcado
 
+def test_run_ga_stops_when_incumbent_target_met():
+    from src.ga.tsp_ga import run_ga
+    from src.common.incumbent import SharedIncumbent
+    coords = [(0,0), (1,0), (1,1), (0,1), (0.5,1.8), (2,2)]
+    inc = SharedIncumbent(target=1e9)  # cualquier tour cumple la meta
+    res = run_ga(coords, N=10, max_iter=500, crossover="OX", pmut=0.2,
+                 elitism=0.1, seed=1, incumbent=inc)
+    assert res["stopped_early"]
+    assert len(res["best_history"]) == 1
+    assert inc.should_stop()
+    assert inc.value <= res["best"]["cost"]
+
+def test_pmx_cut_and_ox_cut_always_give_permutations():
+    import numpy as np
+    from src.ga.operators import ox_cut, pmx_cut
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        n = int(rng.integers(2, 15))
+        p1, p2 = rng.permutation(n).tolist(), rng.permutation(n).tolist()
+        a, b = sorted(int(v) for v in rng.choice(n, 2, replace=False))
+        assert sorted(pmx_cut(p1, p2, a, b)) == list(range(n))
+        assert sorted(ox_cut(p1, p2, a, b)) == list(range(n))
+
+def _ga_seed(seed):
+    from src.ga.tsp_ga import run_ga
+    coords = [(i % 7, (i * 3) % 11) for i in range(25)]
+    res = run_ga(coords, N=20, max_iter=15, crossover="PMX", pmut=0.3, elitism=0.1, seed=seed)
+    return res["best"], res["best_history"]
+
+def test_run_ga_parallel_matches_serial_bit_for_bit():
+    import random
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from src.io.seeded_rng import spawn_seeds
+    seeds = spawn_seeds(2025, 4)
+    serial = [_ga_seed(s) for s in seeds]
+    random.seed(0)  # el estado global no influye
+    with ThreadPoolExecutor(4) as ex:
+        assert list(ex.map(_ga_seed, seeds)) == serial
+    with ProcessPoolExecutor(2) as ex:
+        assert list(ex.map(_ga_seed, reversed(seeds))) == serial[::-1]
+    assert _ga_seed(seeds[0]) != _ga_seed(seeds[1])
+
+def test_population_diversity_matches_pairwise_edge_distance():
+    import itertools
+    import numpy as np
+    from src.ga.diversity import population_diversity
+    rng = np.random.default_rng(3)
+    n = 12
+    pop = [rng.permutation(n).tolist() for _ in range(6)] + [list(range(n))] * 3
+    edges = [{frozenset((t[i], t[(i + 1) % n])) for i in range(n)} for t in pop]
+    pairs = [1 - len(a & b) / n for a, b in itertools.combinations(edges, 2)]
+    entropy, spread = population_diversity(pop)
+    assert abs(spread - np.mean(pairs)) < 1e-12 and 0 < entropy < 1
+    assert population_diversity([list(range(n))] * 5) == (0.0, 0.0)
+
+def test_run_ga_reports_diversity_and_restarts_collapsed_population():
+    from src.ga.tsp_ga import run_ga
+    coords = [(i % 5, i // 5) for i in range(20)]
+    # Sin mutación y con élite grande la población colapsa enseguida
+    res = run_ga(coords, N=20, max_iter=60, crossover="OX", pmut=0.0, elitism=0.5,
+                 seed=4, diversity_every=5, restart_below=0.05, immigrant_below=0.2)
+    div = res["diversity"]
+    assert div["generation"] == list(range(5, 61, 5))
+    assert len(div["entropy"]) == len(div["edge_distance"]) == 12
+    assert any(e["action"] == "restart" for e in div["events"])
+    # Medir sin reemplazar a nadie no cambia la corrida
+    kw = dict(N=20, max_iter=30, crossover="OX", pmut=0.2, elitism=0.1, seed=4,
+              immigrant_below=0.0, restart_below=0.0)
+    a = run_ga(coords, diversity_every=3, **kw)
+    b = run_ga(coords, diversity_every=0, **kw)
+    assert a["best_history"] == b["best_history"] and not a["diversity"]["events"]
+    assert b["diversity"]["generation"] == []
+
+def test_draw_tournaments_picks_best_of_distinct_participants():
+    import numpy as np
+    from src.ga.operators import draw_tournaments
+    rng = np.random.default_rng(0)
+    fit = np.arange(50, dtype=float)
+    # k = n: todos participan, siempre gana el mejor
+    assert (draw_tournaments(rng, fit[:3], 100, 3) == 0).all()
+    # participantes distintos: el peor nunca gana un torneo de 2 o más
+    for k in (2, 3, 5):
+        assert draw_tournaments(rng, fit, 5000, k).max() <= 49 - (k - 1)
+
+def test_immigrants_raise_edge_distance_of_collapsed_population():
+    import numpy as np
+    from src.common.distance import distance_matrix
+    from src.ga.diversity import immigrants, population_diversity
+    rng = np.random.default_rng(5)
+    D = distance_matrix(rng.random((40, 2)))
+    best = rng.permutation(40).tolist()
+    pop = [best] * 20
+    new = immigrants(D, 4, rng)
+    assert all(sorted(t) == list(range(40)) for t in new)
+    assert population_diversity(new)[1] > 0.1  # no son casi copias entre sí
+    before = population_diversity(pop)[1]
+    after = population_diversity(pop[:16] + new)[1]
+    assert before == 0.0 and after > 0.2
+    # con k > n se completan con permutaciones aleatorias
+    assert len(immigrants(D[:5, :5], 8, rng)) == 8
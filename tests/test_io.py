@@ -45,3 +45,120 @@ def test_generate_custom_and_save(tmp_path):
     assert df["id"].is_unique
     assert df["id"].iloc[0] == 0
     assert df["id"].iloc[-1] == n - 1
+
+
+def test_read_tsplib_instance_metadata_gzip_and_sidecar(tmp_path):
+    """Metadatos, .tsp.gz y sidecar .npz dan las mismas coordenadas."""
+    import gzip
+    import shutil
+
+    from src.io.tsplib import read_tsplib_instance
+
+    src = "data/tsplib/gr229.tsp"
+    gz = tmp_path / "gr229.tsp.gz"
+    with open(src, "rb") as fin, gzip.open(gz, "wb") as fout:
+        shutil.copyfileobj(fin, fout)
+
+    inst = read_tsplib_instance(gz)
+    assert inst.name == "gr229"
+    assert inst.dimension == 229
+    assert inst.edge_weight_type == "GEO"
+    assert inst.coords.shape == (229, 2)
+    assert (tmp_path / "gr229.tsp.gz.npz").exists()
+
+    cached = read_tsplib_instance(gz)
+    assert cached.header == inst.header
+    assert (cached.coords == inst.coords).all()
+    assert read_tsplib(src) == [tuple(xy) for xy in inst.coords.tolist()]
+
+
+def test_read_tsplib_explicit_upper_row(tmp_path):
+    """EDGE_WEIGHT_SECTION en UPPER_ROW se expande a matriz simétrica."""
+    from src.io.tsplib import read_tsplib_instance
+
+    path = tmp_path / "tiny.tsp"
+    path.write_text(
+        "NAME: tiny\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EXPLICIT\n"
+        "EDGE_WEIGHT_FORMAT: UPPER_ROW\nEDGE_WEIGHT_SECTION\n"
+        "1 2 3\n4 5\n6\nEOF\n",
+        encoding="utf-8",
+    )
+    inst = read_tsplib_instance(path, use_cache=False)
+    W = inst.distances()
+    assert W.shape == (4, 4)
+    assert (W == W.T).all()
+    assert W[0, 3] == 3 and W[1, 2] == 4 and W[2, 3] == 6
+    assert inst.coords is None
+
+
+def test_read_tsplib_rejects_bad_node_ids_and_survives_truncated_sidecar(tmp_path):
+    """Ids repetidos o con huecos fallan; un sidecar truncado se regenera."""
+    import pytest
+
+    from src.io.tsplib import read_tsplib_instance
+
+    head = "NAME: t\nTYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EUC_2D\nNODE_COORD_SECTION\n"
+    for body in ("1 0 0\n2 1 0\n2 0 1\n", "1 0 0\n2 1 0\n4 0 1\n"):
+        bad = tmp_path / "bad.tsp"
+        bad.write_text(head + body + "EOF\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="ids de nodo"):
+            read_tsplib_instance(bad, use_cache=False)
+
+    good = tmp_path / "good.tsp"
+    good.write_text(head + "3 0 1\n1 0 0\n2 1 0\nEOF\n", encoding="utf-8")
+    sidecar = tmp_path / "good.tsp.npz"
+    sidecar.write_bytes(b"PK\x03\x04truncado")
+    inst = read_tsplib_instance(good)
+    assert inst.coords.tolist() == [[0, 0], [1, 0], [0, 1]]
+    assert read_tsplib_instance(good).coords.tolist() == inst.coords.tolist()
+
+
+def test_load_points_explicit_tsp_without_coords_raises(tmp_path):
+    import pytest
+
+    from src.io.gen_custom import load_points
+
+    path = tmp_path / "tiny.tsp"
+    path.write_text(
+        "NAME: tiny\nTYPE: TSP\nDIMENSION: 3\nEDGE_WEIGHT_TYPE: EXPLICIT\n"
+        "EDGE_WEIGHT_FORMAT: UPPER_ROW\nEDGE_WEIGHT_SECTION\n1 2\n3\nEOF\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="no tiene coordenadas"):
+        load_points(path)
+
+
+def test_generate_points_all_shapes_and_formats(tmp_path):
+    """Cada patrón da n puntos reproducibles; .npy/.tsp/.csv se leen igual."""
+    import numpy as np
+
+    from src.io.gen_custom import SHAPES, generate_points, save_points, load_points
+
+    for shape in SHAPES:
+        pts = generate_points(1001, 7, shape)
+        assert pts.shape == (1001, 2)
+        assert np.isfinite(pts).all()
+        assert (pts == generate_points(1001, 7, shape)).all()
+
+    pts = generate_points(250, 3, "gaussian_mixture")
+    for ext in (".npy", ".tsp", ".tsp.gz", ".csv"):
+        out = tmp_path / f"inst{ext}"
+        save_points(pts, out)
+        assert np.array_equal(load_points(out), pts), ext
+
+
+def test_custom_tsp_and_csv_give_same_tour_cost(tmp_path):
+    """Un .tsp generado se mide igual que su .csv (sin redondeo EUC_2D)."""
+    from src.common.metrics import tour_length
+    from src.io.gen_custom import generate_points, load_points, save_points
+    from src.io.tsplib import read_tsplib_instance
+
+    pts = generate_points(50, 1, "uniform")
+    save_points(pts, tmp_path / "inst.csv")
+    save_points(pts, tmp_path / "inst.tsp")
+    metric = read_tsplib_instance(tmp_path / "inst.tsp").edge_weight_type
+    order = list(range(50))
+    csv_cost = tour_length(order, load_points(tmp_path / "inst.csv"), "EUC")
+    tsp_cost = tour_length(order, load_points(tmp_path / "inst.tsp"), metric)
+    assert metric == "EUC"
+    assert abs(csv_cost - tsp_cost) < 1e-9 * csv_cost
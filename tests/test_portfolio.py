@@ -0,0 +1,22 @@
+# tests/test_portfolio.py
+import time
+
+import numpy as np
+
+from scripts.run_scenario import run_portfolio
+
+def test_portfolio_stops_at_target_kills_mtz_and_collects_ga(tmp_path):
+    coords = [tuple(p) for p in np.random.default_rng(0).random((80, 2)) * 100]
+    # Un tour aleatorio cuesta ~4000: el GA llega a la meta en pocas generaciones,
+    # MTZ con 80 ciudades no termina a tiempo y debe ser detenido
+    t0 = time.time()
+    ga, mtz, inc = run_portfolio(coords, seeds=[1, 2], time_limit=120, target=3000.0,
+                                 mtz_delay=0.0, cache_dir=str(tmp_path))
+    assert time.time() - t0 < 60
+    assert inc.should_stop() and not inc.proven_optimal
+    assert inc.value <= 3000.0
+    assert mtz is None
+    assert sorted(ga) == [1, 2]
+    assert all(r["stopped_early"] for r in ga.values())
+    assert min(r["best"]["cost"] for r in ga.values()) == inc.value
+    assert len(list(tmp_path.glob("*.npy"))) == 1
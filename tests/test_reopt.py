@@ -0,0 +1,41 @@
+# tests/test_reopt.py
+import numpy as np
+import pytest
+
+from src.common.metrics import tour_length
+from src.ga.reopt import CoordDiff, apply_diff, reoptimize
+from src.ga.tsp_ga import run_ga
+
+def _square(n=40):
+    # Ciudades sobre el borde de un cuadrado: el tour óptimo es recorrerlo en orden
+    t = np.linspace(0, 4, n, endpoint=False)
+    side, f = np.floor(t), t - np.floor(t)
+    x = np.select([side == 0, side == 1, side == 2], [f, 1.0, 1 - f], 0.0)
+    y = np.select([side == 0, side == 1, side == 2], [0.0, f, 1.0], 1 - f)
+    return np.column_stack((x, y)) * 100
+
+def test_apply_diff_maps_indices():
+    coords = [(0, 0), (1, 0), (2, 0), (3, 0)]
+    new, old_to_new = apply_diff(coords, CoordDiff(added=[(9, 9)], removed=[1], moved={2: (5, 5)}))
+    assert old_to_new.tolist() == [0, -1, 1, 2]
+    assert new.tolist() == [[0, 0], [5, 5], [3, 0], [9, 9]]
+
+def test_reoptimize_repairs_to_valid_near_optimal_tour():
+    coords = _square()
+    diff = CoordDiff(added=[(50.0, 0.0), (100.0, 37.0)], removed=[5, 6], moved={25: (0.0, 55.0)})
+    r = reoptimize(coords, list(range(len(coords))), diff)
+    new, _ = apply_diff(coords, diff)
+    assert sorted(r["tour"]) == list(range(len(new)))
+    assert r["cost"] == pytest.approx(tour_length(r["tour"], new))
+    assert r["cost"] <= r["repair_cost"]
+    # Todas las ciudades siguen sobre el perímetro: el óptimo mide 400
+    assert r["cost"] == pytest.approx(400.0)
+
+def test_reoptimize_seeds_ga_and_run_ga_validates_initial_tours():
+    coords = _square(20)
+    r = reoptimize(coords, list(range(20)), CoordDiff(added=[(30.0, 0.0)]),
+                   ga_params={"N": 20, "max_iter": 5}, seed=1)
+    assert r["ga"]["best"]["cost"] <= r["repair_cost"] + 1e-9
+    with pytest.raises(ValueError):
+        run_ga(coords, N=10, max_iter=1, crossover="OX", pmut=0.2, elitism=0.1, seed=1,
+               initial_tours=[[0, 0, 1]])
@@ -0,0 +1,72 @@
+# tests/test_store.py
+from src.common.results_store import ResultsStore
+from src.ga.tsp_ga import run_ga
+
+COORDS = [(0, 0), (3, 0), (3, 2), (1, 3), (0, 2), (2, 1)]
+
+def test_store_roundtrip_query_and_summary(tmp_path):
+    with ResultsStore(tmp_path / "r.sqlite") as store:
+        results = {}
+        for seed in (1, 2, 3):
+            res = run_ga(COORDS, N=10, max_iter=5, crossover="OX", pmut=0.2,
+                         elitism=0.1, seed=seed)
+            results[store.add_run("toy", "ga", res)] = res
+        mtz = {"status": "Optimal", "proven_optimal": True, "objective": 10.0,
+               "tour": [0, 1, 2, 3, 4, 5], "time_s": 0.1}
+        store.add_run("toy", "mtz", mtz, {"time_limit": 5})
+        # Un corte por tiempo (cota superior) nunca es la referencia, aunque sea menor
+        cut = {"status": "Optimal", "proven_optimal": False, "objective": 9.0,
+               "tour": [0, 1, 2, 3, 4, 5], "time_s": 1.0}
+        store.add_run("toy", "mtz", cut, {"time_limit": 1})
+
+        # Reconstrucción exacta del resultado (arreglos comprimidos aparte)
+        for run_id, res in results.items():
+            assert store.load_result(run_id) == res
+
+        assert [r["seed"] for r in store.query(instance="toy", solver="ga", N=10)] == [1, 2, 3]
+        assert store.query(solver="ga", N=99) == []
+
+        (row,) = store.summary(by="params", instance="toy")
+        costs = [r["best"]["cost"] for r in results.values()]
+        assert row["runs"] == 3
+        assert row["best_cost"] == min(costs)
+        assert row["ref_cost"] == store.reference_cost("toy") == 10.0
+        assert store.reference_cost("other") is None
+        assert abs(row["mean_pct_error"] - 100 * (sum(costs) / 3 - 10) / 10) < 1e-9
+
+def test_load_result_ga_without_time_history(tmp_path):
+    import pytest
+    # p. ej. JSON viejos importados con --import-json
+    res = run_ga(COORDS, N=10, max_iter=5, crossover="OX", pmut=0.2, elitism=0.1, seed=1)
+    res.pop("time_history")
+    with ResultsStore(tmp_path / "r.sqlite") as store:
+        back = store.load_result(store.add_run("toy", "ga", res))
+        # Los params se guardan una sola vez: otros distintos no se aceptan
+        with pytest.raises(ValueError, match="params"):
+            store.add_run("toy", "ga", res, {"seed": 1})
+    assert back == res and "tour" not in back
+
+def test_import_json_dir_uses_fields_mtz_actually_writes(tmp_path):
+    import json
+    from scripts.make_summary import import_json_dir
+    base = {"solver": "CBC", "metric": "EUC", "status": "Optimal", "proven_optimal": True,
+            "objective": 10.0, "tour": [0, 1, 2, 3, 4, 5], "time_s": 0.1}
+    for k, cutoff in enumerate((None, 12.5)):
+        (tmp_path / f"mtz{k}.json").write_text(json.dumps({**base, "cutoff": cutoff}))
+    with ResultsStore(tmp_path / "r.sqlite") as store:
+        assert import_json_dir(store, str(tmp_path), "toy") == 2
+        params = [r["params"] for r in store.query(instance="toy", solver="mtz")]
+    assert params == [{"metric": "EUC"}, {"metric": "EUC", "cutoff": 12.5}]
+
+def test_diversity_traces_go_to_arrays_table(tmp_path):
+    import json
+    res = run_ga(COORDS, N=10, max_iter=20, crossover="OX", pmut=0.2, elitism=0.1,
+                 seed=1, diversity_every=2)
+    assert len(res["diversity"]["entropy"]) == 10
+    with ResultsStore(tmp_path / "r.sqlite") as store:
+        run_id = store.add_run("toy", "ga", res)
+        extra = json.loads(store.conn.execute("SELECT extra FROM runs WHERE id = ?",
+                                              (run_id,)).fetchone()["extra"])
+        assert set(extra["diversity"]) == {"events"} and "params" not in extra
+        assert store.load_array(run_id, "diversity_entropy").tolist() == res["diversity"]["entropy"]
+        assert store.load_result(run_id) == res
@@ -0,0 +1,51 @@
+# tests/test_viz.py
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from src.viz.plot_tour import downsample_minmax, tour_path
+from src.viz.render import DeferredRenderer, render_batch
+
+def test_entry_points_do_not_import_plotting_or_solver_libs():
+    code = ("import sys, scripts.run_scenario, src.viz.plot_tour, src.viz.compare; "
+            "print(sorted(m for m in ('matplotlib', 'pandas', 'pulp') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+def test_deferred_renderer_draws_from_saved_json(tmp_path):
+    coords = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    p = tmp_path / "ga_seed1.json"
+    p.write_text(json.dumps({"best": {"cost": 4.0, "tour": [0, 1, 2, 3]},
+                             "best_history": [5.0, 4.0]}), encoding="utf-8")
+    r = DeferredRenderer(coords, max_workers=1)
+    r.ga(p, None, tmp_path / "tour.png", tmp_path / "conv.png")
+    assert r.close() == []
+    assert (tmp_path / "tour.png").exists() and (tmp_path / "conv.png").exists()
+
+def test_downsample_minmax_keeps_extremes_and_ends():
+    rng = np.random.default_rng(0)
+    h = rng.random(50_000) * 100
+    x, y = downsample_minmax(h, max_points=200)
+    assert len(x) <= 202 and x[0] == 0 and x[-1] == len(h) - 1
+    assert np.all(np.diff(x) > 0)
+    assert y.min() == h.min() and y.max() == h.max()
+
+def test_tour_path_closes_and_decimates():
+    coords = np.arange(20.0).reshape(10, 2)
+    p = tour_path(coords, list(range(10)))
+    assert p.shape == (11, 2) and np.array_equal(p[0], p[-1])
+    assert len(tour_path(coords, list(range(10)), max_vertices=4)) <= 5
+
+def test_render_batch_isolates_failures(tmp_path):
+    data = tmp_path / "pts.npy"
+    np.save(data, np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=float))
+    p = tmp_path / "mtz.json"
+    p.write_text(json.dumps({"tour": [0, 1, 2, 3]}), encoding="utf-8")
+    jobs = [{"kind": "mtz", "source": p, "data": data, "tour_png": tmp_path / "opt.png"},
+            {"kind": "ga", "source": tmp_path / "missing.json", "data": data,
+             "tour_png": tmp_path / "x.png", "conv_png": None}]
+    errors = render_batch(jobs, max_workers=1)
+    assert len(errors) == 1 and "missing.json" in errors[0]
+    assert (tmp_path / "opt.png").exists()